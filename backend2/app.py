@@ -1,13 +1,119 @@
 # -*- coding: utf-8 -*-
 __author__ = 'Nwiwu Uzoma'
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, g, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from pyscript.admission import REJECTED, admissionGate
+from pyscript.export import (EXPORT_FORMATS, byte_range, counted, export_chunks, export_length, gzip_chunks,
+                             known_length, snapshot)
 from pyscript.grapher import graphData
+from pyscript.store import get_store, new_graph as make_graph, tenant_store
+from pyscript.tenants import tenant_registry, tenantMiddleware
+from pyscript.warmup import profileCache
+from pyscript.metrics import REGISTRY
+from pyscript.profiler import QUERY_PROFILER
+from pyscript.records import sectionRecord
+from pyscript.search import ITEM_SECTIONS, PERSON_SECTION
+from pyscript.timeline import TIMELINE_SECTIONS
 from rdflib import Graph
-from pyscript.j2graph import convert_json_to_triples
 import json
+import os
+import threading
+import time
+import weakref
+
+
+class recordJSONProvider(DefaultJSONProvider):
+    """ this class encodes section records as JSON objects, once, when a response is written"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, sectionRecord):
+            return o.as_dict()
+        return DefaultJSONProvider.default(o)
+
 
 app = Flask(__name__)
+app.json = recordJSONProvider(app)
+
+# profile shown on the initial page load
+DEFAULT_PROFILE = 'Lname Fname'
+
+# section key -> graphData method computing it (in the order of the full dump)
+SECTION_GETTERS = {
+    "Details": graphData.get_personDetails,
+    "Category": graphData.get_categories,
+    "Education": graphData.get_Education,
+    "WorkExperience": graphData.get_workExperience,
+    "Skills": graphData.get_skill,
+    "Certificate": graphData.get_certifications,
+    "SkillType": graphData.get_skill_types,
+    "Project": graphData.get_projects,
+    "ProjectClass": graphData.get_project_class,
+    "Service": graphData.get_services,
+    "Social": graphData.get_socials,
+}
+ALL_SECTIONS = ["NameList", "Name"] + list(SECTION_GETTERS)
+# how /record stores a CV whose name is already in the store
+RECORD_MODES = ("upsert", "append")
+# sections whose items the search index covers
+SEARCH_SECTIONS = [PERSON_SECTION] + list(ITEM_SECTIONS.values())
+
+# --- Instrumentation (exposed on /metrics) ---
+REQUEST_SECONDS = REGISTRY.histogram("cv_request_seconds", "Request latency per endpoint.", ["endpoint", "method", "status"])
+SECTION_SECONDS = REGISTRY.histogram("cv_section_seconds", "Time to compute one section of a profile.", ["section"])
+ENCODE_SECONDS = REGISTRY.histogram("cv_encode_seconds", "Time to encode a response (JSON or rendered page).", ["format"])
+WRITE_SECONDS = REGISTRY.histogram("cv_write_seconds", "Duration of merge_and_save.", ["mode"],
+                                   buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+SEARCH_SECONDS = REGISTRY.histogram("cv_search_seconds", "Time to rank the matches of a /search query.")
+WRITES = REGISTRY.counter("cv_writes_total", "CV submissions by verdict.", ["verdict"])
+EXPORT_BYTES = REGISTRY.counter("cv_export_bytes_total", "Bytes streamed by /export.", ["format", "encoding"])
+CHANGE_EVENTS = REGISTRY.counter("cv_change_events_total", "Change events sent on /changes/stream.")
+
+# /changes/stream: a comment line keeps idle connections open; the stream ends (and the browser
+# reconnects with Last-Event-ID) after a while so it does not pin a tenant's store or a worker forever
+STREAM_PAGES = os.environ.get("CV_CHANGES_STREAM", "0") == "1"      # pages follow the stream (else they poll)
+STREAM_HEARTBEAT = float(os.environ.get("CV_CHANGES_HEARTBEAT", "15"))
+STREAM_SECONDS = float(os.environ.get("CV_CHANGES_STREAM_SECONDS", "300"))
+
+# --- Admission control: at most CV_MAX_CONCURRENT requests that compute profiles, search or write run
+# at once, CV_ADMISSION_QUEUE more wait up to CV_ADMISSION_TIMEOUT seconds, the rest get 503 ---
+ADMITTED_ENDPOINTS = ("index", "graphUpdater", "search")
+ADMISSION_GATE = admissionGate(limit=int(os.environ.get("CV_MAX_CONCURRENT", "8")),
+                               queue=int(os.environ.get("CV_ADMISSION_QUEUE", "64")),
+                               timeout=float(os.environ.get("CV_ADMISSION_TIMEOUT", "10")))
+RETRY_AFTER = os.environ.get("CV_RETRY_AFTER", "1")
+
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.before_request
+def admit_request():
+    if request.endpoint not in ADMITTED_ENDPOINTS:
+        return None
+    verdict = ADMISSION_GATE.acquire()
+    if verdict in REJECTED:
+        return jsonify({'error': 'Server busy, please retry shortly'}), 503, {'Retry-After': RETRY_AFTER}
+    g.admission_slot = verdict == "admitted"
+    return None
+
+
+@app.teardown_request
+def release_admission(exc=None):
+    if g.pop("admission_slot", False):
+        ADMISSION_GATE.release()
+
+
+@app.after_request
+def record_request_time(response):
+    start = g.get("request_start")
+    if start is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=request.endpoint or "unknown",
+                                method=request.method, status=response.status_code)
+    return response
 
 # --- Flask Route ---
 @app.route('/', methods=['GET', 'POST'])
@@ -33,18 +139,34 @@ def index():
             # Handle missing data error
             return jsonify({'error': 'Missing profile URI in request'}), 400
         
+        # 3. Optional section selection, paging and field projection
+        try:
+            sections = parse_sections(data.get('sections'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        # the shared NameList alone needs no profile; anything else is neither counted nor computed for an unknown one
+        if (sections is None or set(sections) - {"NameList"}) and get_store().find_person(profileUser) is None:
+            return jsonify({'error': f"Unknown profile '{profileUser}'"}), 404
+
         # initialize the knowledge graph with a profile user
         basicUser = profileUser
-        jsonReqData = getDictionary(basicUser)
+        jsonReqData = getDictionary(basicUser, sections)
 
-        return jsonify(jsonReqData)
+        with ENCODE_SECONDS.time(format="json"):
+            return jsonify(jsonReqData)
     
     else: # request.method == 'GET' (Initial page load)
         
-        basicUser = 'Lname Fname'
+        basicUser = default_profile(get_store())
+        if basicUser is None:
+            return jsonify({'error': 'No profiles in this store'}), 404
+        # read before the data so a write in between shows up in /changes
+        feed = get_store().changes
+        feed_state = {'epoch': feed.epoch, 'version': feed.version, 'profile': basicUser, 'stream': STREAM_PAGES}
         jsonIniData = getDictionary(basicUser)
 
-        return render_template('index.html', json_data=jsonIniData)
+        with ENCODE_SECONDS.time(format="html"):
+            return render_template('index.html', json_data=jsonIniData, feed=feed_state)
     
 # --- Flask Route ---
 @app.route('/record', methods=['POST'])
@@ -61,68 +183,441 @@ def graphUpdater():
     # 1. Read the JSON body sent from the JavaScript fetch request
     userData = request.get_json()
 
-    # 2. Extract the data you need (profile_uri)
-    oldGraphPath = "database/resume.ttl"
+    # ?mode=upsert (default) replaces a stored CV with the same name; ?mode=append always adds a new profile
+    mode = request.args.get('mode', 'upsert')
+    if mode not in RECORD_MODES:
+        return jsonify({'error': "'mode' must be 'upsert' or 'append'"}), 400
+
+    # 2. Convert the CV and store it in its own partition (or apply the changes to the stored one)
     newGraph  = process_cv_data(userData)
 
-    verdict = merge_and_save(oldGraphPath, newGraph)
+    with WRITE_SECONDS.time(mode=mode):
+        verdict = merge_and_save(get_store(), newGraph, mode)
+    WRITES.inc(verdict=verdict)
 
     if verdict == "Yes":
+        # precompute the new profile(s) before the page re-fetches them
+        current_cache().warm_async()
+        # the page re-fetches what changed since its version (see /changes)
         response = {
             'status': 'success',
-            'message': f'Graph merged successfully: {verdict}. Please refresh the page to see updates.'
+            'message': 'Graph merged successfully.',
+            'version': get_store().changes.version
         }
     elif verdict == "No":
         response = {
                 'status': 'failure',
-                'message': f'Graph merged successfully: {verdict}. Please try again later.'
+                'message': 'Graph could not be merged. Please try again later.'
             }
 
     return jsonify(response)        
 
 
-def getDictionary(UserData):
+# --- Flask Route ---
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+        Exposes the timers and counters of the process in the Prometheus text format.
+
+        Returns:
+            a plain-text response with one sample per line.
+        """
+    return Response(REGISTRY.render(), mimetype=None, content_type=REGISTRY.content_type)
+
+
+# --- Flask Route ---
+@app.route('/changes', methods=['GET'])
+def changes():
+    """
+        Lists the profiles and sections changed by the writes after a version of the store.
+
+        Args:
+            ?since= the version the client shows (from the page or a previous answer);
+            ?epoch= the epoch it came with, so a restarted server answers with a reset.
+
+        Returns:
+            a json object {epoch, version, reset, profiles: {label: [sections]}}; the profile
+            '*' stands for every profile and the section '*' for every section.
+        """
+    since = request.args.get('since', type=int)
+    if since is None or since < 0:
+        return jsonify({'error': "'since' must be a non-negative integer"}), 400
+    return jsonify(get_store().changes.since(since, request.args.get('epoch')))
+
+
+# --- Flask Route ---
+@app.route('/changes/stream', methods=['GET'])
+def change_stream():
+    """
+        Streams the changes of the store as Server-Sent Events.
+
+        Args:
+            ?since= and ?epoch= as for /changes, or the Last-Event-ID header ('<epoch>:<version>')
+            sent by a reconnecting EventSource.
+
+        Returns:
+            a text/event-stream of 'changes' events, each carrying the /changes object since the previous event.
+        """
+    epoch, since = request.args.get('epoch'), request.args.get('since', type=int)
+    last_event = request.headers.get('Last-Event-ID', '')
+    if ':' in last_event:
+        epoch, _, version = last_event.partition(':')
+        since = int(version) if version.isdigit() else None
+    feed = get_store().changes
+    if since is None:
+        since = feed.version
+
+    def events():
+        version, deadline = since, time.monotonic() + STREAM_SECONDS
+        # an unknown epoch or a client further behind than the feed gets a reset first
+        state = feed.since(version, epoch)
+        while True:
+            if state['reset'] or state['version'] > version:
+                version = state['version']
+                CHANGE_EVENTS.inc()
+                yield f"id: {state['epoch']}:{version}\nevent: changes\ndata: {json.dumps(state)}\n\n"
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if not feed.wait(version, min(STREAM_HEARTBEAT, remaining)):
+                yield ": keep-alive\n\n"
+            state = feed.since(version)
+
+    return Response(events(), content_type='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+# --- Flask Route ---
+@app.route('/search', methods=['GET'])
+def search():
+    """
+        Searches every profile for a keyword, skill, degree, city, ... (see pyscript.search).
+
+        Args:
+            ?q= the search text; ?section= only match items of one section (e.g. Skills);
+            ?mode=all (every word must occur in the profile, default) or any;
+            ?limit= (default 20, at most 100) and ?offset= page the ranked profiles.
+
+        Returns:
+            a json object with the query tokens, the total and the ranked profiles with their matching items.
+        """
+    query = request.args.get('q', '').strip()
+    section = request.args.get('section') or None
+    mode = request.args.get('mode', 'all')
+    limit = request.args.get('limit', 20, type=int)
+    offset = request.args.get('offset', 0, type=int)
+
+    if not query:
+        return jsonify({'error': "'q' is required"}), 400
+    if section is not None and section not in SEARCH_SECTIONS:
+        return jsonify({'error': f"Unknown section '{section}'"}), 400
+    if mode not in ('all', 'any'):
+        return jsonify({'error': "'mode' must be 'all' or 'any'"}), 400
+    if not 0 < limit <= 100 or offset < 0:
+        return jsonify({'error': "'limit' must be between 1 and 100 and 'offset' non-negative"}), 400
+
+    with SEARCH_SECONDS.time():
+        results = get_store().search.search(query, section=section, match_all=mode == 'all',
+                                            limit=limit, offset=offset)
+    return jsonify(results)
+
+
+# --- Flask Route ---
+@app.route('/export', methods=['GET'])
+@app.route('/export/<pid>', methods=['GET'])
+def export(pid=None):
+    """
+        Streams the whole store, or one profile (its partition plus the common graph), as RDF.
+
+        Args:
+            pid: the partition id of a profile (as in /search results); omitted for the full dump.
+            ?format= nt (default), ttl or jsonld.
+
+        Returns:
+            a streamed attachment, gzipped when the client accepts it; a Range request
+            (e.g. resuming a download, with If-Range) gets the uncompressed bytes it asks for.
+        """
+    fmt = request.args.get('format', 'nt')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"'format' must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    try:
+        graphs, tag = snapshot(get_store(), pid)
+    except KeyError:
+        return jsonify({'error': f"Unknown profile '{pid}'"}), 404
+
+    content_type, extension = EXPORT_FORMATS[fmt]
+    etag = f"{tag}-{fmt}"
+    headers = {'Content-Disposition': f"attachment; filename={pid or 'cv-export'}.{extension}",
+               'Accept-Ranges': 'bytes', 'Vary': 'Accept-Encoding'}
+
+    byte_ranges = request.range
+    if byte_ranges is not None and (request.if_range.etag is None or request.if_range.etag == etag):
+        length = export_length(graphs, fmt, etag)
+        span = byte_ranges.range_for_length(length)
+        if span is None:
+            headers['Content-Range'] = f"bytes */{length}"
+            return Response(status=416, headers=headers)
+        start, stop = span
+        headers.update({'Content-Range': f"bytes {start}-{stop - 1}/{length}", 'ETag': f'"{etag}"'})
+        return Response(metered(byte_range(export_chunks(graphs, fmt), start, stop), fmt, 'identity'),
+                        status=206, content_type=content_type, headers=headers, direct_passthrough=True)
+
+    if 'gzip' in request.accept_encodings:
+        headers.update({'Content-Encoding': 'gzip', 'ETag': f'"{etag}-gzip"'})
+        chunks = metered(gzip_chunks(export_chunks(graphs, fmt)), fmt, 'gzip')
+    else:
+        headers['ETag'] = f'"{etag}"'
+        if known_length(etag) is not None:
+            headers['Content-Length'] = str(known_length(etag))
+        chunks = metered(counted(export_chunks(graphs, fmt), etag), fmt, 'identity')
+    return Response(chunks, content_type=content_type, headers=headers, direct_passthrough=True)
+
+
+def metered(chunks, fmt, encoding):
+    """Counts the bytes of an /export stream as they are sent."""
+    for chunk in chunks:
+        EXPORT_BYTES.inc(len(chunk), format=fmt, encoding=encoding)
+        yield chunk
+
+
+# --- Flask Route (only registered while query profiling is enabled) ---
+if QUERY_PROFILER.profiled:
+    @app.route('/debug/queries/<name>/profile', methods=['GET'])
+    def query_profile(name):
+        """
+            Returns the cProfile report accumulated for one query (see CV_PROFILE_QUERIES).
+
+            Args:
+                name: the rdfQueries method name, e.g. get_project_query.
+
+            Returns:
+                a plain-text report; ?sort= and ?limit= pick the pstats order and length.
+            """
+        report = QUERY_PROFILER.report(name, limit=request.args.get('limit', 30, type=int),
+                                       sort=request.args.get('sort', 'cumulative'))
+        return Response(report, content_type='text/plain; charset=utf-8')
+
+
+def getDictionary(UserData, sections=None):
     """
-    Initializes the RDF graph, extract various sections, and organizes them into a nested dictionary.
+    Organizes the sections of a profile into a nested dictionary, reading
+    them from the profile cache when it holds fresh results.
 
     Args:
         UserData (str): The profile user identifier.
+        sections (dict): Optional output of parse_sections. Only the listed sections are
+            returned; their 'limit'/'offset' page the items and 'fields' projects them.
+            All sections are returned when omitted.
     Returns:
         dict: A nested dictionary containing various sections of the user's data.
     """
-    # initialize the knowledge graph
-    graf = graphData(UserData)         
-    graf.get_name()  #get the first and last name of user. use this to get the personURI
+    if sections is None:
+        sections = {key: {} for key in ALL_SECTIONS}
+        computed = current_cache().get(UserData)
+    else:
+        # a cold partial request only runs the requested sections and is not cached,
+        # unless the whole profile is being computed already (then it waits for that)
+        computed = current_cache().peek(UserData, join=True)
+        if computed is None:
+            computed = computeSections(UserData, sections)
 
         # initialize data container
     jsonData = {}
-        
-    jsonData["NameList"] = graf.name_list
-    jsonData["Name"] = graf.name
-    jsonData["Details"] = graf.get_personDetails()
-    jsonData["Category"] = graf.get_categories()
-    jsonData["Education"] = graf.get_Education()
-    jsonData["WorkExperience"] = graf.get_workExperience()
-    jsonData["Skills"] = graf.get_skill()
-    jsonData["Certificate"] = graf.get_certifications()
-    jsonData["SkillType"] = graf.get_skill_types()
-    jsonData["Project"] = graf.get_projects()
-    jsonData["ProjectClass"] = graf.get_project_class()
-    jsonData["Service"] = graf.get_services()
-    jsonData["Social"] = graf.get_socials()
+    paging = {}
+
+    if "NameList" in sections:
+        # the name list is shared by all profiles and read from the store on each request
+        jsonData["NameList"] = get_store().name_list()
+    if "Name" in sections:
+        jsonData["Name"] = computed["Name"]
+
+    windows = computed.get("Windows", {})
+    for key in SECTION_GETTERS:
+        if key not in sections:
+            continue
+        if key in windows:
+            # computed for this window only; just the projection is left to apply
+            jsonData[key], _ = select_items(computed[key], dict(sections[key], offset=0, limit=None))
+            paging[key] = windows[key]
+            continue
+        jsonData[key], paging_info = select_items(computed[key], sections[key])
+        if paging_info:
+            paging[key] = paging_info
+
+    if paging:
+        jsonData["Paging"] = paging
 
     return jsonData
 
+
+def computeSections(UserData, sections=None):
+    """
+    Initializes the RDF graph and extracts the sections of a profile.
+
+    Args:
+        UserData (str): The profile user identifier.
+        sections: Keys of the sections to compute (or the output of parse_sections, where a
+            'limit' on a dated section restricts its query to that window); all when omitted.
+    Returns:
+        dict: 'Name' plus one entry per computed section, and 'Windows' (section ->
+            paging info) for dated sections of which only a 'limit' window was queried.
+    """
+    # initialize the knowledge graph
+    graf = graphData(UserData)         
+    graf.get_name()  #get the first and last name of user. use this to get the personURI
+
+    computed = {"Name": graf.name}
+
+    # every other section is looked up by the personURI found with the details
+    details = None
+    windows = {}
+    for key, getter in SECTION_GETTERS.items():
+        if sections is not None and key not in sections:
+            continue
+        if details is None:
+            with SECTION_SECONDS.time(section="Details"):
+                details = graf.get_personDetails()
+        if key == "Details":
+            computed[key] = details
+            continue
+        options = sections.get(key) if isinstance(sections, dict) else None
+        with SECTION_SECONDS.time(section=key):
+            if key in TIMELINE_SECTIONS and options and options.get("limit") is not None:
+                # a "latest N" request only queries its window of the presorted timeline
+                offset = options.get("offset") or 0
+                computed[key] = getter(graf, offset, options["limit"])
+                windows[key] = {"offset": offset, "limit": options["limit"],
+                                "total": len(graf.store.timeline(UserData, key))}
+            else:
+                computed[key] = getter(graf)
+
+    if windows:
+        computed["Windows"] = windows
+    return computed
+
+
+# precomputed profiles; warmed in the background at startup and after writes. Concurrent misses of
+# a profile share one computation (CV_COALESCE=0 lets each request compute its own)
+profile_cache = profileCache(computeSections,
+                             max_workers=int(os.environ.get("CV_WARMUP_WORKERS", "2")),
+                             top_n=int(os.environ["CV_WARMUP_TOP_N"]) if os.environ.get("CV_WARMUP_TOP_N") else None,
+                             coalesce=os.environ.get("CV_COALESCE", "1") != "0")
+
+if os.environ.get("CV_WARMUP", "1") != "0":
+    profile_cache.warm_async()
+
+# tenant store -> its profile cache; an entry goes away with the store once the LRU evicts it
+tenant_caches = weakref.WeakKeyDictionary()
+tenant_caches_lock = threading.Lock()
+
+
+def default_profile(store):
+    """
+    Returns the profile shown on the initial page load of a store: DEFAULT_PROFILE
+    when the store has it (a tenant's store usually does not), else its first
+    profile, or None when the store is empty.
+    """
+    if store.find_person(DEFAULT_PROFILE) is not None:
+        return DEFAULT_PROFILE
+    names = store.name_list()
+    return names[0] if names else None
+
+
+def current_cache():
+    """Returns the profile cache of the store serving this request (the tenant's, else the default one)."""
+    store = tenant_store()
+    if store is None:
+        return profile_cache
+    with tenant_caches_lock:
+        cache = tenant_caches.get(store)
+        if cache is None:
+            # filled on demand; like the default cache it is re-warmed after each write
+            cache = tenant_caches[store] = profileCache(computeSections, store_getter=weakref.ref(store),
+                                                        max_workers=profile_cache.max_workers,
+                                                        top_n=profile_cache.top_n,
+                                                        coalesce=profile_cache.coalesce)
+        return cache
+
+
+# --- Tenants: /t/<tenant>/... (or <tenant>.<CV_TENANT_DOMAIN>) is served from that tenant's store ---
+TENANTS = tenant_registry()
+app.wsgi_app = tenantMiddleware(app.wsgi_app, TENANTS, domain=os.environ.get("CV_TENANT_DOMAIN"))
+
+
+def parse_sections(requested):
+    """
+    Validates the optional 'sections' field of a POST / request.
+
+    Args:
+        requested: None (all sections), a list of section keys, or a dict mapping
+            section keys to options {'limit': int, 'offset': int, 'fields': [str]}.
+    Returns:
+        dict: section key -> options, or None when every section is requested.
+    Raises:
+        ValueError: if a section key or option is invalid.
+    """
+    if requested is None:
+        return None
+    if isinstance(requested, list):
+        requested = {key: {} for key in requested}
+    if not isinstance(requested, dict) or not requested:
+        raise ValueError("'sections' must be a non-empty list or object of section names")
+
+    sections = {}
+    for key, options in requested.items():
+        if key not in ALL_SECTIONS:
+            raise ValueError(f"Unknown section '{key}'")
+        options = options or {}
+        if not isinstance(options, dict):
+            raise ValueError(f"Options for section '{key}' must be an object")
+        for name in ("limit", "offset"):
+            value = options.get(name)
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+                raise ValueError(f"'{name}' of section '{key}' must be a non-negative integer")
+        fields = options.get("fields")
+        if fields is not None and (not isinstance(fields, list) or not all(isinstance(f, str) for f in fields)):
+            raise ValueError(f"'fields' of section '{key}' must be a list of field names")
+        sections[key] = options
+    return sections
+
+
+def select_items(items, options):
+    """
+    Applies the paging and field projection of one section to its items.
+
+    Returns:
+        tuple: (selected items, paging info or None when the section is not paged).
+    """
+    paging_info = None
+    if options.get("limit") is not None or options.get("offset"):
+        offset = options.get("offset") or 0
+        limit = options.get("limit")
+        end = None if limit is None else offset + limit
+        paging_info = {"offset": offset, "limit": limit, "total": len(items)}
+        items = items[offset:end]
+
+    fields = options.get("fields")
+    if fields is not None:
+        # 'main' identifies the item and is always kept
+        keep = set(fields) | {"main"}
+        items = [item.project(keep) for item in items]
+
+    return items, paging_info
+
+
 def process_cv_data(data: dict):
     """
     Initializes the RDF graph, adds namespaces, converts the data, and saves the output.
     
     In a real application, 'data' would be the JSON payload received from the request body.
     """
+    # imported on first use: only /record needs the converter
+    from pyscript.j2graph import convert_json_to_triples
+
     print("--- Starting RDF Triples Conversion ---")
 
-    # 1. Initialize the RDF Graph
-    g = Graph()
+    # 1. Initialize the RDF Graph (its repeated literals are interned, see pyscript.interning)
+    g = make_graph()
 
     # 2. Bind Namespaces for cleaner output (Turtle format)
     g.bind("foaf", "http://xmlns.com/foaf/0.1/")
@@ -139,52 +634,38 @@ def process_cv_data(data: dict):
     return turtle_output
 
 
-def merge_and_save(original_filepath: str, new_graph_lines: Graph):
+def merge_and_save(store, new_graph_lines: str, mode: str = "upsert"):
     """
-    Loads an RDF graph from the original file, merges a second graph 
-    from a new data file into it, and saves the combined graph back 
-    to the original file path.
+    Parses the newly converted graph and adds it to the partitioned store.
+    Each person in the new graph is written to its own partition file, so
+    the partitions of other persons are neither reloaded nor rewritten.
+    In 'upsert' mode a person whose name is already stored replaces that
+    profile, and only the triples that changed are written.
     """
     
-    # 1. Load the original graph from its file path
-    try:
-        original_graph = Graph()
-        original_graph.parse(original_filepath, format="turtle") # format=None allows rdflib to auto-detect
-        print(f"Original graph loaded: {len(original_graph)} triples.")
-    except Exception as e:
-        print(f"Error loading original graph '{original_filepath}': {e}")
-        return
-    
+    # 1. Load the new graph from its Turtle serialization
     try:
-        new_graph = Graph()
+        new_graph = make_graph()
         new_graph.parse(data=new_graph_lines, format="turtle")
         print(f"New graph loaded: {len(new_graph)} triples.")
     except Exception as e:
         print(f"Error loading new graph: {e}")
-        return
+        return "No"
 
-    # CRITICAL CHECK: Ensure both objects are Graphs before merging
-    if not isinstance(original_graph, Graph) or not isinstance(new_graph, Graph):
-        raise TypeError("Attempted to merge non-Graph object. Original or New graph failed to initialize.")
-    
+    # CRITICAL CHECK: Ensure the new object is a Graph before merging
+    if not isinstance(new_graph, Graph):
+        raise TypeError("Attempted to merge non-Graph object. New graph failed to initialize.")
     
-    # 2. Merge the new data into the original graph
-    original_triple_count = len(original_graph)
-    original_graph += new_graph
-
-    new_triple_count = len(original_graph)
-    triples_added = new_triple_count - original_triple_count
-
-    print(f"Merging complete. Added {triples_added} new triples.")
-    print(f"Combined graph size: {new_triple_count} triples.")
-
-
-    # 3. Save the combined graph back to the original file path
-    save_format = 'turtle' 
-
+    # 2. Write the new data into its own partition(s), or apply the changes to the stored one(s)
     try:
-        original_graph.serialize(destination=original_filepath, format=save_format)
-        print(f"Successfully saved combined graph back to '{original_filepath}' in {save_format} format.")
+        if mode == "upsert":
+            changes = store.upsert_graph(new_graph)
+            for pid, (removed, added) in changes.items():
+                print(f"Partition {pid}: {removed} triples removed, {added} added.")
+        else:
+            partitions = store.add_graph(new_graph)
+            print(f"Successfully saved {len(new_graph)} triples to partition(s): {', '.join(partitions)}.")
+        print(f"Store size: {len(store)} triples.")
         print(f"--- Merge Process Finished ---")
         return "Yes"
     except Exception as e:
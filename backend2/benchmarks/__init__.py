@@ -0,0 +1,9 @@
+"""
+Date: 2026-10-19
+Description: Reproducible benchmarks for the CV builder. generator.py builds
+    synthetic resume graphs following the ontology of database/resume.ttl,
+    scenarios.py measures load, query, write and serving costs on them, and
+    run.py/compare.py record and diff machine-readable results between commits.
+
+Run from backend2/: python -m benchmarks.run --help
+"""
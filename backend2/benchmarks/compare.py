@@ -0,0 +1,69 @@
+"""
+Date: 2026-10-19
+Description: Compares two benchmark result files written by benchmarks.run
+    and lists every timing that changed by more than a threshold.
+
+Run from backend2/: python -m benchmarks.compare <old.json> <new.json> [--threshold 0.1]
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, Tuple
+
+# lower is better for these measurements; other numbers are listed for information only
+TIMING_SUFFIXES = ("_ms", "_seconds", "seconds", "_mb", "_us", "_mb_after")
+
+
+def flatten(data, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """Yields (dotted.path, value) for every number in a nested result dict."""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield prefix, float(data)
+
+
+def compare(old: Dict, new: Dict, threshold: float) -> Tuple[list, list]:
+    """
+    Returns (regressions, improvements) as lists of (path, old value, new value, relative change)
+    for the timings and memory figures that moved by more than threshold.
+    """
+    old_values = dict(flatten(old["results"]))
+    regressions, improvements = [], []
+    for path, value in flatten(new["results"]):
+        if not path.endswith(TIMING_SUFFIXES) or path not in old_values or old_values[path] <= 0:
+            continue
+        change = (value - old_values[path]) / old_values[path]
+        if change > threshold:
+            regressions.append((path, old_values[path], value, change))
+        elif change < -threshold:
+            improvements.append((path, old_values[path], value, change))
+    return regressions, improvements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change to report (default 0.1 = 10%%)")
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as handle:
+        old = json.load(handle)
+    with open(args.new, encoding="utf-8") as handle:
+        new = json.load(handle)
+    if old["settings"]["params"] != new["settings"]["params"]:
+        print("Warning: the runs used different dataset parameters.")
+
+    regressions, improvements = compare(old, new, args.threshold)
+    print(f"{old['commit']} -> {new['commit']} (threshold {args.threshold:.0%})")
+    for title, rows in (("Regressions", regressions), ("Improvements", improvements)):
+        print(f"\n{title}: {len(rows)}")
+        for path, before, after, change in sorted(rows, key=lambda row: -abs(row[3])):
+            print(f"  {path:60s} {before:12.3f} -> {after:12.3f}  ({change:+.1%})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+Date: 2026-10-19
+Description: Generates synthetic resume graphs that follow the ontology of
+    database/resume.ttl (persons with experiences, education, skills, projects,
+    certificates, services and socials sharing pools of organizations, cities,
+    categories and project themes). Turtle is written as text, so graphs far
+    larger than rdflib could build in memory can be produced quickly.
+
+Run: python -m benchmarks.generator <out_dir> --persons 1000 [--layout partitions|turtle]
+"""
+
+import argparse
+import json
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Set, Tuple
+
+from rdflib import Graph
+
+from pyscript.store import COMMON_FILE, MANIFEST_FILE, SOURCE_FILE, schema_nodes
+
+PREFIXES = """@prefix : <URN://cv.resume/> .
+@prefix dc: <http://purl.org/dc/elements/1.1/> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+@prefix foaf: <http://xmlns.com/foaf/0.1/> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix skos: <http://www.w3.org/2004/02/skos/core#> .
+
+"""
+
+SKILL_TYPES = [":DigitalSkill", ":LanguageSkill", ":SoftSkill"]
+SOCIAL_TYPES = [":Facebook", ":Github", ":Instagram", ":LinkedIn", ":Twitter"]
+WORDS = ("data analysis design software research model graph system control network cloud "
+         "python semantic web ontology knowledge engineering product quality testing automation "
+         "pipeline database reporting machine learning vision language planning lead team").split()
+
+
+@dataclass
+class generatorParams:
+    """ this class holds the shape of a synthetic dataset"""
+
+    persons: int = 100
+    experiences: int = 6
+    duties: int = 3             # duties per experience
+    educations: int = 3
+    skills: int = 8
+    projects: int = 10
+    certificates: int = 4
+    services: int = 4
+    socials: int = 4
+    categories: int = 12        # size of the shared category pool
+    organizations: int = 200
+    cities: int = 60
+    countries: int = 15
+    themes: int = 20
+    optional_density: float = 0.7   # probability that an OPTIONAL field is present
+    seed: int = 42
+
+
+def ontology_turtle(source_file: str = SOURCE_FILE) -> str:
+    """Returns the vocabulary of the shipped resume.ttl (classes, properties, hierarchy) as Turtle."""
+    graph = Graph()
+    graph.parse(source_file, format="turtle")
+    schema = schema_nodes(graph)
+    vocabulary = Graph()
+    for prefix, namespace in graph.namespaces():
+        vocabulary.bind(prefix, namespace, override=True)
+    for triple in graph:
+        if triple[0] in schema:
+            vocabulary.add(triple)
+    return vocabulary.serialize(format="turtle")
+
+
+class resumeGenerator:
+    """ this class writes synthetic persons and the shared pools they reference as Turtle text"""
+
+    def __init__(self, params: generatorParams):
+        self.params = params
+        self.rng = random.Random(params.seed)
+
+    # --- small helpers ---
+    def words(self, count: int) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(count))
+
+    def chance(self) -> bool:
+        return self.rng.random() < self.params.optional_density
+
+    def date(self, low: int = 1990, high: int = 2024) -> Tuple[int, str]:
+        year = self.rng.randint(low, high)
+        return year, f'"{year}-{self.rng.randint(1, 12):02d}-{self.rng.randint(1, 28):02d}T00:00:00"^^xsd:dateTime'
+
+    def categories(self, used: Set[str]) -> Optional[str]:
+        if not self.chance():
+            return None
+        picked = {f":CAT{self.rng.randrange(self.params.categories):03d}" for _ in range(self.rng.randint(1, 3))}
+        used.update(picked)
+        return " , ".join(sorted(picked))
+
+    # --- shared pools ---
+    def pool_statements(self) -> Dict[str, str]:
+        """Returns {node: Turtle statement} for every shared node (organizations, cities, ...)."""
+        p = self.params
+        pool = {}
+        for i in range(p.countries):
+            pool[f":LAND{i:03d}"] = f':LAND{i:03d} rdf:type owl:NamedIndividual , :Country .\n'
+        for i in range(p.cities):
+            pool[f":CITY{i:03d}"] = (f':CITY{i:03d} rdf:type owl:NamedIndividual , :City ;\n'
+                                     f'    :locatedIn :LAND{i % p.countries:03d} ;\n    rdfs:label "City_{i}"@en .\n')
+        for i in range(p.organizations):
+            pool[f":ORG{i:04d}"] = (f':ORG{i:04d} rdf:type owl:NamedIndividual , foaf:Organization ;\n'
+                                    f'    :locatedIn :CITY{i % p.cities:03d} ;\n    foaf:title "Organization_{i}"@en .\n')
+        for i in range(p.categories):
+            pool[f":CAT{i:03d}"] = f':CAT{i:03d} rdf:type owl:NamedIndividual , :Entry_type .\n'
+        for i in range(p.themes):
+            pool[f":THEME{i:03d}"] = (f':THEME{i:03d} rdf:type owl:NamedIndividual , skos:Concept ;\n'
+                                      f'    rdfs:label "Theme_{i}"@en .\n')
+        return pool
+
+    def pool_dependencies(self, used: Set[str]) -> Set[str]:
+        """Adds the cities and countries reached from the used organizations and cities."""
+        p = self.params
+        closure = set(used)
+        for node in used:
+            if node.startswith(":ORG"):
+                closure.add(f":CITY{int(node[4:]) % p.cities:03d}")
+        for node in list(closure):
+            if node.startswith(":CITY"):
+                closure.add(f":LAND{int(node[5:]) % p.countries:03d}")
+        return closure
+
+    # --- one person ---
+    def person(self, index: int) -> Tuple[str, str, str, Set[str]]:
+        """
+        Generates one person.
+
+        Returns:
+            (local id, label, Turtle text, shared pool nodes referenced)
+        """
+        p = self.params
+        pid = f"P{index:06d}"
+        label = f"Fname{index} Lname{index}"
+        used = set()
+        out = []
+        links = {"hasExperience": [], "hasEducation": [], "hasSkill": [], "hasProject": [],
+                 "hasAchievement": [], "provideService": [], "hasSocial": []}
+
+        for i in range(p.experiences):
+            node = f":{pid}_WE{i:02d}"
+            links["hasExperience"].append(node)
+            org = f":ORG{self.rng.randrange(p.organizations):04d}"
+            used.add(org)
+            year, start = self.date()
+            duties = [f"{node}_DU{j}" for j in range(p.duties)]
+            lines = [f"{node} rdf:type owl:NamedIndividual , :WorkExperience ;",
+                     f"    :doneAt {org} ;", f"    :hasDuty {' , '.join(duties)} ;",
+                     f"    :startDate {start} ;"]
+            if self.chance():
+                lines.append(f"    :endDate {self.date(year, 2025)[1]} ;")
+            category = self.categories(used)
+            if category:
+                lines.append(f"    :hasCategory {category} ;")
+            lines.append(f'    foaf:title "{self.words(2).title()}"@en .')
+            out.append("\n".join(lines) + "\n")
+            for duty in duties:
+                out.append(f'{duty} rdf:type owl:NamedIndividual , :Duties ;\n    foaf:title "{self.words(8)}"@en .\n')
+
+        for i in range(p.educations):
+            node = f":{pid}_ED{i:02d}"
+            links["hasEducation"].append(node)
+            school = f":ORG{self.rng.randrange(p.organizations):04d}"
+            used.add(school)
+            year, start = self.date()
+            lines = [f"{node} rdf:type owl:NamedIndividual , :Education ;", f"    :doneAt {school} ;",
+                     f"    :hasCourse {node}_CO ;"]
+            if self.chance():
+                lines.append(f"    :endDate {self.date(year, 2025)[1]} ;")
+            lines.append(f"    :startDate {start} .")
+            out.append("\n".join(lines) + "\n")
+            out.append(f"{node}_CO rdf:type owl:NamedIndividual , :Course ;\n    :degreeLevel {node}_DE .\n")
+            degree = [f"{node}_DE rdf:type owl:NamedIndividual , :Degree ;"]
+            if self.chance():
+                degree.append(f'    :hasGrade "Grade_{self.rng.randint(1, 5)}"@en ;')
+            if self.chance():
+                degree.append(f'    :hasGradeValue "{self.rng.randint(20, 50) / 10}/5.0" ;')
+            degree.append(f'    foaf:title "Degree in {self.words(2)}"@en .')
+            out.append("\n".join(degree) + "\n")
+
+        for i in range(p.skills):
+            node = f":{pid}_SK{i:02d}"
+            links["hasSkill"].append(node)
+            score = self.rng.randint(30, 100)
+            lines = [f"{node} rdf:type owl:NamedIndividual , {self.rng.choice(SKILL_TYPES)} ;"]
+            category = self.categories(used)
+            if category:
+                lines.append(f"    :hasCategory {category} ;")
+            if self.chance():
+                lines.append(f'    dc:description "{self.words(6)}" ;')
+            lines += [f"    :hasPercentage {score} ;", f'    foaf:status "{score}%" ;',
+                      f'    foaf:title "{self.words(2).title()}"@en .']
+            out.append("\n".join(lines) + "\n")
+
+        for i in range(p.projects):
+            node = f":{pid}_PR{i:02d}"
+            links["hasProject"].append(node)
+            lines = [f"{node} rdf:type owl:NamedIndividual , foaf:Project ;"]
+            category = self.categories(used)
+            if category:
+                lines.append(f"    :hasCategory {category} ;")
+            if self.chance():
+                theme = f":THEME{self.rng.randrange(p.themes):03d}"
+                used.add(theme)
+                lines.append(f"    foaf:theme {theme} ;")
+            if self.chance():
+                lines.append(f'    dc:description "{self.words(10)}" ;')
+            if self.chance():
+                lines.append(f'    :hasLink "https://example.org/{pid}/project/{i}" ;')
+            lines.append(f'    foaf:title "{self.words(4).title()}"@en .')
+            out.append("\n".join(lines) + "\n")
+
+        for i in range(p.certificates):
+            node = f":{pid}_CE{i:02d}"
+            links["hasAchievement"].append(node)
+            lines = [f"{node} rdf:type owl:NamedIndividual , :Certification ;"]
+            category = self.categories(used)
+            if category:
+                lines.append(f"    :hasCategory {category} ;")
+            if self.chance():
+                lines.append(f"    :endDate {self.date()[1]} ;")
+            if self.chance():
+                lines.append(f'    :hasLink "https://example.org/{pid}/cert/{i}"^^xsd:anyURI ;')
+            lines.append(f'    foaf:title "Certificate in {self.words(3)}"@en .')
+            out.append("\n".join(lines) + "\n")
+
+        for i in range(p.services):
+            node = f":{pid}_SE{i:02d}"
+            links["provideService"].append(node)
+            lines = [f"{node} rdf:type owl:NamedIndividual , :Service ;",
+                     f'    dc:description "{self.words(12)}"@en ;']
+            if self.chance():
+                lines.append(f'    foaf:status "/assets/icon_developer.png" ;')
+            lines.append(f'    foaf:title "{self.words(2).title()}"@en .')
+            out.append("\n".join(lines) + "\n")
+
+        for i in range(p.socials):
+            node = f":{pid}_SO{i:02d}"
+            links["hasSocial"].append(node)
+            out.append(f"{node} rdf:type owl:NamedIndividual , {SOCIAL_TYPES[i % len(SOCIAL_TYPES)]} ;\n"
+                       f'    :hasLink "https://social.example.org/{pid}/{i}" .\n')
+
+        head = [f":{pid} rdf:type owl:NamedIndividual , foaf:Person ;"]
+        for predicate, nodes in links.items():
+            if nodes:
+                head.append(f"    :{predicate} {' , '.join(nodes)} ;")
+        if self.chance():
+            head.append(f'    dc:description "{self.words(25)}"@en ;')
+        if self.chance():
+            head.append(f'    :hasEmail "{pid.lower()}@cv.example.org" ;')
+        if self.chance():
+            head.append(f'    :hasPhone "0-{index:06d}" ;')
+        if self.chance():
+            head.append(f"    foaf:birthday {self.date(1950, 2000)[1]} ;")
+        head += [f'    :hasAddress "Address {index}"@en ;', f'    foaf:title "{self.words(2).title()}" ;',
+                 f'    foaf:status "assets/avatar-{index % 4 + 1}.png" ;', f'    rdfs:label "{label}" .']
+        out.insert(0, "\n".join(head) + "\n")
+
+        return pid, label, "\n".join(out), used
+
+
+def generate_dataset(out_dir: str, params: generatorParams, layout: str = "partitions") -> dict:
+    """
+    Writes a synthetic dataset.
+
+    Args:
+        out_dir: Target directory.
+        params: Shape of the dataset.
+        layout: 'partitions' writes a ready-to-load store directory (common.ttl,
+            one file per person, manifest.jsonl); 'turtle' writes one resume.ttl.
+
+    Returns:
+        dict: The parameters plus the paths written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    generator = resumeGenerator(params)
+    pool = generator.pool_statements()
+    ontology = ontology_turtle()
+    info = {"params": asdict(params), "layout": layout}
+
+    if layout == "turtle":
+        path = os.path.join(out_dir, "resume.ttl")
+        with open(path, "w", encoding="utf-8") as out:
+            out.write(ontology)
+            out.write("\n" + PREFIXES)
+            out.writelines(pool.values())
+            for index in range(params.persons):
+                out.write(generator.person(index)[2])
+        info["source_file"] = path
+        return info
+
+    with open(os.path.join(out_dir, COMMON_FILE), "w", encoding="utf-8") as out:
+        out.write(ontology)
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w", encoding="utf-8") as manifest:
+        for index in range(params.persons):
+            pid, label, text, used = generator.person(index)
+            with open(os.path.join(out_dir, f"{pid}.ttl"), "w", encoding="utf-8") as out:
+                out.write(PREFIXES)
+                out.write(text)
+                # shared nodes are copied into every partition that uses them
+                out.writelines(pool[node] for node in sorted(generator.pool_dependencies(used)))
+            manifest.write(json.dumps({"id": pid, "uri": f"URN://cv.resume/{pid}", "label": label}) + "\n")
+    info["partition_dir"] = out_dir
+    return info
+
+
+def sample_cv(index: int, params: Optional[generatorParams] = None) -> dict:
+    """Returns a CV payload in the shape the CV builder form posts to /record."""
+    rng = random.Random((params.seed if params else 42) * 1000003 + index)
+    words = lambda count: " ".join(rng.choice(WORDS) for _ in range(count))
+    return {
+        "personal": {"fullName": f"Writer{index} Bench", "function": words(2).title(), "email": f"w{index}@cv.example.org",
+                     "phone": f"1-{index:06d}", "birthday": "1990-01-01", "location": f"Address {index}",
+                     "aboutMe": words(20)},
+        "professionalProfile": [{"title": words(2).title(), "description": words(10)} for _ in range(3)],
+        "workExperience": [{"title": words(2).title(), "company": f"Company {i}", "city": f"City_{i}", "country": "Land",
+                            "startDate": f"20{10 + i}-01-01", "endDate": f"20{11 + i}-01-01", "duty": words(8)}
+                           for i in range(4)],
+        "education": [{"degree": words(2).title(), "institution": f"School {i}", "city": f"City_{i}", "country": "Land",
+                       "startDate": f"200{i}-09-01", "endDate": f"200{i + 3}-07-01"} for i in range(2)],
+        "skill": [{"title": words(2).title(), "description": words(5), "type": "Digital Skill", "status": "80%"}
+                  for _ in range(5)],
+        "project": [{"title": words(3).title(), "type": "Data Analysis", "description": words(8)} for _ in range(4)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume dataset.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--layout", choices=["partitions", "turtle"], default="partitions")
+    for name, default in asdict(generatorParams()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args()
+    params = generatorParams(**{name: getattr(args, name) for name in asdict(generatorParams())})
+    info = generate_dataset(args.out_dir, params, args.layout)
+    print(json.dumps(info, indent=1))
+
+
+if __name__ == '__main__':
+    main()
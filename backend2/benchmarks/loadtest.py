@@ -0,0 +1,345 @@
+"""
+Date: 2026-10-19
+Description: Load-test harness replaying the traffic of the portfolio: initial
+    page loads (GET /), profile switches (POST / from fetchFilteredCV) and CV
+    submissions (POST /record from updateTTLFile). Worker threads drive the app
+    in-process (Flask test client) or over HTTP on localhost, then the harness
+    reports throughput and p50/p95/p99 latency per endpoint and checks that the
+    store on disk survived the concurrent writes intact.
+
+Run from backend2/:
+    python -m benchmarks.loadtest [--mode inprocess|http] [--mix get=10,switch=80,record=10]
+        [--concurrency 8] [--duration 30] [--persons 100] [--out results.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from benchmarks.generator import generate_dataset, generatorParams, sample_cv
+from benchmarks.scenarios import install_store, load_app, rss_mb, summarize
+
+ENDPOINTS = ("get", "switch", "record")
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parses 'get=10,switch=80,record=10' into normalized weights."""
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name.strip()}', expected one of {', '.join(ENDPOINTS)}.")
+        mix[name.strip()] = float(weight or 1)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("The traffic mix needs a positive weight.")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+class inProcessClient:
+    """ this class sends requests through the Flask test client (one per worker thread)"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method: str, path: str, body: Optional[dict] = None):
+        """Returns (status code, response body bytes)."""
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.data
+
+
+class httpClient:
+    """ this class sends requests to a running server over HTTP"""
+
+    def __init__(self, base_url: str, timeout: float = 60):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, body: Optional[dict] = None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json"} if data else {})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+class loadTest:
+    """ this class runs closed-loop workers over a traffic mix and collects per-endpoint results"""
+
+    def __init__(self, make_client, names: List[str], mix: Dict[str, float], concurrency: int = 8,
+                 duration: float = 30.0, max_requests: Optional[int] = None, think_time: float = 0.0,
+                 seed: int = 7):
+        """
+        Args:
+            make_client: Function returning a new client (called once per worker).
+            names: Profiles the profile switches pick from.
+            mix: Normalized endpoint weights (see parse_mix).
+            concurrency: Number of worker threads.
+            duration: Seconds to run (ignored once max_requests is reached).
+            max_requests: Optional total number of requests.
+            think_time: Seconds each worker waits between requests.
+        """
+        self.make_client = make_client
+        self.names = names
+        self.mix = mix
+        self.concurrency = concurrency
+        self.duration = duration
+        self.max_requests = max_requests
+        self.think_time = think_time
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.timings = defaultdict(list)    # endpoint -> seconds
+        self.errors = defaultdict(int)      # endpoint -> failed requests
+        self.error_samples = []
+        self.written = []                   # names of the CVs accepted by /record
+        self.sent = 0
+        self.write_index = 0
+
+    def next_write(self) -> int:
+        with self.lock:
+            self.write_index += 1
+            return self.write_index
+
+    def take_slot(self) -> bool:
+        with self.lock:
+            if self.max_requests is not None and self.sent >= self.max_requests:
+                return False
+            self.sent += 1
+            return True
+
+    def one_request(self, client, endpoint: str, rng: random.Random):
+        """Sends one request of the given kind; returns (ok, error text)."""
+        if endpoint == "get":
+            status, body = client.request("GET", "/")
+            return status == 200 and b"all-data-container" in body, f"GET / -> {status}"
+
+        if endpoint == "switch":
+            name = rng.choice(self.names)
+            status, body = client.request("POST", "/", {"profile_user": name})
+            if status != 200:
+                return False, f"POST / {name!r} -> {status}"
+            data = json.loads(body)
+            # a switch racing a write must still get a complete payload
+            if "Details" not in data or "NameList" not in data:
+                return False, f"POST / {name!r} returned keys {sorted(data)}"
+            return True, ""
+
+        index = self.next_write()
+        payload = sample_cv(index)
+        status, body = client.request("POST", "/record", payload)
+        ok = status == 200 and json.loads(body).get("status") == "success"
+        if ok:
+            with self.lock:
+                self.written.append(payload["personal"]["fullName"])
+        return ok, f"POST /record #{index} -> {status} {body[:200]!r}"
+
+    def worker(self, number: int, deadline: float):
+        client = self.make_client()
+        rng = random.Random(self.seed * 7919 + number)
+        endpoints, weights = zip(*self.mix.items())
+        while time.perf_counter() < deadline and self.take_slot():
+            endpoint = rng.choices(endpoints, weights)[0]
+            start = time.perf_counter()
+            try:
+                ok, error = self.one_request(client, endpoint, rng)
+            except Exception as e:
+                ok, error = False, f"{endpoint}: {type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.timings[endpoint].append(elapsed)
+                if not ok:
+                    self.errors[endpoint] += 1
+                    if len(self.error_samples) < 20:
+                        self.error_samples.append(error)
+            if self.think_time:
+                time.sleep(self.think_time)
+
+    def run(self) -> dict:
+        """Runs the workers and returns throughput, latency and error counts per endpoint."""
+        start = time.perf_counter()
+        deadline = start + self.duration
+        threads = [threading.Thread(target=self.worker, args=(number, deadline), name=f"load-{number}")
+                   for number in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        endpoints = {}
+        for endpoint, values in self.timings.items():
+            endpoints[endpoint] = dict(summarize(values), errors=self.errors[endpoint],
+                                       throughput_rps=round(len(values) / elapsed, 2))
+        total = sum(len(values) for values in self.timings.values())
+        return {"seconds": round(elapsed, 3), "requests": total, "throughput_rps": round(total / elapsed, 2),
+                "errors": sum(self.errors.values()), "endpoints": endpoints, "error_samples": self.error_samples,
+                "written": len(self.written)}
+
+
+def check_store(partition_dir: str, written: List[str], live_store=None) -> dict:
+    """
+    Checks the store on disk after a load test: every partition parses, the
+    manifest is well formed and points at existing files, each accepted CV is
+    stored exactly once and a reload from disk matches the live store.
+
+    Returns:
+        dict: 'ok' plus the list of problems found.
+    """
+    from pyscript.store import MANIFEST_FILE, profileStore
+
+    problems = []
+    entries = []
+    with open(os.path.join(partition_dir, MANIFEST_FILE), encoding="utf-8") as manifest:
+        for number, line in enumerate(manifest, 1):
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                problems.append(f"manifest line {number} is not valid JSON: {line[:80]!r}")
+
+    ids = [entry.get("id") for entry in entries]
+    for pid in {pid for pid in ids if ids.count(pid) > 1}:
+        problems.append(f"partition id '{pid}' is listed {ids.count(pid)} times")
+    for entry in entries:
+        if not os.path.exists(os.path.join(partition_dir, f"{entry.get('id')}.ttl")):
+            problems.append(f"partition file of '{entry.get('label')}' ({entry.get('id')}) is missing")
+
+    labels = [entry.get("label") for entry in entries]
+    for name in written:
+        if labels.count(name) != 1:
+            problems.append(f"accepted CV '{name}' is stored {labels.count(name)} times")
+
+    try:
+        reloaded = profileStore(partition_dir=partition_dir)
+    except Exception as e:
+        problems.append(f"the store does not reload from disk: {type(e).__name__}: {e}")
+        reloaded = None
+    if reloaded is not None and live_store is not None:
+        if len(reloaded) != len(live_store):
+            problems.append(f"reloaded store has {len(reloaded)} triples, the live store {len(live_store)}")
+        if sorted(reloaded.name_list()) != sorted(live_store.name_list()):
+            problems.append("reloaded profile list differs from the live store")
+
+    return {"ok": not problems, "profiles": len(entries), "problems": problems}
+
+
+def start_server(app):
+    """Serves the app on a free localhost port in a daemon thread; returns (server, base URL)."""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class quietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=quietHandler)
+    threading.Thread(target=server.serve_forever, name="load-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def run_load_test(settings: dict) -> dict:
+    """
+    Loads a private copy of the dataset, runs the load test against it and checks the store.
+
+    Args:
+        settings: dataset_dir, mode ('inprocess' or 'http'), mix, concurrency, duration,
+            max_requests, think_time, warm (precompute all profiles first) and seed.
+    """
+    store, load_seconds = install_store(settings["dataset_dir"])
+    app_module = load_app()
+    if settings.get("warm"):
+        app_module.profile_cache.warm()
+
+    server = None
+    if settings["mode"] == "http":
+        server, base_url = start_server(app_module.app)
+        make_client = lambda: httpClient(base_url)
+    else:
+        make_client = lambda: inProcessClient(app_module.app)
+
+    test = loadTest(make_client, store.name_list(), parse_mix(settings["mix"]), settings["concurrency"],
+                    settings["duration"], settings.get("max_requests"), settings.get("think_time", 0.0),
+                    settings.get("seed", 7))
+    rss_before = rss_mb()
+    try:
+        result = test.run()
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    result.update({"mode": settings["mode"], "mix": settings["mix"], "concurrency": settings["concurrency"],
+                   "load_seconds": round(load_seconds, 4), "rss_mb_before": rss_before, "rss_mb_after": rss_mb()})
+    result["integrity"] = check_store(store.partition_dir, test.written, store)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the CV builder with a read/write traffic mix.")
+    parser.add_argument("--mode", choices=["inprocess", "http"], default="inprocess",
+                        help="Flask test client in worker threads, or a localhost HTTP server")
+    parser.add_argument("--mix", default="get=10,switch=80,record=10", help="endpoint weights")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds between a worker's requests")
+    parser.add_argument("--warm", action="store_true", help="precompute every profile before the run")
+    parser.add_argument("--dataset", help="existing partition directory (copied; never modified)")
+    parser.add_argument("--persons", type=int, default=100, help="profiles to generate when --dataset is not given")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="write the results as JSON")
+    args = parser.parse_args()
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    dataset_dir = args.dataset
+    if dataset_dir is None:
+        dataset_dir = tempfile.mkdtemp(prefix="cv-load-data-")
+        generate_dataset(dataset_dir, generatorParams(persons=args.persons, seed=args.seed))
+
+    result = run_load_test({"dataset_dir": dataset_dir, "mode": args.mode, "mix": args.mix,
+                            "concurrency": args.concurrency, "duration": args.duration,
+                            "max_requests": args.requests, "think_time": args.think_time,
+                            "warm": args.warm, "seed": args.seed})
+
+    print(f"\n{result['requests']} requests in {result['seconds']}s ({result['throughput_rps']} req/s), "
+          f"{result['errors']} error(s), concurrency {result['concurrency']}, mode {result['mode']}")
+    print(f"{'endpoint':10s} {'count':>7s} {'req/s':>8s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'errors':>7s}")
+    for endpoint in ENDPOINTS:
+        stats = result["endpoints"].get(endpoint)
+        if stats:
+            print(f"{endpoint:10s} {stats['n']:7d} {stats['throughput_rps']:8.2f} {stats['p50_ms']:9.2f} "
+                  f"{stats['p95_ms']:9.2f} {stats['p99_ms']:9.2f} {stats['errors']:7d}")
+    for sample in result["error_samples"]:
+        print(f"  error: {sample}")
+    integrity = result["integrity"]
+    print(f"Store integrity: {'OK' if integrity['ok'] else 'CORRUPTED'} "
+          f"({integrity['profiles']} profiles, {result['written']} written during the run)")
+    for problem in integrity["problems"]:
+        print(f"  {problem}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as out:
+            json.dump(result, out, indent=1)
+        print(f"Results written to '{args.out}'.")
+    return 0 if integrity["ok"] and not result["errors"] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Date: 2026-10-19
+Description: Runs the benchmark scenarios on a generated dataset and writes
+    the results as JSON (with the commit, interpreter and dataset shape) so
+    runs on different commits can be compared with benchmarks.compare.
+
+Run from backend2/:
+    python -m benchmarks.run [--persons 200] [--scenarios load,profile] [--out results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from multiprocessing import get_context
+
+from benchmarks.generator import generate_dataset, generatorParams
+from benchmarks.scenarios import SCENARIOS, sample_names
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def git_commit() -> str:
+    """Returns the current commit (with '-dirty' for local changes), or 'unknown'."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, check=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_scenario(name: str, settings: dict) -> dict:
+    """Runs one scenario; called in a fresh interpreter."""
+    os.environ["CV_WARMUP"] = "0"
+    start = time.perf_counter()
+    try:
+        result = SCENARIOS[name](settings)
+    except Exception:
+        return {"error": traceback.format_exc()}
+    result["scenario_seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def run_all(names, settings: dict) -> dict:
+    """Runs each scenario in its own spawned process and collects the results."""
+    results = {}
+    for name in names:
+        print(f"Running scenario '{name}' ...", flush=True)
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results[name] = pool.submit(run_scenario, name, settings).result()
+        if "error" in results[name]:
+            print(results[name]["error"])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CV builder on a synthetic dataset.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated scenarios (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--dataset", help="existing partition directory to use instead of generating one")
+    parser.add_argument("--samples", type=int, default=10, help="profiles sampled for per-profile timings")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions of each per-profile timing")
+    parser.add_argument("--writes", type=int, default=20, help="CV submissions in the write scenario")
+    parser.add_argument("--edits", type=int, default=1000, help="edits of one CV in the upsert scenario")
+    parser.add_argument("--load-requests", type=int, default=100, help="requests of the mixed_load scenario")
+    parser.add_argument("--load-concurrency", type=int, default=4, help="worker threads of the mixed_load scenario")
+    parser.add_argument("--record-rows", type=int, default=100000, help="result rows of the records scenario")
+    parser.add_argument("--scaling-sizes", default="10,100,1000", help="profile counts of the scaling scenario")
+    parser.add_argument("--bulk-sizes", default="100000,1000000",
+                        help="dump sizes in triples of the bulkload scenario (e.g. 1000000,10000000)")
+    parser.add_argument("--bulk-workers", default="1,4,8", help="parser process counts of the bulkload scenario")
+    parser.add_argument("--export-triples", type=int, default=200000,
+                        help="store size in triples of the rdf_export scenario (e.g. 5000000)")
+    parser.add_argument("--intern-triples", type=int, default=1000000,
+                        help="graph size in triples of the interning scenario")
+    parser.add_argument("--tenants", type=int, default=1000, help="tenants of the tenants scenario")
+    parser.add_argument("--tenant-requests", type=int, default=2000, help="requests of the tenants scenario")
+    parser.add_argument("--tenant-cache", type=int, default=100,
+                        help="tenants' worth of triples the tenants scenario keeps loaded")
+    parser.add_argument("--burst-clients", type=int, default=32,
+                        help="concurrent clients of each burst in the burst scenario")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/<time>-<commit>.json)")
+    for name, default in asdict(generatorParams()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    params = generatorParams(**{name: getattr(args, name) for name in asdict(generatorParams())})
+    dataset_dir = args.dataset
+    if dataset_dir is None:
+        dataset_dir = tempfile.mkdtemp(prefix="cv-bench-data-")
+        start = time.perf_counter()
+        generate_dataset(dataset_dir, params)
+        print(f"Generated {params.persons} profiles in '{dataset_dir}' ({time.perf_counter() - start:.2f}s).")
+    with open(os.path.join(dataset_dir, "manifest.jsonl"), encoding="utf-8") as manifest:
+        labels = [json.loads(line)["label"] for line in manifest if line.strip()]
+
+    samples = sample_names(len(labels), args.samples) if args.dataset is None else \
+        labels[::max(1, len(labels) // args.samples)][:args.samples]
+    settings = {
+        "dataset_dir": dataset_dir,
+        "params": asdict(params),
+        "samples": samples,
+        "repeat": args.repeat,
+        "writes": args.writes,
+        "edits": args.edits,
+        "load_requests": args.load_requests,
+        "load_concurrency": args.load_concurrency,
+        "record_rows": args.record_rows,
+        "scaling_sizes": [int(size) for size in args.scaling_sizes.split(",") if size.strip()],
+        "bulk_sizes": [int(size) for size in args.bulk_sizes.split(",") if size.strip()],
+        "export_triples": args.export_triples,
+        "intern_triples": args.intern_triples,
+        "tenants": args.tenants,
+        "tenant_requests": args.tenant_requests,
+        "tenant_cache": args.tenant_cache,
+        "burst_clients": args.burst_clients,
+        "bulk_workers": [int(count) for count in args.bulk_workers.split(",") if count.strip()],
+    }
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": settings,
+        "results": run_all(names, settings),
+    }
+
+    out_path = args.out or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as out:
+        json.dump(report, out, indent=1)
+    print(f"Results written to '{out_path}'.")
+    return 1 if any("error" in result for result in report["results"].values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1096 @@
+"""
+Date: 2026-10-19
+Description: The benchmark scenarios. Each scenario takes the run settings
+    (dataset directory, sampled profiles, repetitions, ...) and returns a dict
+    of measurements; run.py executes every scenario in a fresh interpreter so
+    load times and RSS are not skewed by earlier scenarios.
+"""
+
+import copy
+import os
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+from rdflib import Graph
+from rdflib.plugins.sparql import prepareQuery
+
+from benchmarks.generator import generate_dataset, generatorParams, sample_cv
+
+SCENARIOS = {}      # scenario name -> function(settings) -> dict
+
+
+def scenario(name: str):
+    """Registers a scenario function under name."""
+    def register(function: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        SCENARIOS[name] = function
+        return function
+    return register
+
+
+# --- measurement helpers ---
+def summarize(seconds: Iterable[float]) -> Dict[str, float]:
+    """Returns count, min, mean, p50, p95, p99 and max of a list of durations, in milliseconds."""
+    values = sorted(value * 1000 for value in seconds)
+    if not values:
+        return {"n": 0}
+    pick = lambda q: values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+    return {"n": len(values), "min_ms": round(values[0], 3), "mean_ms": round(statistics.fmean(values), 3),
+            "p50_ms": round(pick(0.50), 3), "p95_ms": round(pick(0.95), 3), "p99_ms": round(pick(0.99), 3),
+            "max_ms": round(values[-1], 3)}
+
+
+def timed(function: Callable[[], Any]):
+    """Calls function and returns (elapsed seconds, result)."""
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def rss_mb() -> float:
+    """Returns the current resident set size of the process in MiB (Linux), else the peak."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Returns the peak resident set size of the process in MiB."""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def install_store(partition_dir: str):
+    """
+    Loads a private copy of a generated partition directory as the process-wide
+    store, so scenarios that write never touch the shared dataset.
+
+    Returns:
+        (store, seconds spent loading)
+    """
+    import pyscript.store as store_module
+
+    copy_dir = tempfile.mkdtemp(prefix="cv-bench-store-")
+    shutil.copytree(partition_dir, copy_dir, dirs_exist_ok=True)
+    elapsed, store = timed(lambda: store_module.profileStore(partition_dir=copy_dir))
+    store_module._default_store = store
+    return store, elapsed
+
+
+def load_app():
+    """Imports the Flask app (after install_store) with the start-up warm-up disabled."""
+    os.environ["CV_WARMUP"] = "0"
+    import app as app_module
+    return app_module
+
+
+# --- scenarios ---
+@scenario("load")
+def load_scenario(settings):
+    """Store load time, triple count and memory."""
+    before = rss_mb()
+    store, elapsed = install_store(settings["dataset_dir"])
+    return {"seconds": round(elapsed, 4), "profiles": len(store.entries), "triples": len(store),
+            "triples_per_second": round(len(store) / elapsed) if elapsed else None,
+            "rss_mb_before": before, "rss_mb_after": rss_mb(), "peak_rss_mb": peak_rss_mb()}
+
+
+@scenario("sections")
+def sections_scenario(settings):
+    """Latency of every section query over the sampled profiles."""
+    install_store(settings["dataset_dir"])
+    app_module = load_app()
+    from pyscript.grapher import graphData
+
+    timings = {key: [] for key in app_module.SECTION_GETTERS}
+    for _ in range(settings["repeat"]):
+        for name in settings["samples"]:
+            graf = graphData(name)
+            graf.get_name()
+            for key, getter in app_module.SECTION_GETTERS.items():
+                timings[key].append(timed(lambda: getter(graf))[0])
+    return {key: summarize(values) for key, values in timings.items()}
+
+
+@scenario("profile")
+def profile_scenario(settings):
+    """Full profile latency: computed (cache bypassed) and served from the profile cache."""
+    install_store(settings["dataset_dir"])
+    app_module = load_app()
+    import json
+    from pyscript.records import to_json
+
+    computed, cached, sizes = [], [], []
+    for _ in range(settings["repeat"]):
+        for name in settings["samples"]:
+            elapsed, data = timed(lambda: app_module.computeSections(name))
+            computed.append(elapsed)
+            sizes.append(len(json.dumps(data, default=to_json)))
+    for name in settings["samples"]:
+        app_module.profile_cache.refresh(name)
+    for _ in range(settings["repeat"]):
+        for name in settings["samples"]:
+            cached.append(timed(lambda: app_module.getDictionary(name))[0])
+    return {"computed": summarize(computed), "cached": summarize(cached),
+            "payload_bytes_mean": round(statistics.fmean(sizes)), "rss_mb": rss_mb()}
+
+
+@scenario("write")
+def write_scenario(settings):
+    """/record latency, store growth and memory over a series of CV submissions."""
+    store, _ = install_store(settings["dataset_dir"])
+    app_module = load_app()
+    # keep the background warm-up started by /record out of the write timings
+    app_module.profile_cache.top_n = 0
+    client = app_module.app.test_client()
+
+    triples_before, rss_before = len(store), rss_mb()
+    timings, verdicts = [], {}
+    for index in range(settings["writes"]):
+        payload = sample_cv(index)
+        elapsed, response = timed(lambda: client.post("/record", json=payload))
+        timings.append(elapsed)
+        status = response.get_json().get("status")
+        verdicts[status] = verdicts.get(status, 0) + 1
+    return {"latency": summarize(timings), "verdicts": verdicts, "triples_added": len(store) - triples_before,
+            "rss_mb_before": rss_before, "rss_mb_after": rss_mb()}
+
+
+def edited_cv(payload: dict, revision: int) -> dict:
+    """Returns a copy of a CV payload with one field changed, cycling through the sections."""
+    payload = copy.deepcopy(payload)
+    section, field = (("personal", "aboutMe"), ("workExperience", "title"), ("skill", "description"),
+                      ("project", "title"))[revision % 4]
+    target = payload[section] if section == "personal" else \
+        payload[section][revision // 4 % len(payload[section])]
+    target[field] = f"{target[field]} rev {revision}"
+    return payload
+
+
+def partition_bytes(store, name: str) -> int:
+    """Returns the size on disk of a profile's partition file and changelog."""
+    from pyscript.store import CHANGELOG_SUFFIX
+
+    pid = store.find_person(name)["id"]
+    paths = [os.path.join(store.partition_dir, f"{pid}{suffix}") for suffix in (".ttl", CHANGELOG_SUFFIX)]
+    return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+
+@scenario("upsert")
+def upsert_scenario(settings):
+    """Repeated edits of one CV: /record upserts (diffs) vs appends, latency and store growth."""
+    from pyscript.store import profileStore
+
+    store, _ = install_store(settings["dataset_dir"])
+    app_module = load_app()
+    app_module.profile_cache.top_n = 0
+    client = app_module.app.test_client()
+    base = sample_cv(0)
+    name = base["personal"]["fullName"]
+    client.post("/record", json=base)
+
+    results = {}
+    # appends re-split and re-materialize on every write, so fewer of them are timed
+    for mode, edits in (("upsert", settings["edits"]), ("append", min(settings["edits"], 100))):
+        triples, profiles, timings = len(store), len(store.entries), []
+        for revision in range(edits):
+            payload = edited_cv(base, revision)
+            elapsed, response = timed(lambda: client.post(f"/record?mode={mode}", json=payload))
+            timings.append(elapsed)
+            assert response.get_json()["status"] == "success", response.get_data(as_text=True)
+        results[mode] = {"edits": edits, "latency": summarize(timings),
+                         "triples_added_per_edit": round((len(store) - triples) / edits, 2),
+                         "profiles_added": len(store.entries) - profiles}
+        if mode == "upsert":
+            results[mode]["partition_bytes"] = partition_bytes(store, name)
+            results[mode]["changelog_triples"] = store.pending_changes.get(store.find_person(name)["id"], 0)
+            # edited literals leave unused terms behind until the store moves to a new dictionary
+            results[mode]["terms"] = len(store.terms)
+            results[mode]["term_generations"] = store.term_generation
+            reloaded = profileStore(partition_dir=store.partition_dir)
+            pid = store.find_person(name)["id"]
+            results[mode]["reload_matches"] = set(reloaded.graphs[pid]) == set(store.graphs[pid])
+    return results
+
+
+class mergedStore:
+    """ this class serves every profile from one merged graph, like the store did before partitioning"""
+
+    def __init__(self, store):
+        self.graph = Graph()
+        self.graph += store.common
+        for pid, graph in store.graphs.items():
+            self.graph += graph
+            self.graph += store.inferred[pid]
+        self.names = store.name_list()
+        self.store = store
+        # the merged graph holds the store's own term objects, so its dictionary applies (graphData reads it)
+        self.terms = store.terms
+
+    def name_list(self) -> List[str]:
+        return list(self.names)
+
+    def profile_view(self, name: str) -> Graph:
+        return self.graph
+
+    def timeline(self, name: str, section: str) -> List[str]:
+        return self.store.timeline(name, section)
+
+
+@scenario("scaling")
+def scaling_scenario(settings):
+    """Per-profile latency as the number of profiles grows: partitioned views vs one merged graph."""
+    from pyscript.grapher import graphData
+    from pyscript.store import profileStore
+
+    app_module = load_app()
+    results = {}
+    for persons in settings["scaling_sizes"]:
+        params = generatorParams(**dict(settings["params"], persons=persons))
+        dataset_dir = tempfile.mkdtemp(prefix=f"cv-bench-scale-{persons}-")
+        generate_dataset(dataset_dir, params)
+        load_seconds, store = timed(lambda: profileStore(partition_dir=dataset_dir))
+        merged = mergedStore(store)
+        names = sample_names(persons, min(len(settings["samples"]), persons))
+
+        timings = {"partitioned": [], "merged": []}
+        for label, source in (("partitioned", store), ("merged", merged)):
+            for name in names:
+                def profile():
+                    graf = graphData(name, store=source)
+                    graf.get_name()
+                    graf.get_personDetails()
+                    for key, getter in app_module.SECTION_GETTERS.items():
+                        if key != "Details":
+                            getter(graf)
+                timings[label].append(timed(profile)[0])
+        results[str(persons)] = {"triples": len(store), "load_seconds": round(load_seconds, 4),
+                                 "partitioned": summarize(timings["partitioned"]),
+                                 "merged": summarize(timings["merged"])}
+        shutil.rmtree(dataset_dir, ignore_errors=True)
+    return results
+
+
+# the skill, skill-type and social queries as they were before the subClassOf edges were materialized
+# (tests/test_inference.py checks the current queries against them)
+LEGACY_QUERIES = {
+    "get_skill_query": """
+        SELECT ?skill ?skillTitle ?category ?percentageScore ?percentage ?skillDescription ?typename
+        WHERE {{
+            <{person}> :hasSkill ?skill.
+
+            ?skill rdf:type ?skillType ;
+                :hasPercentage ?percentage ;
+                foaf:status ?percentageScore ;
+                foaf:title ?skillTitle .
+
+            ?skillType rdfs:subClassOf :Skills ;
+             rdfs:label ?typename .
+
+            OPTIONAL {{ ?skill :hasCategory ?category }} .
+            OPTIONAL {{ ?skill dc:description ?skillDescription }} .
+        }}
+    """,
+    "get_skill_type": """
+        Select DISTINCT ?skillLabel
+        WHERE {{
+            ?skill rdf:type owl:Class ;
+              rdfs:subClassOf :Skills ;
+              rdfs:label ?skillLabel .
+
+            ?specSkill rdf:type ?skill.
+
+            <{person}> :hasSkill  ?specSkill .
+              }}
+    """,
+    "get_social_query": """
+        SELECT ?social ?socialType ?socialLink
+            WHERE {{
+                <{person}> :hasSocial ?social.
+
+                ?social rdf:type ?socialType ;
+                    :hasLink ?socialLink .
+
+                ?socialType rdfs:subClassOf :Socials.
+
+                }}
+    """,
+}
+
+
+@scenario("inference")
+def inference_scenario(settings):
+    """Skill, skill-type and social queries: subClassOf joins vs the materialized edges (checked in tests/)."""
+    from rdflib import URIRef
+    from pyscript.rdfquery import rdfQueries as asker
+
+    store, _ = install_store(settings["dataset_dir"])
+
+    def prepare(template: str):
+        # bind the person at execution time so parsing stays out of the timings
+        return prepareQuery(asker.get_prefix() + template.replace("<{person}>", "?person")
+                            .replace("{{", "{").replace("}}", "}"))
+
+    results = {}
+    for name, legacy_text in LEGACY_QUERIES.items():
+        prepared = {"join": prepare(legacy_text), "materialized": prepare(getattr(asker, name)())}
+        timings = {label: [] for label in prepared}
+        for _ in range(settings["repeat"]):
+            for profile in settings["samples"]:
+                view = store.profile_view(profile)
+                bindings = {"person": URIRef(store.find_person(profile)["uri"])}
+                for label, query in prepared.items():
+                    timings[label].append(timed(lambda: list(view.query(query, initBindings=bindings)))[0])
+        results[name] = {label: summarize(values) for label, values in timings.items()}
+    return results
+
+
+@scenario("section_fetch")
+def section_fetch_scenario(settings):
+    """POST / latency and payload size: the full dump vs one section vs a page of a section."""
+    install_store(settings["dataset_dir"])
+    app_module = load_app()
+    client = app_module.app.test_client()
+    requests = {
+        "full": lambda name: {"profile_user": name},
+        "one_section": lambda name: {"profile_user": name, "sections": ["Skills"]},
+        "paged_projected": lambda name: {"profile_user": name, "sections": {
+            "Project": {"limit": 3, "fields": ["projectTitle"]}}},
+    }
+
+    results = {}
+    for label, body in requests.items():
+        for state in ("cold", "cached"):
+            timings, sizes = [], []
+            for _ in range(settings["repeat"]):
+                for name in settings["samples"]:
+                    if state == "cold":
+                        app_module.profile_cache.entries.clear()
+                    else:
+                        app_module.profile_cache.get(name)
+                    elapsed, response = timed(lambda: client.post("/", json=body(name)))
+                    timings.append(elapsed)
+                    sizes.append(len(response.data))
+            results[f"{label}_{state}"] = dict(summarize(timings), bytes_mean=round(statistics.fmean(sizes)))
+    return results
+
+
+@scenario("warmup")
+def warmup_scenario(settings):
+    """Warm-up duration and the first request after boot, with and without warm-up."""
+    store, load_seconds = install_store(settings["dataset_dir"])
+    app_module = load_app()
+    client = app_module.app.test_client()
+    name = settings["samples"][0]
+
+    cold, response = timed(lambda: client.post("/", json={"profile_user": name}))
+    app_module.profile_cache.entries.clear()
+    warm_seconds, warmed = timed(app_module.profile_cache.warm)
+    warm_first, _ = timed(lambda: client.post("/", json={"profile_user": name}))
+    return {"load_seconds": round(load_seconds, 4), "profiles": len(store.entries),
+            "first_request_cold_ms": round(cold * 1000, 3), "warmup_seconds": round(warm_seconds, 4),
+            "warmed_profiles": warmed, "first_request_warm_ms": round(warm_first * 1000, 3),
+            "status": response.status_code, "rss_mb": rss_mb()}
+
+
+@scenario("export")
+def export_scenario(settings):
+    """Static export of every profile: full, incremental with no change and after one new CV."""
+    store, _ = install_store(settings["dataset_dir"])
+    load_app()
+    import export_static
+    from benchmarks.generator import PREFIXES, resumeGenerator
+
+    output_dir = tempfile.mkdtemp(prefix="cv-bench-export-")
+    try:
+        full = export_static.export_site(output_dir, full=True)
+        unchanged = export_static.export_site(output_dir)
+        # one more generated profile; shared nodes travel with its partition, common.ttl is untouched
+        generator = resumeGenerator(generatorParams(**settings["params"]))
+        pool = generator.pool_statements()
+        _, _, text, used = generator.person(settings["params"]["persons"])
+        graph = Graph()
+        graph.parse(data=PREFIXES + text + "".join(pool[node] for node in generator.pool_dependencies(used)),
+                    format="turtle")
+        store.add_graph(graph)
+        one_new = export_static.export_site(output_dir)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return {"profiles": len(store.entries), "full": full, "incremental_unchanged": unchanged,
+            "incremental_one_new": one_new}
+
+
+def observation_count(registry) -> int:
+    """Returns the number of observations and increments recorded by the registry so far."""
+    total = 0
+    for metric in list(registry.metrics.values()):
+        with metric.lock:
+            for state in metric.values.values():
+                total += sum(state[:-1]) if metric.kind == "histogram" else 1 if metric.kind == "gauge" else state
+    return int(total)
+
+
+@scenario("metrics")
+def metrics_scenario(settings):
+    """Cost of the instrumentation: observations per request times the cost of one observation."""
+    install_store(settings["dataset_dir"])
+    app_module = load_app()
+    from pyscript.metrics import REGISTRY, metricHistogram
+
+    client = app_module.app.test_client()
+    timings, observations = [], []
+    for _ in range(settings["repeat"]):
+        for name in settings["samples"]:
+            app_module.profile_cache.entries.clear()
+            before = observation_count(REGISTRY)
+            timings.append(timed(lambda: client.post("/", json={"profile_user": name}))[0])
+            observations.append(observation_count(REGISTRY) - before)
+
+    histogram = metricHistogram("cv_bench_seconds", "Benchmark histogram.", ["section"])
+    loops = 100000
+    observe_seconds, _ = timed(lambda: [histogram.observe(0.01, section="Skills") for _ in range(loops)])
+    per_observe = observe_seconds / loops
+    render_seconds, text = timed(REGISTRY.render)
+
+    request = summarize(timings)
+    per_request = statistics.fmean(observations)
+    return {"request": request, "observations_per_request": round(per_request, 1),
+            "observe_us": round(per_observe * 1e6, 3),
+            "overhead_percent": round(100 * per_request * per_observe * 1000 / request["mean_ms"], 4),
+            "render_ms": round(render_seconds * 1000, 3), "render_bytes": len(text)}
+
+
+def sample_names(persons: int, count: int) -> List[str]:
+    """Returns the labels of count generated profiles spread evenly over the dataset."""
+    count = max(1, min(count, persons))
+    return [f"Fname{index} Lname{index}" for index in
+            sorted({round(step * (persons - 1) / max(count - 1, 1)) for step in range(count)})]
+
+
+@scenario("mixed_load")
+def mixed_load_scenario(settings):
+    """Concurrent page loads, profile switches and CV submissions (see benchmarks.loadtest)."""
+    from benchmarks.loadtest import run_load_test
+
+    result = run_load_test({"dataset_dir": settings["dataset_dir"], "mode": "inprocess",
+                            "mix": "get=10,switch=80,record=10", "concurrency": settings["load_concurrency"],
+                            "duration": 3600.0, "max_requests": settings["load_requests"], "warm": True})
+    result.pop("error_samples")
+    return result
+
+
+@scenario("startup")
+def startup_scenario(settings):
+    """`import app` time in fresh interpreters and the modules deferred to first use."""
+    from benchmarks.startup import startup_report
+
+    return startup_report(runs=max(settings["repeat"], 5))
+
+
+def aggregate_by_keys(data: List[Dict[str, Any]], group_keys: List[str]) -> List[Dict[str, Any]]:
+    """
+    Groups dicts by group_keys, consolidating every other key into a list of
+    its distinct values: graphData's grouping before the section records.
+    """
+    grouped = {}
+    for item in data:
+        group_id = tuple(item[key] for key in group_keys)
+        if group_id not in grouped:
+            grouped[group_id] = {key: item[key] if key in group_keys else {value} for key, value in item.items()}
+        else:
+            for key, value in item.items():
+                if key not in group_keys:
+                    grouped[group_id][key].add(value)
+    return [{key: value if key in group_keys else list(value) for key, value in group.items()}
+            for group in grouped.values()]
+
+
+def legacy_work_experience(graf, details):
+    """The per-row dict pipeline get_workExperience used before the section records."""
+    WorkExperience = []
+    for row in details:
+        WorkExperience.append({
+            'main': str(row.experience),
+            'workTitle': str(row.workTitle),
+            'industryName': str(row.industryName),
+            'city': graf.process_uri_fragment(str(row.city)),
+            'country': graf.process_uri_fragment(str(row.country)),
+            'startDate': graf.format_date_string(str(row.startDate), 'year'),
+            'endDate': graf.format_date_string(str(row.endDate), 'year') if row.endDate else 'Present',
+            'dutyDescription': str(row.dutyDescription),
+            'category': graf.process_uri_fragment(str(row.category)) if row.category else ''
+            })
+    return aggregate_by_keys(WorkExperience, ['main'])
+
+
+@scenario("records")
+def records_scenario(settings):
+    """tracemalloc peak and time of turning a large experience result into section records vs per-row dicts."""
+    import json
+    import tracemalloc
+    from pyscript.grapher import graphData
+    from pyscript.rdfquery import rdfQueries as asker
+    from pyscript.records import to_json
+    from pyscript.store import profileStore
+
+    # one person whose experience query returns about record_rows rows (no optional categories)
+    experiences = 1000
+    params = generatorParams(persons=1, experiences=experiences, duties=max(1, settings["record_rows"] // experiences),
+                             educations=1, skills=1, projects=1, certificates=1, services=1, socials=1,
+                             optional_density=0.0)
+    dataset_dir = tempfile.mkdtemp(prefix="cv-bench-records-")
+    generate_dataset(dataset_dir, params)
+    store = profileStore(partition_dir=dataset_dir)
+    graf = graphData("Fname0 Lname0", store=store)
+    graf.get_name()
+    graf.get_personDetails()
+    query_seconds, rows = timed(lambda: graf.run_query(asker.get_experience_query, person=graf.nameURI,
+                                                                     items=""))
+
+    def measure(convert):
+        # timed without tracing (tracemalloc slows allocation-heavy code several times over)
+        elapsed, _ = timed(convert)
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        result = convert()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return result, {"seconds": round(elapsed, 4), "peak_mb": round((peak - base) / 2 ** 20, 2),
+                        "retained_mb": round((current - base) / 2 ** 20, 2)}
+
+    legacy, legacy_stats = measure(lambda: legacy_work_experience(graf, rows))
+    graf.run_query = lambda *args, **kwargs: rows
+    records, records_stats = measure(graf.get_workExperience)
+    shutil.rmtree(dataset_dir, ignore_errors=True)
+
+    # same items, keys and values (value order inside the lists may differ: sets vs first-seen order)
+    normalize = lambda items: sorted(json.dumps({key: sorted(value) if isinstance(value, list) else value
+                                                 for key, value in item.items()}, sort_keys=True) for item in items)
+    identical = normalize(legacy) == normalize(json.loads(json.dumps(records, default=to_json)))
+    return {"rows": len(rows), "items": len(records), "query_seconds": round(query_seconds, 3),
+            "dicts": legacy_stats, "records": records_stats, "identical_output": identical}
+
+
+@scenario("timeline")
+def timeline_scenario(settings):
+    """Dated sections: the presorted timelines vs the former ORDER BY, whole section and the latest 3 (order checked in tests/)."""
+    from pyscript.grapher import graphData
+    from pyscript.rdfquery import rdfQueries as asker
+    from pyscript.timeline import values_clause
+
+    store, _ = install_store(settings["dataset_dir"])
+    sections = {
+        "WorkExperience": (asker.get_experience_query, graphData.get_workExperience),
+        "Education": (asker.get_education_query, graphData.get_Education),
+        "Certificate": (asker.get_achievement_query, graphData.get_certifications),
+    }
+
+    results = {}
+    for section, (template, getter) in sections.items():
+        # query evaluation alone (parsed beforehand), then the getters end to end (parse included)
+        timings = {"eval_order_by": [], "eval_all": [], "eval_latest_3": [], "getter_all": [], "getter_latest_3": []}
+        for _ in range(settings["repeat"]):
+            for name in settings["samples"]:
+                graf = graphData(name, store=store)
+                graf.get_name()
+                graf.get_personDetails()
+                timeline = store.timeline(name, section)
+                text = lambda items, order="": prepareQuery(
+                    asker.get_prefix() + template().format(person=graf.nameURI, items=items) + order)
+                prepared = {"eval_order_by": text("", "\nORDER BY ASC(BOUND(?endDate)) DESC(?endDate)"),
+                            "eval_all": text(""), "eval_latest_3": text(values_clause(section, timeline[:3]))}
+                for label, query in prepared.items():
+                    elapsed, _ = timed(lambda: list(graf.graphDB.query(query)))
+                    timings[label].append(elapsed)
+                elapsed, _ = timed(lambda: getter(graf))
+                timings["getter_all"].append(elapsed)
+                elapsed, _ = timed(lambda: getter(graf, 0, 3))
+                timings["getter_latest_3"].append(elapsed)
+        results[section] = {label: summarize(values) for label, values in timings.items()}
+    return results
+
+
+@scenario("search")
+def search_scenario(settings):
+    """/search from the inverted index vs a FILTER(CONTAINS(...)) scan of every partition, plus index build cost."""
+    from rdflib import URIRef
+    from pyscript.search import searchIndex, tokenize
+
+    store, _ = install_store(settings["dataset_dir"])
+    app_module = load_app()
+    client = app_module.app.test_client()
+
+    def build():
+        index = searchIndex()
+        for entry in store.entries.values():
+            index.add_partition(entry["id"], store.graphs[entry["id"]], URIRef(entry["uri"]), entry["label"])
+        return index
+
+    build_seconds, index = timed(build)
+    results = {"profiles": len(index), "tokens": len(index.postings), "build_seconds": round(build_seconds, 4),
+               "postings": sum(len(postings) for postings in index.postings.values())}
+
+    # ASK per word and partition: a profile matches a query when each of its words occurs in some literal
+    ask = {}
+    def scan(query: str):
+        matched = set()
+        for entry in store.entries.values():
+            view = store.profile_view(entry["label"])
+            if all(bool(view.query(ask[word])) for word in tokenize(query)):
+                matched.add(entry["id"])
+        return matched
+
+    first = settings["samples"][0].split()[0].lower()
+    queries = {"common_word": "python", "two_words": "machine learning", "rare_name": first,
+               "skills_only": ("database", "Skills")}
+    for label, query in queries.items():
+        query, section = query if isinstance(query, tuple) else (query, None)
+        for word in tokenize(query):
+            ask.setdefault(word, prepareQuery(
+                f'ASK {{ ?s ?p ?o FILTER(isLiteral(?o) && CONTAINS(LCASE(STR(?o)), "{word}")) }}'))
+        url = f"/search?q={query}&limit=20" + (f"&section={section}" if section else "")
+        timings = {"index": [], "endpoint": []}
+        for _ in range(settings["repeat"]):
+            elapsed, found = timed(lambda: index.search(query, section=section, limit=len(index)))
+            timings["index"].append(elapsed)
+            elapsed, _ = timed(lambda: client.get(url))
+            timings["endpoint"].append(elapsed)
+        # the scan takes seconds; one run is enough to compare
+        elapsed, scanned = timed(lambda: scan(query))
+        timings["sparql_scan"] = [elapsed]
+        indexed = {result["id"] for result in found["results"]}
+        results[label] = {name: summarize(values) for name, values in timings.items()}
+        # the scan matches substrings anywhere (and ignores the section), the index whole tokens
+        results[label].update(index_matches=len(indexed), scan_matches=len(scanned),
+                              scan_only=len(scanned - indexed), index_only=len(indexed - scanned))
+
+    # a new CV is searchable as soon as /record returns
+    writes_before = len(store.search)
+    response = client.post("/record", json=sample_cv(0))
+    found = client.get("/search?q=Writer0").get_json()
+    results["record"] = {"status": response.status_code, "indexed_profiles": len(store.search) - writes_before,
+                         "searchable": any(result["name"] == "Writer0 Bench" for result in found["results"])}
+    return results
+
+
+def dataset_triples(settings) -> tuple:
+    """Returns (triples of a generated dataset without persons, triples per generated person)."""
+    from pyscript.bulkload import normalize_to_ntriples
+
+    probe_dir = tempfile.mkdtemp(prefix="cv-bench-probe-")
+    count = lambda persons: normalize_to_ntriples(
+        generate_dataset(probe_dir, generatorParams(**dict(settings["params"], persons=persons)),
+                         layout="turtle")["source_file"], os.path.join(probe_dir, "resume.nt"))
+    empty, small = count(0), count(20)
+    shutil.rmtree(probe_dir, ignore_errors=True)
+    return empty, max(1, (small - empty) // 20)
+
+
+@scenario("bulkload")
+def bulkload_scenario(settings):
+    """Onboarding a large dump: Graph.parse and the Turtle split vs the parallel bulk loader, per worker count."""
+    import gc
+    from pyscript.bulkload import bulk_partitions, load_graph, normalize_to_ntriples
+    from pyscript.store import build_partitions
+
+    empty, per_person = dataset_triples(settings)
+    results = {"cpu_count": os.cpu_count(), "triples_per_person": per_person}
+    for size in settings["bulk_sizes"]:
+        work_dir = tempfile.mkdtemp(prefix=f"cv-bench-bulk-{size}-")
+        params = generatorParams(**dict(settings["params"], persons=max(1, (size - empty) // per_person)))
+        source = generate_dataset(work_dir, params, layout="turtle")["source_file"]
+        dump = os.path.join(work_dir, "resume.nt")
+        normalize_seconds, triples = timed(lambda: normalize_to_ntriples(source, dump))
+        result = {"persons": params.persons, "triples": triples, "nt_bytes": os.path.getsize(dump),
+                  "normalize_seconds": round(normalize_seconds, 3)}
+        rate = lambda seconds: round(triples / seconds) if seconds else None
+
+        elapsed, reference = timed(lambda: Graph().parse(dump, format="nt"))
+        result["graph_parse"] = {"seconds": round(elapsed, 3), "triples_per_second": rate(elapsed)}
+        # set comparison doubles the memory; check it on the smallest dump only
+        expected = set(reference) if size == min(settings["bulk_sizes"]) else None
+        del reference
+        gc.collect()
+
+        elapsed, _ = timed(lambda: build_partitions(source, os.path.join(work_dir, "split")))
+        result["turtle_split"] = {"seconds": round(elapsed, 3), "triples_per_second": rate(elapsed)}
+
+        for workers in settings["bulk_workers"]:
+            elapsed, graph = timed(lambda: load_graph(dump, workers=workers))
+            equal = len(graph) == triples and (expected is None or set(graph) == expected)
+            del graph
+            gc.collect()
+            report = bulk_partitions(dump, os.path.join(work_dir, f"bulk-{workers}"), workers=workers)
+            result[f"workers_{workers}"] = {
+                "load_graph": {"seconds": round(elapsed, 3), "triples_per_second": rate(elapsed), "equal": equal},
+                "bulk_partitions": {key: report[key] for key in
+                                    ("seconds", "triples_per_second", "parse_seconds", "split_seconds",
+                                     "write_seconds", "profiles")}}
+        result["peak_rss_mb"] = peak_rss_mb()
+        results[str(size)] = result
+        expected = None
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+@scenario("rdf_export")
+def rdf_export_scenario(settings):
+    """/export of the whole store streamed in each format vs Graph.serialize: throughput and RSS growth."""
+    import hashlib
+    from rdflib.graph import ReadOnlyGraphAggregate
+    from pyscript.export import export_triples, snapshot
+
+    empty, per_person = dataset_triples(settings)
+    dataset_dir = tempfile.mkdtemp(prefix="cv-bench-rdf-export-")
+    params = generatorParams(**dict(settings["params"], persons=max(1, (settings["export_triples"] - empty) // per_person)))
+    generate_dataset(dataset_dir, params)
+    store, _ = install_store(dataset_dir)
+    client = load_app().app.test_client()
+    # the partitions' copies of shared nodes are written once
+    triples = export_triples(snapshot(store)[0])
+    results = {"persons": params.persons, "triples": triples, "stored_triples": len(store)}
+
+    def stream(url: str, headers=None, skip: int = 0):
+        """Reads a streamed response; returns its size, the peak RSS and a digest of the bytes after skip."""
+        response = client.get(url, headers=headers or {}, buffered=False)
+        size, peak, digest = 0, rss_mb(), hashlib.sha1()
+        for index, chunk in enumerate(response.response):
+            digest.update(chunk[max(0, skip - size):])
+            size += len(chunk)
+            if index % 16 == 0:
+                peak = max(peak, rss_mb())
+        response.close()
+        return size, peak, digest.hexdigest()
+
+    for fmt, rdflib_format in (("nt", "nt"), ("ttl", "turtle"), ("jsonld", "json-ld")):
+        result = {}
+        for label, headers in (("stream", None), ("stream_gzip", {"Accept-Encoding": "gzip"})):
+            before = rss_mb()
+            elapsed, (size, peak, _) = timed(lambda: stream(f"/export?format={fmt}", headers))
+            result[label] = {"seconds": round(elapsed, 3), "bytes": size,
+                             "mb_per_second": round(size / 2 ** 20 / elapsed, 2),
+                             "triples_per_second": round(triples / elapsed), "rss_growth_mb": round(peak - before, 1)}
+
+        # resuming from the middle: only the tail is sent, and it matches the full stream
+        middle = result["stream"]["bytes"] // 2
+        _, _, expected = stream(f"/export?format={fmt}", skip=middle)
+        elapsed, (size, _, resumed) = timed(lambda: stream(f"/export?format={fmt}", {"Range": f"bytes={middle}-"}))
+        result["resume"] = {"seconds": round(elapsed, 3), "bytes": size, "matches": resumed == expected}
+
+        if fmt != "nt" and triples > 200000:
+            # rdflib's Turtle and JSON-LD serializers slow down superlinearly; tens of minutes at this size
+            result["graph_serialize"] = {"skipped": True}
+            results[fmt] = result
+            continue
+        view = ReadOnlyGraphAggregate([store.common] + list(store.graphs.values()))
+        before = rss_mb()
+        elapsed, output = timed(lambda: view.serialize(format=rdflib_format))
+        result["graph_serialize"] = {"seconds": round(elapsed, 3), "triples_per_second": round(triples / elapsed),
+                                     "rss_growth_mb": round(rss_mb() - before, 1)}
+        del output
+        results[fmt] = result
+    results["peak_rss_mb"] = peak_rss_mb()
+    shutil.rmtree(dataset_dir, ignore_errors=True)
+    return results
+
+
+@scenario("tenants")
+def tenants_scenario(settings):
+    """Profiles of many tenants with skewed (Zipf) access: LRU hit rate, cold loads, latency and memory."""
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+
+    count = settings["tenants"]
+    root = tempfile.mkdtemp(prefix="cv-bench-tenants-")
+    template = os.path.join(root, "template")
+    params = generatorParams(**dict(settings["params"], persons=2))
+    generate_dataset(template, params)
+    for index in range(count):
+        shutil.copytree(template, os.path.join(root, f"team{index:04d}", "partitions"))
+    shutil.rmtree(template)
+
+    os.environ["CV_TENANT_DIR"] = root
+    install_store(settings["dataset_dir"])
+    app_module = load_app()
+    registry = app_module.TENANTS
+    client = app_module.app.test_client()
+
+    # budget: the triples of settings["tenant_cache"] tenants
+    rss_before = rss_mb()
+    with client.post("/t/team0000/", json={"profile_user": "Fname0 Lname0"}) as response:
+        response.get_data()
+    per_tenant = registry.total_triples
+    registry.max_triples = per_tenant * settings["tenant_cache"]
+
+    rng = random.Random(params.seed)
+    weights = [1.0 / (rank + 1) ** 1.1 for rank in range(count)]
+    trace = []
+    for index in rng.choices(range(count), weights=weights, k=settings["tenant_requests"]):
+        person = rng.randrange(params.persons)
+        trace.append((f"team{index:04d}", f"Fname{person} Lname{person}"))
+
+    def request(tenant: str, name: str) -> float:
+        start = time.perf_counter()
+        with client.post(f"/t/{tenant}/", json={"profile_user": name}) as response:
+            response.get_data()
+            if response.status_code != 200:
+                raise RuntimeError(f"{tenant}: HTTP {response.status_code}")
+        return time.perf_counter() - start
+
+    timings = {"hit": [], "load": []}
+    rss_peak = rss_mb()
+    for index, (tenant, name) in enumerate(trace):
+        state = "hit" if tenant in registry.loaded else "load"
+        timings[state].append(request(tenant, name))
+        if index % 50 == 0:
+            rss_peak = max(rss_peak, rss_mb())
+    resident = len(registry)
+    rss_end = rss_mb()
+
+    # the start of the trace again from concurrent clients; every request must release its store
+    stats = dict(registry.stats)
+    with ThreadPoolExecutor(max_workers=settings["load_concurrency"]) as pool:
+        elapsed, concurrent = timed(lambda: list(pool.map(lambda call: request(*call), trace[:500])))
+
+    results = {"tenants": count, "requests": len(trace), "distinct_tenants": len({tenant for tenant, _ in trace}),
+               "triples_per_tenant": per_tenant, "budget_triples": registry.max_triples,
+               "hit_rate": round(len(timings["hit"]) / len(trace), 4),
+               "hit": summarize(timings["hit"]), "load": summarize(timings["load"]),
+               "all": summarize(timings["hit"] + timings["load"]),
+               "evictions": stats["evictions"], "resident_tenants": resident,
+               "rss_before_mb": rss_before, "rss_end_mb": rss_end, "rss_peak_mb": rss_peak,
+               "rss_per_resident_tenant_mb": round((rss_end - rss_before) / max(resident, 1), 2),
+               "concurrent": {"clients": settings["load_concurrency"], "seconds": round(elapsed, 3),
+                              "request": summarize(concurrent),
+                              "leaked_refs": sum(entry.refs for entry in registry.loaded.values())}}
+    # what holding every tenant would take, from the measured cost of a resident one
+    results["projected_all_resident_mb"] = round(results["rss_per_resident_tenant_mb"] * count, 1)
+    shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def edited_partition(store, name: str, section: str, revision: int) -> Graph:
+    """Returns a copy of a stored profile with the title of its first item of a section (or its own title) changed."""
+    from rdflib import Literal, URIRef
+    from rdflib.namespace import FOAF
+    from pyscript.search import ITEM_SECTIONS, PERSON_SECTION
+
+    entry = store.find_person(name)
+    person = URIRef(entry["uri"])
+    graph = Graph()
+    graph += store.graphs[entry["id"]]
+    node = person
+    if section != PERSON_SECTION:
+        predicate = next(key for key, value in ITEM_SECTIONS.items() if value == section)
+        node = sorted(graph.objects(person, predicate))[0]
+    title = graph.value(node, FOAF.title)
+    graph.set((node, FOAF.title, Literal(f"{str(title).split(' rev ')[0]} rev {revision}", lang=title.language)))
+    return graph
+
+
+@scenario("delta_sync")
+def delta_sync_scenario(settings):
+    """Showing an edit: /changes plus the changed sections vs reloading the page and the profile."""
+    install_store(settings["dataset_dir"])
+    app_module = load_app()
+    store = app_module.get_store()
+    app_module.profile_cache.top_n = 0
+    client = app_module.app.test_client()
+    # sections script.js renders together, so fetches together
+    groups = {"Name": ["Details", "Name"], "Details": ["Details", "Name"],
+              "Skills": ["Skills", "SkillType"], "SkillType": ["Skills", "SkillType"]}
+
+    def delta(name, version):
+        changes = client.get(f"/changes?since={version}&epoch={store.changes.epoch}")
+        changed = changes.get_json()["profiles"]
+        sections = sorted({section for key in changed.get("*", []) + changed.get(name, [])
+                           for section in groups.get(key, [key])})
+        response = client.post("/", json={"profile_user": name, "sections": sections})
+        return len(changes.data) + len(response.data), sections
+
+    def full(name, version):
+        page = client.get("/")
+        response = client.post("/", json={"profile_user": name})
+        return len(page.data) + len(response.data), None
+
+    results = {}
+    for section in ("Details", "WorkExperience", "Skills", "Project"):
+        measured = {"delta": {"seconds": [], "cpu": [], "bytes": []}, "full": {"seconds": [], "cpu": [], "bytes": []}}
+        fetched = None
+        for revision in range(settings["repeat"]):
+            for name in settings["samples"]:
+                client.post("/", json={"profile_user": name})      # the profile is on screen (and cached)
+                # the partial fetch is not cached, so the full refresh after it still starts cold
+                for path, fetch in (("delta", delta), ("full", full)):
+                    version = store.changes.version
+                    store.upsert_graph(edited_partition(store, name, section, revision * 2 + (path == "full")))
+                    cpu = time.process_time()
+                    elapsed, (size, sections) = timed(lambda: fetch(name, version))
+                    measured[path]["cpu"].append(time.process_time() - cpu)
+                    measured[path]["seconds"].append(elapsed)
+                    measured[path]["bytes"].append(size)
+                    fetched = sections or fetched
+        results[section] = {"sections_fetched": fetched}
+        for path, values in measured.items():
+            results[section][path] = {"latency": summarize(values["seconds"]),
+                                      "cpu_ms_mean": round(statistics.fmean(values["cpu"]) * 1000, 3),
+                                      "bytes_mean": round(statistics.fmean(values["bytes"]))}
+        results[section]["bytes_saved"] = round(1 - results[section]["delta"]["bytes_mean"] /
+                                                results[section]["full"]["bytes_mean"], 3)
+    return results
+
+
+
+def graph_footprint(dump: str, interned: bool, samples: int) -> dict:
+    """Parses an N-Triples dump into one graph (rdflib's Memory store or an internedStore); run in a fresh process."""
+    import gc
+    import random
+    from rdflib import RDF
+    from pyscript.interning import internedStore
+
+    gc.collect()
+    before = rss_mb()
+    graph = Graph(store=internedStore()) if interned else Graph()
+    elapsed, _ = timed(lambda: graph.parse(dump, format="nt"))
+    triples = len(graph)    # merges the pending writes of the interned store
+    gc.collect()
+    growth = rss_mb() - before
+    result = {"triples": triples, "parse_seconds": round(elapsed, 3), "rss_growth_mb": round(growth, 1),
+              "bytes_per_triple": round(growth * 2 ** 20 / triples)}
+    if interned:
+        result.update({"distinct_terms": len(graph.store.terms), "term_occurrences": 3 * triples,
+                       "array_bytes_per_triple": round(graph.store.nbytes() / triples, 1)})
+
+    subjects = random.Random(0).sample(sorted(set(graph.subjects(RDF.type))), samples)
+    result["subject_lookup"] = summarize(timed(lambda: list(graph.predicate_objects(subject)))[0]
+                                         for subject in subjects)
+    result["type_scan_seconds"] = round(timed(lambda: sum(1 for _ in graph.subject_objects(RDF.type)))[0], 3)
+    result["full_scan_seconds"] = round(timed(lambda: sum(1 for _ in graph))[0], 3)
+    return result
+
+
+def store_footprint(partition_dir: str, interned: bool, samples: List[str], repeat: int) -> dict:
+    """Loads a profileStore with term interning on or off (as CV_INTERN_TERMS); run in a fresh process."""
+    import pyscript.store as store_module
+
+    # the generator has imported the store module already, so set the flag it read
+    store_module.INTERN_TERMS = interned
+    before = rss_mb()
+    store, elapsed = install_store(partition_dir)
+    triples = len(store)
+    growth = rss_mb() - before
+    app_module = load_app()
+    computed = [timed(lambda: app_module.computeSections(name))[0] for _ in range(repeat) for name in samples]
+    return {"triples": triples, "load_seconds": round(elapsed, 3), "rss_growth_mb": round(growth, 1),
+            "bytes_per_triple": round(growth * 2 ** 20 / triples), "profile_computed": summarize(computed),
+            "rss_after_profiles_mb": rss_mb()}
+
+
+@scenario("interning")
+def interning_scenario(settings):
+    """Bytes per triple of rdflib's Memory store vs the interned id-array store, for one graph and the whole store."""
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+    from pyscript.bulkload import normalize_to_ntriples
+
+    empty, per_person = dataset_triples(settings)
+    work_dir = tempfile.mkdtemp(prefix="cv-bench-interning-")
+    params = generatorParams(**dict(settings["params"],
+                                    persons=max(1, (settings["intern_triples"] - empty) // per_person)))
+    source = generate_dataset(os.path.join(work_dir, "dump"), params, layout="turtle")["source_file"]
+    dump = os.path.join(work_dir, "resume.nt")
+    triples = normalize_to_ntriples(source, dump)
+    partition_dir = os.path.join(work_dir, "partitions")
+    generate_dataset(partition_dir, params)
+    samples = sample_names(params.persons, len(settings["samples"]))
+
+    results = {"persons": params.persons, "triples": triples}
+    # each measurement in its own interpreter, so neither store's freed memory hides the other's growth
+    for label, interned in (("memory", False), ("interned", True)):
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            graph = pool.submit(graph_footprint, dump, interned, 200).result()
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            store = pool.submit(store_footprint, partition_dir, interned, samples, settings["repeat"]).result()
+        results[label] = {"graph": graph, "store": store}
+    for part in ("graph", "store"):
+        results[f"{part}_memory_saved"] = round(
+            1 - results["interned"][part]["bytes_per_triple"] / results["memory"][part]["bytes_per_triple"], 3)
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+@scenario("burst")
+def burst_scenario(settings):
+    """Bursts of concurrent POST / for one cold profile with and without coalescing; load shedding under overload."""
+    import threading
+    from collections import Counter
+    from concurrent.futures import ThreadPoolExecutor
+
+    install_store(settings["dataset_dir"])
+    app_module = load_app()
+    client = app_module.app.test_client()
+    cache, gate = app_module.profile_cache, app_module.ADMISSION_GATE
+    clients = settings["burst_clients"]
+    limit, queue, timeout = gate.limit, gate.queue, gate.timeout
+
+    def burst(names: List[str]) -> dict:
+        """Sends one request per name from as many threads, all released at once (profiles cold)."""
+        cache.entries.clear()
+        start_line = threading.Barrier(len(names))
+
+        def request(name: str):
+            start_line.wait()
+            start = time.perf_counter()
+            with client.post("/", json={"profile_user": name}) as response:
+                response.get_data()
+                return response.status_code, time.perf_counter() - start
+
+        computed = cache.stats["computed"]
+        cpu = time.process_time()
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            elapsed, answers = timed(lambda: list(pool.map(request, names)))
+        return {"cpu_seconds": time.process_time() - cpu, "seconds": elapsed,
+                "computations": cache.stats["computed"] - computed, "answers": answers}
+
+    results = {"clients": clients}
+    # the same profile from every client: one computation shared, or one per admitted request
+    for label, coalesce in (("uncoalesced", False), ("coalesced", True)):
+        cache.coalesce = coalesce
+        for gated in (False, True):
+            gate.limit = limit if gated else 0
+            bursts = [burst([name] * clients) for name in settings["samples"]]
+            results[f"{label}_{'gated' if gated else 'ungated'}"] = {
+                "bursts": len(bursts),
+                "cpu_seconds_per_burst": round(statistics.fmean(run["cpu_seconds"] for run in bursts), 3),
+                "computations_per_burst": round(statistics.fmean(run["computations"] for run in bursts), 2),
+                "statuses": dict(Counter(status for run in bursts for status, _ in run["answers"])),
+                "latency": summarize(seconds for run in bursts for _, seconds in run["answers"])}
+    for gated in ("ungated", "gated"):
+        results[f"cpu_saved_{gated}"] = round(1 - results[f"coalesced_{gated}"]["cpu_seconds_per_burst"] /
+                                              results[f"uncoalesced_{gated}"]["cpu_seconds_per_burst"], 3)
+
+    # distinct cold profiles (nothing to share) from more clients than the gate admits and queues
+    cache.coalesce = True
+    names = sample_names(settings["params"]["persons"], clients)
+    overload = {}
+    for label, shape in (("unlimited", (0, queue, timeout)), ("shedding", (max(1, limit // 2), limit, timeout))):
+        gate.limit, gate.queue, gate.timeout = shape
+        run = burst(names)
+        served = [seconds for status, seconds in run["answers"] if status == 200]
+        overload[label] = {"limit": gate.limit, "queue": gate.queue,
+                           "statuses": dict(Counter(status for status, _ in run["answers"])),
+                           "served_latency": summarize(served),
+                           "rejected_latency": summarize(seconds for status, seconds in run["answers"]
+                                                         if status == 503),
+                           "seconds": round(run["seconds"], 3)}
+    results["overload"] = overload
+    results["admission_stats"] = dict(gate.stats)
+    gate.limit, gate.queue, gate.timeout = limit, queue, timeout
+    return results
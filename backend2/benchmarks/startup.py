@@ -0,0 +1,146 @@
+"""
+Date: 2026-10-19
+Description: Startup benchmark. Imports the app in fresh interpreters under
+    `python -X importtime`, reports the median import time and the heaviest
+    modules, and checks that the modules deferred to first use (SPARQL parser,
+    Turtle parser/serializer, the CV converter, the bulk loader) are not
+    loaded at startup.
+
+Run from backend2/: python -m benchmarks.startup [--runs 7] [--target-ms 100]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# median import time of the serving path the app adds on top of Flask (which
+# is needed anyway); the full `import app` time is reported alongside
+IMPORT_TARGET_MS = 100.0
+
+# modules that only the first query, the first load or /record may import
+DEFERRED_MODULES = (
+    "rdflib.plugins.sparql",
+    "rdflib.plugins.sparql.parser",
+    "pyparsing",
+    "rdflib.plugins.parsers.notation3",
+    "rdflib.plugins.serializers.turtle",
+    "pyscript.j2graph",
+    "pyscript.bulkload",
+    "multiprocessing",
+)
+
+
+def startup_env() -> dict:
+    env = dict(os.environ, CV_WARMUP="0", PYTHONDONTWRITEBYTECODE="1")
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+
+def prime_bytecode(module: str = "app"):
+    """
+    Imports module once, unmeasured, writing the bytecode caches. A fresh
+    checkout has none, and the measured runs (which do not write them) would
+    otherwise time compiling every module instead of a server restart.
+    """
+    env = startup_env()
+    env.pop("PYTHONDONTWRITEBYTECODE")
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=BACKEND_DIR, env=env,
+                   capture_output=True, check=True)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, float, float]]:
+    """
+    Parses `-X importtime` output.
+
+    Returns:
+        A list of (module, depth, self ms, cumulative ms).
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), depth, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return modules
+
+
+def measure_import(module: str = "app", runs: int = 7) -> Dict:
+    """
+    Imports module in `runs` fresh interpreters.
+
+    Returns:
+        dict: median/min/max import time in ms and the heaviest direct imports of the median run.
+    """
+    prime_bytecode(module)
+    samples = []
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   cwd=BACKEND_DIR, env=startup_env(), capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+        modules = parse_importtime(completed.stderr)
+        total = next(cumulative for name, depth, _, cumulative in reversed(modules) if name == module and depth == 0)
+        flask = sum(cumulative for name, depth, _, cumulative in modules if name == "flask" and depth <= 1)
+        samples.append((total, total - flask, modules))
+
+    samples.sort(key=lambda sample: sample[0])
+    median_total, _, median_modules = samples[len(samples) // 2]
+    heaviest = sorted(((name, round(cumulative, 1)) for name, depth, _, cumulative in median_modules
+                       if depth == 1), key=lambda item: -item[1])[:10]
+    return {"module": module, "runs": runs, "median_ms": round(median_total, 1),
+            "min_ms": round(samples[0][0], 1), "max_ms": round(samples[-1][0], 1),
+            "mean_ms": round(statistics.fmean(sample[0] for sample in samples), 1),
+            "median_excluding_flask_ms": round(statistics.median(sample[1] for sample in samples), 1),
+            "heaviest": heaviest}
+
+
+def loaded_deferred(module: str = "app") -> List[str]:
+    """Returns the DEFERRED_MODULES that are loaded right after importing module."""
+    code = (f"import sys, json, {module}; "
+            f"print(json.dumps([name for name in {list(DEFERRED_MODULES)!r} if name in sys.modules]))")
+    completed = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=startup_env(),
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def startup_report(runs: int = 7, target_ms: float = IMPORT_TARGET_MS) -> Dict:
+    """Measures `import app` and checks it against the target and the deferred modules."""
+    report = measure_import("app", runs)
+    report["target_ms"] = target_ms
+    report["loaded_deferred"] = loaded_deferred("app")
+    report["ok"] = report["median_excluding_flask_ms"] <= target_ms and not report["loaded_deferred"]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import time of the app.")
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters to measure")
+    parser.add_argument("--target-ms", type=float, default=IMPORT_TARGET_MS,
+                        help="target for the median import time on top of Flask")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = startup_report(args.runs, args.target_ms)
+    if args.json:
+        print(json.dumps(report, indent=1))
+    else:
+        print(f"import app: median {report['median_ms']} ms (min {report['min_ms']}, max {report['max_ms']}) "
+              f"over {report['runs']} runs")
+        print(f"  without Flask: median {report['median_excluding_flask_ms']} ms (target {report['target_ms']} ms)")
+        for name, cumulative in report["heaviest"]:
+            print(f"  {cumulative:8.1f} ms  {name}")
+        if report["loaded_deferred"]:
+            print(f"Loaded at startup but should be deferred: {', '.join(report['loaded_deferred'])}")
+        print("OK" if report["ok"] else "FAILED")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Pre-renders the whole CV portfolio as a static site.
+
+For every profile in the store this writes the rendered index.html (with the
+embedded json_data) and a JSON file matching the POST / response, named by
+content hash for cache-busting, plus data/profiles.json which the
+front end uses to switch profiles without the Flask POST endpoint and to list
+the profile names (NameList is left out of the exported pages, so adding a
+profile does not change every page). Only profiles whose partition, the common
+vocabulary their items use, the template or the static files changed since the
+last export are recomputed.
+
+Run: python backend2/export_static.py <output_dir> [--full]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+# the export never serves requests, so the background warm-up is not needed
+os.environ.setdefault("CV_WARMUP", "0")
+
+from flask import render_template
+
+from app import app, ALL_SECTIONS, computeSections, default_profile
+from pyscript.records import to_json
+from pyscript.store import CHANGELOG_SUFFIX, get_store
+
+MANIFEST_NAME = "export-manifest.json"
+PROFILE_INDEX = "/data/profiles.json"     # profile name -> content-hashed JSON file
+TEMPLATE_FILE = os.path.join(app.root_path, app.template_folder, "index.html")
+
+# relative static path -> sha256 of its content, filled by export_site
+STATIC_VERSIONS = {}
+
+
+@app.url_defaults
+def version_static_urls(endpoint, values):
+    """Adds the content hash of an exported static file to its URL to bust caches when it changes."""
+    if endpoint == "static" and values.get("filename") in STATIC_VERSIONS:
+        values["v"] = STATIC_VERSIONS[values["filename"]][:12]
+
+
+def file_digest(*paths) -> str:
+    """Returns the sha256 hex digest of the concatenated contents of the given files."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 16), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def common_digest(store, pid: str) -> str:
+    """
+    Returns the sha256 hex digest of the common triples describing the
+    classes and properties a partition refers to and their superclasses, so a
+    profile is only recomputed when vocabulary it uses changes.
+    """
+    graph = store.graphs[pid]
+    referenced = {term for term in set(graph.predicates()) | set(graph.objects()) if (term, None, None) in store.common}
+    referenced |= {ancestor for term in referenced for ancestor in store.closure.get(term, ())}
+    lines = sorted(f"{s.n3()} {p.n3()} {o.n3()} ." for term in referenced for s, p, o in store.common.triples((term, None, None)))
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def static_digests(static_dir: str) -> dict:
+    """Returns {relative path: sha256} for every file of the static folder."""
+    digests = {}
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            digests[os.path.relpath(path, static_dir).replace(os.sep, "/")] = file_digest(path)
+    return digests
+
+
+def write_file(path: str, content: str):
+    """Writes a text file through a temporary file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(content)
+    os.replace(tmp_path, path)
+
+
+def export_site(output_dir: str, full: bool = False) -> dict:
+    """
+    Exports every profile of the store to output_dir.
+
+    Args:
+        output_dir: The directory receiving the static site.
+        full: Re-render every profile even if nothing changed.
+
+    Returns:
+        dict: Counts of rendered, reused and removed profiles and the elapsed time.
+    """
+    start = time.perf_counter()
+    store = get_store()
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    previous = {}
+    if not full and os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as handle:
+            previous = json.load(handle)
+    previous_profiles = previous.get("profiles", {})
+
+    # 1. Copy the static folder; its digests version the asset URLs and the site layout
+    statics = static_digests(app.static_folder)
+    shutil.copytree(app.static_folder, os.path.join(output_dir, "static"), dirs_exist_ok=True)
+    layout_key = hashlib.sha256(json.dumps([file_digest(TEMPLATE_FILE), statics], sort_keys=True).encode()).hexdigest()
+
+    # 2. Compute (or reuse) the sections of every profile
+    name_list = store.name_list()
+    profiles = {}
+    counts = {"computed": 0, "reused": 0, "rendered": 0, "removed": 0}
+    payloads = {}
+    for name in dict.fromkeys(name_list):
+        entry = store.find_person(name)
+        # an updated profile may only have grown its changelog
+        partition_files = [os.path.join(store.partition_dir, f"{entry['id']}{suffix}")
+                           for suffix in (".ttl", CHANGELOG_SUFFIX)]
+        data_key = hashlib.sha256((common_digest(store, entry["id"]) + file_digest(
+            *[path for path in partition_files if os.path.exists(path)])).encode()).hexdigest()
+        old = previous_profiles.get(name)
+
+        sections = None
+        if old is not None and old["data_key"] == data_key:
+            try:
+                with open(os.path.join(output_dir, old["json"].lstrip("/")), encoding="utf-8") as handle:
+                    sections = json.load(handle)
+                counts["reused"] += 1
+            except (OSError, ValueError):
+                sections = None
+        if sections is None:
+            try:
+                sections = computeSections(name)
+            except Exception as e:
+                print(f"Skipping profile '{name}': {e}")
+                continue
+            counts["computed"] += 1
+
+        # same key order as the POST / response; the names are read from PROFILE_INDEX
+        payload = {key: sections[key] for key in ALL_SECTIONS if key != "NameList"}
+        payload_text = json.dumps(payload, ensure_ascii=False, default=to_json)
+        content_hash = hashlib.sha256(payload_text.encode("utf-8")).hexdigest()[:12]
+        profiles[name] = {
+            "id": entry["id"],
+            "data_key": data_key,
+            "json": f"/data/{entry['id']}.{content_hash}.json",
+            "html": f"/profiles/{entry['id']}/index.html",
+        }
+        payloads[name] = (payload, payload_text)
+
+    # 3. Write the profile index, then the changed JSON files and pages
+    write_file(os.path.join(output_dir, PROFILE_INDEX.lstrip("/")),
+               json.dumps({name: info["json"] for name, info in profiles.items()}, ensure_ascii=False))
+
+    STATIC_VERSIONS.clear()
+    STATIC_VERSIONS.update(statics)
+
+    with app.test_request_context("/"):
+        for name, info in profiles.items():
+            payload, payload_text = payloads[name]
+            old = previous_profiles.get(name)
+            json_path = os.path.join(output_dir, info["json"].lstrip("/"))
+            html_path = os.path.join(output_dir, info["html"].lstrip("/"))
+            if not os.path.exists(json_path):
+                write_file(json_path, payload_text)
+            # a page only changes with its own payload or the layout
+            unchanged = (old is not None and old["json"] == info["json"]
+                         and previous.get("layout_key") == layout_key and os.path.exists(html_path))
+            if unchanged:
+                continue
+            page = render_template("index.html", json_data=payload, static_profiles=PROFILE_INDEX)
+            write_file(html_path, page)
+            if name == default_profile(store):
+                write_file(os.path.join(output_dir, "index.html"), page)
+            counts["rendered"] += 1
+
+    # 4. Remove the files of profiles that disappeared or changed
+    current_files = {path for info in profiles.values() for path in (info["json"], info["html"])}
+    for name, info in previous_profiles.items():
+        for path in (info["json"], info["html"]):
+            if path not in current_files and os.path.exists(os.path.join(output_dir, path.lstrip("/"))):
+                os.remove(os.path.join(output_dir, path.lstrip("/")))
+        if name not in profiles:
+            counts["removed"] += 1
+
+    write_file(manifest_path, json.dumps({"layout_key": layout_key, "profiles": profiles}, indent=1))
+    counts["seconds"] = time.perf_counter() - start
+    return counts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pre-render the CV portfolio as a static site.")
+    parser.add_argument("output_dir", help="directory receiving the static site")
+    parser.add_argument("--full", action="store_true", help="re-render every profile")
+    args = parser.parse_args()
+
+    result = export_site(args.output_dir, full=args.full)
+    print(f"Exported {len(get_store().name_list())} profile(s) to '{args.output_dir}': "
+          f"{result['computed']} computed, {result['reused']} reused, {result['rendered']} page(s) rendered, "
+          f"{result['removed']} removed in {result['seconds']:.3f}s.")
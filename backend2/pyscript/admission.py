@@ -0,0 +1,100 @@
+"""
+Date: 2026-10-19
+Description: Admission control for the request handlers. At most `limit`
+    requests run at once; the next `queue` requests wait (first come, first
+    served) for up to `timeout` seconds, and any request beyond that is
+    turned away at once with 503 and Retry-After. Under a burst the latency of
+    admitted requests stays bounded by the limit and the queue instead of
+    growing with the number of clients.
+"""
+
+import threading
+from collections import deque
+
+from pyscript.metrics import REGISTRY
+
+ADMISSION = REGISTRY.counter("cv_admission_total", "Requests by admission verdict.", ["verdict"])
+ADMISSION_WAIT_SECONDS = REGISTRY.histogram("cv_admission_wait_seconds", "Time requests spent queued for a slot.",
+                                            buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+# verdicts of acquire() that turn the request away
+REJECTED = ("queue_full", "timeout")
+
+ACTIVE = REGISTRY.gauge("cv_admission_active", "Requests running under admission control.")
+QUEUED = REGISTRY.gauge("cv_admission_queued", "Requests waiting for admission.")
+
+
+class admissionGate:
+    """ this class bounds the requests running at once and the requests waiting for a slot"""
+
+    def __init__(self, limit: int = 8, queue: int = 64, timeout: float = 10.0):
+        """
+        Args:
+            limit: Requests running at once; 0 admits every request.
+            queue: Requests allowed to wait for a slot; more are rejected at once.
+            timeout: Seconds a queued request waits before it is rejected.
+        """
+        self.limit = limit
+        self.queue = queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = deque()      # one event per queued request, oldest first
+        self.lock = threading.Lock()
+        self.stats = {"admitted": 0, "queued": 0, "rejected": 0, "timed_out": 0}
+
+    def acquire(self) -> str:
+        """
+        Takes a slot, waiting in the queue if all are busy.
+
+        Returns:
+            'admitted' (the caller must release() the slot), 'unlimited' (no
+            limit set, nothing to release), or why the request was turned away
+            ('queue_full' or 'timeout').
+        """
+        if self.limit <= 0:
+            return "unlimited"
+        with self.lock:
+            if self.active < self.limit and not self.waiting:
+                self.admit()
+                return "admitted"
+            if len(self.waiting) >= self.queue:
+                self.stats["rejected"] += 1
+                ADMISSION.inc(verdict="queue_full")
+                return "queue_full"
+            turn = threading.Event()
+            self.waiting.append(turn)
+            self.stats["queued"] += 1
+            QUEUED.set(len(self.waiting))
+
+        with ADMISSION_WAIT_SECONDS.time():
+            granted = turn.wait(self.timeout)
+        with self.lock:
+            if not granted and not turn.is_set():
+                self.waiting.remove(turn)
+                QUEUED.set(len(self.waiting))
+                self.stats["timed_out"] += 1
+                ADMISSION.inc(verdict="timeout")
+                return "timeout"
+        # release() handed this request its slot (possibly just as the wait timed out)
+        return "admitted"
+
+    def admit(self):
+        """Counts a request taking a free slot (the caller holds the lock)."""
+        self.active += 1
+        self.stats["admitted"] += 1
+        ACTIVE.set(self.active)
+        ADMISSION.inc(verdict="admitted")
+
+    def release(self):
+        """Frees a slot taken by acquire(), handing it straight to the oldest queued request."""
+        with self.lock:
+            self.active -= 1
+            if self.waiting:
+                # the slot goes to the next request in line, so a newcomer cannot overtake it
+                turn = self.waiting.popleft()
+                QUEUED.set(len(self.waiting))
+                self.admit()
+                turn.set()
+            ACTIVE.set(self.active)
+
+    def __len__(self):
+        return self.active
@@ -0,0 +1,316 @@
+"""
+Date: 2026-10-19
+Description: Parallel loader for large N-Triples dumps (bulk onboarding). The
+    dump is cut into line-aligned chunks that a process pool parses with a
+    line regex; each chunk comes back as its distinct terms plus an array of
+    integer triples, and the chunks are merged into one term table, so every
+    distinct IRI or literal is kept (and turned into an rdflib term) once.
+    The interned triples are then either added to a Graph or split straight
+    into a partition directory (see store.build_partitions) without building
+    rdflib terms at all. Turtle input is normalized to N-Triples first.
+
+Run from backend2/:
+    python -m pyscript.bulkload dump.nt [partition_dir] [--workers 4] [--chunk-mb 16]
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF, RDFS
+
+# subject, predicate, object of one N-Triples line (terms kept in their N-Triples form)
+TRIPLE_LINE = re.compile(
+    r'\s*(<[^>]*>|_:\S+?)\s*(<[^>]*>)\s*'
+    r'(<[^>]*>|_:\S+?|"(?:[^"\\]|\\.)*"(?:@[A-Za-z]+(?:-[A-Za-z0-9]+)*|\^\^<[^>]*>)?)\s*\.\s*(?:#.*)?$')
+ESCAPE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))')
+ESCAPED_CHARS = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f", '"': '"', "'": "'", "\\": "\\"}
+
+CHUNK_BYTES = 16 * 2 ** 20
+
+
+class internedTriples:
+    """ this class holds a parsed dump: its distinct terms (in N-Triples form) and the triples as term ids"""
+
+    def __init__(self):
+        self.terms = []         # term id -> N-Triples form
+        self.ids = {}           # N-Triples form -> term id
+        self.triples = array("l")   # three term ids per triple
+
+    def __len__(self):
+        return len(self.triples) // 3
+
+    def merge(self, terms: List[str], triples: array):
+        """Appends a chunk parsed against its own term list, re-numbering its terms."""
+        ids = self.ids
+        remap = [ids.setdefault(term, len(ids)) for term in terms]
+        self.terms.extend(terms[index] for index, term_id in enumerate(remap) if term_id >= len(self.terms))
+        self.triples.extend(remap[term] for term in triples)
+
+    def id_of(self, term: str) -> Optional[int]:
+        """Returns the id of a term given in N-Triples form, or None if it does not occur."""
+        return self.ids.get(term)
+
+
+def unescape(text: str) -> str:
+    """Decodes the escapes of an N-Triples string or IRI."""
+    if "\\" not in text:
+        return text
+    return ESCAPE.sub(lambda m: chr(int(m.group(1) or m.group(2), 16)) if m.group(3) is None
+                      else ESCAPED_CHARS.get(m.group(3), m.group(0)), text)
+
+
+def to_term(text: str):
+    """Turns a term in N-Triples form into an rdflib term."""
+    if text.startswith("<"):
+        return URIRef(unescape(text[1:-1]))
+    if text.startswith("_:"):
+        return BNode(text[2:])
+    end = text.rindex('"')
+    suffix = text[end + 1:]
+    if suffix.startswith("@"):
+        return Literal(unescape(text[1:end]), lang=suffix[1:])
+    if suffix.startswith("^^"):
+        return Literal(unescape(text[1:end]), datatype=URIRef(unescape(suffix[3:-1])))
+    return Literal(unescape(text[1:end]))
+
+
+def chunk_ranges(path: str, chunk_bytes: int = CHUNK_BYTES, min_chunks: int = 1) -> List[Tuple[int, int]]:
+    """Cuts a file into [start, end) byte ranges that begin and end on line boundaries."""
+    size = os.path.getsize(path)
+    count = max(min_chunks, -(-size // chunk_bytes), 1)
+    bounds = [0]
+    with open(path, "rb") as handle:
+        for index in range(1, count):
+            handle.seek(max(size * index // count, bounds[-1]))
+            handle.readline()
+            bounds.append(min(handle.tell(), size))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def parse_chunk(path: str, start: int, end: int) -> Tuple[List[str], array]:
+    """
+    Parses the N-Triples lines of one byte range (runs in a worker process).
+
+    Returns:
+        (the distinct terms of the chunk, three ids into that list per triple)
+
+    Raises:
+        ValueError: on a line that is neither a triple, a comment nor blank.
+    """
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start).decode("utf-8")
+
+    ids = {}
+    triples = array("l")
+    offset = start
+    # only "\n" ends a line: str.splitlines() would also cut at U+2028, \x0b, \x85 etc.,
+    # which N-Triples allows unescaped inside literals (rdflib's serializer writes them raw)
+    for line in data.split("\n"):
+        offset_next = offset + len(line.encode("utf-8")) + 1
+        if line.endswith("\r"):
+            line = line[:-1]
+        match = TRIPLE_LINE.match(line)
+        if match is None:
+            if line.strip() and not line.lstrip().startswith("#"):
+                raise ValueError(f"{path}: invalid N-Triples line near byte {offset}: {line[:120]!r}")
+        else:
+            triples.extend(ids.setdefault(term, len(ids)) for term in match.groups())
+        offset = offset_next
+    return list(ids), triples
+
+
+def parse_ntriples(path: str, workers: Optional[int] = None, chunk_bytes: int = CHUNK_BYTES) -> internedTriples:
+    """
+    Parses an N-Triples file into interned triples, in a process pool when workers > 1.
+
+    Args:
+        path: The N-Triples file.
+        workers: Worker processes (default: the CPU count); 1 parses in this process.
+        chunk_bytes: Target chunk size; there are at least four chunks per worker.
+
+    Returns:
+        internedTriples, with the chunks merged in file order.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = chunk_ranges(path, chunk_bytes, 1 if workers == 1 else workers * 4)
+    result = internedTriples()
+    if workers == 1:
+        for start, end in ranges:
+            result.merge(*parse_chunk(path, start, end))
+        return result
+
+    # forked workers start in milliseconds; a spawned one re-imports rdflib first
+    context = get_context("fork") if "fork" in get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        for terms, triples in pool.map(parse_chunk, [path] * len(ranges), *zip(*ranges)):
+            result.merge(terms, triples)
+    return result
+
+
+def to_graph(parsed: internedTriples, graph: Optional[Graph] = None) -> Graph:
+    """Adds interned triples to a graph, building one rdflib term per distinct term."""
+    graph = Graph() if graph is None else graph
+    terms = [to_term(term) for term in parsed.terms]
+    triples = parsed.triples
+    graph.addN((terms[triples[i]], terms[triples[i + 1]], terms[triples[i + 2]], graph)
+               for i in range(0, len(triples), 3))
+    return graph
+
+
+def load_graph(path: str, workers: Optional[int] = None, chunk_bytes: int = CHUNK_BYTES) -> Graph:
+    """Loads an N-Triples file into a new graph with the parallel parser."""
+    return to_graph(parse_ntriples(path, workers, chunk_bytes))
+
+
+def normalize_to_ntriples(source_file: str, target_file: str) -> int:
+    """Rewrites a Turtle (or other rdflib-readable) file as N-Triples; returns the triple count."""
+    graph = Graph()
+    graph.parse(source_file)
+    graph.serialize(destination=target_file, format="nt", encoding="utf-8")
+    return len(graph)
+
+
+def split_interned(parsed: internedTriples, schema_predicates: Iterable, schema_types: Iterable
+                   ) -> Tuple[List[int], Dict[int, List[int]]]:
+    """
+    Splits interned triples like store.split_graph does: one partition per
+    foaf:Person (everything reachable from it without passing through the
+    ontology or another person; shared nodes are copied), the rest in common.
+
+    Returns:
+        (triple indexes of the common graph, {person term id: triple indexes of its partition})
+    """
+    term = lambda uri: parsed.id_of(f"<{uri}>")
+    rdf_type, person_class = term(RDF.type), term(FOAF.Person)
+    predicates = {term(uri) for uri in schema_predicates} - {None}
+    types = {term(uri) for uri in schema_types} - {None}
+    resources = {index for index, text in enumerate(parsed.terms) if text[0] in "<_"}
+    triples = parsed.triples
+
+    schema, persons, outgoing = set(), [], {}
+    for index in range(len(parsed)):
+        s, p, o = triples[3 * index], triples[3 * index + 1], triples[3 * index + 2]
+        outgoing.setdefault(s, []).append(index)
+        if p in predicates or (p == rdf_type and o in types):
+            schema.add(s)
+        elif p == rdf_type and o == person_class:
+            persons.append(s)
+    persons = [person for person in dict.fromkeys(persons) if person not in schema]
+    person_set = set(persons)
+
+    assigned = bytearray(len(parsed))
+    partitions = {}
+    for person in persons:
+        indexes, visited, stack = [], {person}, [person]
+        while stack:
+            for index in outgoing.get(stack.pop(), ()):
+                indexes.append(index)
+                assigned[index] = 1
+                o = triples[3 * index + 2]
+                if o in resources and o not in visited and o not in schema and o not in person_set:
+                    visited.add(o)
+                    stack.append(o)
+        partitions[person] = indexes
+
+    return [index for index in range(len(parsed)) if not assigned[index]], partitions
+
+
+def write_ntriples(parsed: internedTriples, indexes: Iterable[int], filepath: str):
+    """Writes the given triples as N-Triples (valid Turtle) through a temporary file."""
+    terms, triples = parsed.terms, parsed.triples
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        out.writelines(f"{terms[triples[3 * i]]} {terms[triples[3 * i + 1]]} {terms[triples[3 * i + 2]]} .\n"
+                       for i in indexes)
+    os.replace(tmp_path, filepath)
+
+
+def bulk_partitions(source_file: str, partition_dir: str, workers: Optional[int] = None,
+                    chunk_bytes: int = CHUNK_BYTES) -> Dict:
+    """
+    Builds a partition directory from an N-Triples dump (a Turtle file is
+    normalized first) without going through an rdflib Graph: the partition
+    files are written as N-Triples, which the store reads as Turtle.
+
+    Returns:
+        dict: triples, profiles, workers, per-stage seconds and triples per second.
+    """
+    from pyscript.store import (COMMON_FILE, MANIFEST_FILE, SCHEMA_PREDICATES, SCHEMA_TYPES,
+                                partition_id)
+
+    timings = {}
+    start = time.perf_counter()
+    if not source_file.endswith(".nt"):
+        normalized = os.path.join(tempfile.mkdtemp(prefix="cv-bulk-"), "source.nt")
+        normalize_to_ntriples(source_file, normalized)
+        timings["normalize_seconds"] = time.perf_counter() - start
+        source_file = normalized
+
+    stage = time.perf_counter()
+    parsed = parse_ntriples(source_file, workers, chunk_bytes)
+    timings["parse_seconds"] = time.perf_counter() - stage
+
+    stage = time.perf_counter()
+    common, partitions = split_interned(parsed, SCHEMA_PREDICATES, SCHEMA_TYPES)
+    timings["split_seconds"] = time.perf_counter() - stage
+
+    stage = time.perf_counter()
+    os.makedirs(partition_dir, exist_ok=True)
+    write_ntriples(parsed, common, os.path.join(partition_dir, COMMON_FILE))
+    label_id = parsed.id_of(f"<{RDFS.label}>")
+    entries, taken = [], set()
+    for person, indexes in partitions.items():
+        uri = to_term(parsed.terms[person])
+        pid = partition_id(uri, taken)
+        taken.add(pid)
+        write_ntriples(parsed, indexes, os.path.join(partition_dir, f"{pid}.ttl"))
+        labels = [parsed.terms[parsed.triples[3 * i + 2]] for i in indexes
+                  if parsed.triples[3 * i] == person and parsed.triples[3 * i + 1] == label_id]
+        entries.append({"id": pid, "uri": str(uri), "label": str(to_term(labels[0])) if labels else ""})
+
+    tmp_path = os.path.join(partition_dir, f"{MANIFEST_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as manifest:
+        for entry in entries:
+            manifest.write(json.dumps(entry) + "\n")
+    os.replace(tmp_path, os.path.join(partition_dir, MANIFEST_FILE))
+    timings["write_seconds"] = time.perf_counter() - stage
+
+    total = time.perf_counter() - start
+    report = {"triples": len(parsed), "terms": len(parsed.terms), "profiles": len(entries),
+              "workers": workers or os.cpu_count() or 1, "seconds": round(total, 3),
+              "triples_per_second": round(len(parsed) / total) if total else None}
+    report.update({name: round(value, 3) for name, value in timings.items()})
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a partition directory from a large N-Triples/Turtle dump.")
+    parser.add_argument("source", help="N-Triples (.nt) dump, or a Turtle file to normalize first")
+    parser.add_argument("partition_dir", nargs="?", help="target directory (default: the store's partition directory)")
+    parser.add_argument("--workers", type=int, help="parser processes (default: the CPU count)")
+    parser.add_argument("--chunk-mb", type=float, default=CHUNK_BYTES / 2 ** 20, help="target chunk size")
+    args = parser.parse_args()
+
+    if args.partition_dir is None:
+        from pyscript.store import PARTITION_DIR
+        args.partition_dir = PARTITION_DIR
+    report = bulk_partitions(args.source, args.partition_dir, args.workers, int(args.chunk_mb * 2 ** 20))
+    print(f"Loaded {report['triples']} triples ({report['terms']} distinct terms) into {report['profiles']} "
+          f"partitions in {report['seconds']}s with {report['workers']} worker(s): "
+          f"{report['triples_per_second']} triples/s.")
+    print(json.dumps(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Date: 2026-10-19
+Description: Versioned change feed of the store. Every write bumps the store
+    version and records which profiles, and which sections of them, it
+    touched; the sections are worked out from the triples the write removed or
+    added (a changed skill touches Skills, SkillType and Category, a changed
+    phone number only Details). A page showing version N asks
+    /changes?since=N (or follows /changes/stream) and re-fetches just those
+    sections instead of reloading. The feed keeps the last versions in memory;
+    a client further behind, or one that saw an earlier run of the process
+    (another epoch), is told to reload everything.
+"""
+
+import threading
+import uuid
+from collections import deque
+from typing import Dict, Iterable, Optional, Set
+
+from rdflib import Graph, URIRef
+from rdflib.namespace import FOAF, RDFS
+
+from pyscript.search import ITEM_SECTIONS, PERSON_SECTION
+
+# as a profile: every profile; as a section: every section of the profile
+ALL = "*"
+# item section -> sections computed from the same items
+DERIVED_SECTIONS = {
+    "WorkExperience": ("Category",),
+    "Skills": ("SkillType", "Category"),
+    "Certificate": ("Category",),
+    "Project": ("ProjectClass", "Category"),
+}
+# sections reading class labels and themes from the common graph
+VOCABULARY_SECTIONS = ("Category", "SkillType", "ProjectClass")
+NAME_PREDICATES = {FOAF.firstName, FOAF.lastName}
+# links followed back from a changed node to the person (item -> school -> city -> country)
+MAX_DEPTH = 4
+
+
+def owner_sections(graphs: Iterable[Graph], node, person: URIRef) -> Set[str]:
+    """
+    Returns the sections of person whose items link to node, following links
+    backwards through graphs (e.g. the partition before and after a write).
+    """
+    graphs = list(graphs)
+    sections, seen, frontier = set(), {node}, {node}
+    for _ in range(MAX_DEPTH):
+        parents = set()
+        for graph in graphs:
+            for current in frontier:
+                for subject, predicate in graph.subject_predicates(current):
+                    if subject == person:
+                        sections.add(ITEM_SECTIONS.get(predicate, PERSON_SECTION))
+                    elif subject not in seen:
+                        seen.add(subject)
+                        parents.add(subject)
+        if not parents:
+            break
+        frontier = parents
+    return sections
+
+
+def changed_sections(graphs: Iterable[Graph], person: URIRef, triples: Iterable[tuple]) -> Set[str]:
+    """
+    Returns the sections of a profile that changed triples affect.
+
+    Args:
+        graphs: The person's partition before and after the change.
+        person: The person URI.
+        triples: The removed and added triples.
+
+    Returns:
+        The section keys (as in the POST / payload), or {ALL} when a triple cannot be placed.
+    """
+    graphs = list(graphs)
+    sections, owners = set(), {}
+    for subject, predicate, _ in triples:
+        if subject == person:
+            if predicate in ITEM_SECTIONS:
+                sections.add(ITEM_SECTIONS[predicate])
+            else:
+                sections.add(PERSON_SECTION)
+                if predicate in NAME_PREDICATES:
+                    sections.add("Name")
+                elif predicate == RDFS.label:
+                    sections.add("NameList")
+            continue
+        if subject not in owners:
+            owners[subject] = owner_sections(graphs, subject, person)
+        if not owners[subject]:
+            return {ALL}
+        sections |= owners[subject]
+    for section in list(sections):
+        sections.update(DERIVED_SECTIONS.get(section, ()))
+    return sections
+
+
+def common_sections(triples: Iterable[tuple]) -> Set[str]:
+    """Returns the sections of the profiles using a class that new common (vocabulary) triples describe."""
+    triples = list(triples)
+    if not triples:
+        return set()
+    # a new subClassOf edge changes the inferred edges of the items typed with the class
+    if any(predicate == RDFS.subClassOf for _, predicate, _ in triples):
+        return {ALL}
+    return set(VOCABULARY_SECTIONS)
+
+
+class changeFeed:
+    """ this class keeps the recent versions of a store and the sections each write changed"""
+
+    def __init__(self, keep: int = 1024):
+        """
+        Args:
+            keep: Versions kept; a client further behind must reload everything.
+        """
+        self.epoch = uuid.uuid4().hex[:12]     # tells this run's versions from a previous run's
+        self.version = 0
+        self.log = deque(maxlen=keep)       # (version, {profile: sections}), oldest first
+        self.condition = threading.Condition()
+
+    def record(self, version: int, profiles: Dict[str, Set[str]]):
+        """Appends the profiles (label, or ALL) and sections changed by the write of version."""
+        with self.condition:
+            self.log.append((version, {name: set(sections) for name, sections in profiles.items() if sections}))
+            self.version = version
+            self.condition.notify_all()
+
+    def since(self, version: int, epoch: Optional[str] = None) -> dict:
+        """
+        Returns what changed after version.
+
+        Returns:
+            {'epoch', 'version': the current version, 'reset': True when the
+            changes are unknown (the client must reload everything),
+            'profiles': {profile label or ALL: [section keys]}}
+        """
+        with self.condition:
+            current = self.version
+            oldest = self.log[0][0] if self.log else current + 1
+            reset = (epoch is not None and epoch != self.epoch) or version > current or version < oldest - 1
+            profiles = {}
+            if not reset:
+                for logged, changes in self.log:
+                    if logged > version:
+                        for name, sections in changes.items():
+                            profiles.setdefault(name, set()).update(sections)
+        return {"epoch": self.epoch, "version": current, "reset": reset,
+                "profiles": {name: [ALL] if ALL in sections else sorted(sections)
+                             for name, sections in profiles.items()}}
+
+    def wait(self, version: int, timeout: float) -> bool:
+        """Blocks until a version after version is recorded or timeout seconds pass; True if one was."""
+        with self.condition:
+            return self.condition.wait_for(lambda: self.version > version, timeout)
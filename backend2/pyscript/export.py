@@ -0,0 +1,229 @@
+"""
+Date: 2026-10-19
+Description: Streaming export of the store as N-Triples, Turtle or JSON-LD.
+    The graphs to export are snapshotted (the store swaps graphs on write
+    rather than mutating them), then written subject by subject through
+    generators and cut into fixed-size byte chunks, optionally gzipped on the
+    fly, so memory stays flat whatever the size of the dump. The byte stream
+    of a snapshot is deterministic, which lets /export answer Range requests
+    by regenerating it and skipping to the requested offset.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import RDF, split_uri
+
+from pyscript.graphdiff import nt_line
+
+# format key -> (content type, file extension)
+EXPORT_FORMATS = {
+    "nt": ("application/n-triples; charset=utf-8", "nt"),
+    "ttl": ("text/turtle; charset=utf-8", "ttl"),
+    "jsonld": ("application/ld+json", "jsonld"),
+}
+CHUNK_BYTES = 64 * 1024
+
+# etag -> byte length of the identity stream, filled in as exports complete
+_lengths = {}
+_MAX_LENGTHS = 256
+
+
+def snapshot(store, pid: Optional[str] = None) -> Tuple[List[Graph], str]:
+    """
+    Picks the graphs of an export and a tag identifying their content.
+
+    Args:
+        store: The profileStore.
+        pid: A partition id for one profile (with the common graph), or None for everything.
+
+    Returns:
+        ([graphs in export order], tag that changes whenever any of them is replaced)
+
+    Raises:
+        KeyError: pid is not a partition of the store.
+    """
+    with store.lock:
+        if pid is None:
+            graphs = [store.common] + [store.graphs[entry["id"]] for entry in store.entries.values()]
+            version = f"all-{store.version}"
+        else:
+            graphs = [store.common, store.graphs[pid]]
+            version = f"{pid}-{store.common_version}-{store.partition_versions.get(pid, 0)}"
+        # the triple order follows the term ids, renumbered when the store moves to a new dictionary
+        version = f"{version}-{store.term_generation}"
+    # the triple order (and blank node labels) belong to this process's copy of the graphs
+    tag = hashlib.sha1(f"{os.getpid()}:{id(store)}:{version}".encode("utf-8")).hexdigest()[:20]
+    return graphs, tag
+
+
+def subject_blocks(graphs: List[Graph]) -> Iterator[Tuple[Any, List[Tuple]]]:
+    """
+    Yields (subject, [(predicate, object)]) per subject and graph, in export
+    order. The partitions each hold a copy of the nodes they share (cities,
+    categories, private classes), so the pairs an earlier graph already had
+    for a subject are left out and a shared node is written once. This keeps
+    one entry per subject of the export (not per triple).
+    """
+    owners = {}     # subject -> index of the graph it was first written from, or a list once it recurs
+    for index, graph in enumerate(graphs):
+        for subject in graph.subjects(unique=True):
+            pairs = list(graph.predicate_objects(subject))
+            previous = owners.get(subject)
+            if previous is None:
+                owners[subject] = index
+            else:
+                previous = [previous] if isinstance(previous, int) else previous
+                pairs = [(predicate, value) for predicate, value in pairs
+                         if not any((subject, predicate, value) in graphs[earlier] for earlier in previous)]
+                owners[subject] = previous + [index]
+                if not pairs:
+                    continue
+            yield subject, pairs
+
+
+def export_triples(graphs: List[Graph]) -> int:
+    """Returns the number of triples an export of graphs writes (shared nodes counted once)."""
+    return sum(len(pairs) for _, pairs in subject_blocks(graphs))
+
+
+def ntriples_lines(graphs: List[Graph]) -> Iterator[str]:
+    """Yields one N-Triples line per triple."""
+    for subject, pairs in subject_blocks(graphs):
+        for predicate, value in pairs:
+            yield nt_line((subject, predicate, value))
+
+
+def used_prefixes(graph: Graph) -> Dict[str, str]:
+    """Returns {namespace: prefix} for the bound namespaces that some IRI of graph falls in."""
+    iris = {str(term) for triple in graph for term in triple if isinstance(term, URIRef)}
+    return {str(namespace): prefix for prefix, namespace in graph.namespaces()
+            if any(iri.startswith(namespace) for iri in iris)}
+
+
+def turtle_blocks(graphs: List[Graph]) -> Iterator[str]:
+    """
+    Yields a Turtle document: the prefixes used by the first graph (the
+    common graph, i.e. the vocabulary), then one block per subject and graph.
+    IRIs outside those prefixes are written in full.
+    """
+    prefixes = used_prefixes(graphs[0]) if graphs else {}
+    yield "".join(f"@prefix {prefix}: <{namespace}> .\n" for namespace, prefix in prefixes.items()) + "\n"
+
+    def name(term) -> str:
+        # split_uri rather than the namespace manager, whose qname cache would keep every IRI exported
+        if isinstance(term, URIRef):
+            try:
+                namespace, local = split_uri(term)
+            except ValueError:
+                return term.n3()
+            if namespace in prefixes and not local.endswith("."):
+                return f"{prefixes[namespace]}:{local}"
+        return term.n3()
+
+    for subject, pairs in subject_blocks(graphs):
+        lines = [f"    {'a' if predicate == RDF.type else name(predicate)} {name(value)}" for predicate, value in pairs]
+        yield f"{name(subject)}\n" + " ;\n".join(lines) + " .\n\n"
+
+
+def jsonld_value(term) -> Dict[str, str]:
+    """Returns the expanded JSON-LD form of an object term."""
+    if isinstance(term, Literal):
+        value = {"@value": str(term)}
+        if term.language:
+            value["@language"] = term.language
+        elif term.datatype:
+            value["@type"] = str(term.datatype)
+        return value
+    return {"@id": f"_:{term}" if isinstance(term, BNode) else str(term)}
+
+
+def jsonld_blocks(graphs: List[Graph]) -> Iterator[str]:
+    """Yields an expanded JSON-LD document: an array with one node object per subject and graph."""
+    separator = "[\n"
+    for subject, pairs in subject_blocks(graphs):
+        node = {"@id": f"_:{subject}" if isinstance(subject, BNode) else str(subject)}
+        for predicate, value in pairs:
+            if predicate == RDF.type and not isinstance(value, Literal):
+                node.setdefault("@type", []).append(str(value))
+            else:
+                node.setdefault(str(predicate), []).append(jsonld_value(value))
+        yield separator + json.dumps(node, ensure_ascii=False)
+        separator = ",\n"
+    yield "[]\n" if separator == "[\n" else "\n]\n"
+
+
+SERIALIZERS = {"nt": ntriples_lines, "ttl": turtle_blocks, "jsonld": jsonld_blocks}
+
+
+def encoded_chunks(pieces: Iterable[str], chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Encodes text pieces as UTF-8 and regroups them into chunks of about chunk_bytes."""
+    buffer, size = [], 0
+    for piece in pieces:
+        data = piece.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def export_chunks(graphs: List[Graph], fmt: str, chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Yields the export of graphs in a format of EXPORT_FORMATS as byte chunks."""
+    return encoded_chunks(SERIALIZERS[fmt](graphs), chunk_bytes)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compresses a byte stream into a gzip stream on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def byte_range(chunks: Iterable[bytes], start: int, stop: int) -> Iterator[bytes]:
+    """Yields the bytes [start, stop) of a chunked stream, skipping the chunks before start."""
+    position = 0
+    for chunk in chunks:
+        end = position + len(chunk)
+        if end > start:
+            yield chunk[max(0, start - position):stop - position]
+        position = end
+        if position >= stop:
+            return
+
+
+def counted(chunks: Iterable[bytes], tag: str) -> Iterator[bytes]:
+    """Passes a stream through and records its length under tag once it completes."""
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        yield chunk
+    remember_length(tag, total)
+
+
+def remember_length(tag: str, length: int):
+    """Caches the length of a complete export."""
+    if len(_lengths) >= _MAX_LENGTHS:
+        _lengths.clear()
+    _lengths[tag] = length
+
+
+def export_length(graphs: List[Graph], fmt: str, tag: str) -> int:
+    """Returns the byte length of an export, generating (and discarding) it once if unknown."""
+    if tag not in _lengths:
+        remember_length(tag, sum(len(chunk) for chunk in export_chunks(graphs, fmt)))
+    return _lengths[tag]
+
+
+def known_length(tag: str) -> Optional[int]:
+    """Returns the cached length of an export, or None."""
+    return _lengths.get(tag)
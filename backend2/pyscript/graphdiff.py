@@ -0,0 +1,215 @@
+"""
+Date: 2026-10-19
+Description: Triple-level diffs between a stored person partition and a
+    re-submitted CV. The CV converter (j2graph) mints a fresh UUID URI for
+    every node on each submission, so the new graph is first aligned with the
+    stored one: each minted node takes the URI of a stored node with the same
+    content (its fields and, recursively, the nodes below it). Unchanged items
+    then produce identical triples and only what was edited ends up in the
+    diff. Diffs are persisted as N-Triples in a per-partition changelog.
+"""
+
+import hashlib
+import json
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import RDFS
+
+# URIs minted by j2graph.generate_uri: <base>_<uuid4>
+MINTED = re.compile(r"_[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+
+
+def is_minted(node) -> bool:
+    """True for blank nodes and URIs minted per submission, whose names carry no meaning."""
+    return isinstance(node, BNode) or (isinstance(node, URIRef) and MINTED.search(node) is not None)
+
+
+def signatures(graph: Graph, nodes: Iterable) -> Dict:
+    """
+    Computes a content signature for each minted node: a hash of its
+    (predicate, object) pairs where minted objects are replaced by their own
+    signature, so two nodes with the same fields and sub-nodes match whatever
+    they are named.
+
+    Returns:
+        {node: signature} for the given nodes and every minted node below them.
+    """
+    computed = {}
+
+    def signature(node, path: frozenset) -> str:
+        if node in computed:
+            return computed[node]
+        parts = []
+        for predicate, value in graph.predicate_objects(node):
+            if is_minted(value):
+                # a cycle back to an ancestor is not expanded again
+                value = "cycle" if value in path else signature(value, path | {node})
+            else:
+                value = value.n3()
+            parts.append(f"{predicate.n3()} {value}")
+        computed[node] = hashlib.sha1("\n".join(sorted(parts)).encode("utf-8")).hexdigest()
+        return computed[node]
+
+    for node in nodes:
+        if is_minted(node):
+            signature(node, frozenset())
+    return computed
+
+
+def minted_nodes(graph: Graph) -> Set:
+    """Returns every minted node used as a subject or object of the graph."""
+    nodes = set()
+    for s, _, o in graph:
+        if is_minted(s):
+            nodes.add(s)
+        if is_minted(o):
+            nodes.add(o)
+    return nodes
+
+
+def align(new: Graph, person: URIRef, stored: Graph, stored_person: URIRef, partition: Graph) -> Graph:
+    """
+    Renames the nodes of a newly converted CV after the stored partition.
+
+    The person takes the stored person's URI (and keeps the stored label term
+    when the labels only differ by language tag). Minted nodes are then matched
+    top-down: a node reached from a matched node through some predicate takes
+    the URI of a stored node with the same signature reached the same way, so
+    identical items (e.g. skills of the same type) keep their own sub-nodes.
+    Nodes left over are matched on their signature alone; nodes without a
+    match keep their new URI.
+
+    Args:
+        new: The converted CV.
+        person: The person of the CV.
+        stored: The stored view of the person (partition plus common graph).
+        stored_person: The stored person.
+        partition: The stored partition, whose minted nodes are matched.
+
+    Returns:
+        A new graph with the renamed triples.
+    """
+    stored_sigs = signatures(stored, minted_nodes(partition))
+    new_sigs = signatures(new, minted_nodes(new))
+    renamed = {person: stored_person}
+    used = set()
+
+    def descend(pairs):
+        while pairs:
+            node, stored_node = pairs.pop()
+            for predicate, child in new.predicate_objects(node):
+                if child in renamed or child not in new_sigs:
+                    continue
+                for candidate in sorted(stored.objects(stored_node, predicate)):
+                    if candidate not in used and stored_sigs.get(candidate) == new_sigs[child]:
+                        renamed[child] = candidate
+                        used.add(candidate)
+                        pairs.append((child, candidate))
+                        break
+
+    descend([(person, stored_person)])
+    available = defaultdict(list)   # signature -> stored nodes not yet matched
+    for node in sorted(stored_sigs):
+        if node not in used:
+            available[stored_sigs[node]].append(node)
+    for node in sorted(new_sigs):
+        if node not in renamed and available.get(new_sigs[node]):
+            renamed[node] = available[new_sigs[node]].pop(0)
+            used.add(renamed[node])
+            descend([(node, renamed[node])])
+
+    stored_label = stored.value(stored_person, RDFS.label)
+    aligned = Graph()
+    for prefix, namespace in new.namespaces():
+        aligned.bind(prefix, namespace, override=True)
+    for s, p, o in new:
+        s, o = renamed.get(s, s), renamed.get(o, o)
+        if s == stored_person and p == RDFS.label and stored_label is not None and \
+                isinstance(o, Literal) and str(o).strip() == str(stored_label).strip():
+            o = stored_label
+        aligned.add((s, p, o))
+    return aligned
+
+
+def graph_diff(old: Graph, new: Graph) -> Tuple[Set[Tuple], Set[Tuple]]:
+    """Returns (triples only in old, triples only in new)."""
+    old_triples, new_triples = set(old), set(new)
+    return old_triples - new_triples, new_triples - old_triples
+
+
+def apply_diff(graph: Graph, removed: Iterable[Tuple], added: Iterable[Tuple]):
+    """Removes, then adds, triples in place."""
+    for triple in removed:
+        graph.remove(triple)
+    for triple in added:
+        graph.add(triple)
+
+
+def nt_term(term) -> str:
+    """
+    Returns a term in N-Triples syntax: its n3(), except that a literal is
+    always one quoted line (n3() writes multi-line strings in Turtle's triple quotes).
+    """
+    if not isinstance(term, Literal):
+        return term.n3()
+    text = str(term).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+    if term.language:
+        return f'"{text}"@{term.language}'
+    if term.datatype:
+        return f'"{text}"^^{term.datatype.n3()}'
+    return f'"{text}"'
+
+
+def nt_line(triple: Tuple) -> str:
+    """Returns one N-Triples line for a triple."""
+    s, p, o = triple
+    return f"{nt_term(s)} {nt_term(p)} {nt_term(o)} .\n"
+
+
+def to_ntriples(triples: Iterable[Tuple]) -> str:
+    """Serializes triples as N-Triples lines (in a stable order)."""
+    return "".join(sorted(nt_line(triple) for triple in triples))
+
+
+def from_ntriples(text: str) -> List[Tuple]:
+    """Parses N-Triples lines back into triples."""
+    if not text.strip():
+        return []
+    graph = Graph()
+    graph.parse(data=text, format="nt")
+    return list(graph)
+
+
+def changelog_line(version: int, removed: Iterable[Tuple], added: Iterable[Tuple]) -> str:
+    """Returns one changelog entry as a JSON line."""
+    return json.dumps({"version": version, "removed": to_ntriples(removed), "added": to_ntriples(added)}) + "\n"
+
+
+def replay_changelog(graph: Graph, path: str) -> Optional[int]:
+    """
+    Applies the entries of a partition changelog in order.
+
+    Returns:
+        The number of changed triples replayed, or None when there is no changelog.
+    """
+    try:
+        handle = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    changed = 0
+    with handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # a line cut short by a crash mid-write; nothing after it was acknowledged
+                break
+            removed, added = from_ntriples(entry["removed"]), from_ntriples(entry["added"])
+            apply_diff(graph, removed, added)
+            changed += len(removed) + len(added)
+    return changed
@@ -8,77 +8,111 @@ Description: This module contains the graphData class which retrieves and
 from rdflib import Graph, Literal, RDF, URIRef
 from rdflib.namespace import FOAF, XSD
 from pyscript.rdfquery import rdfQueries as asker
+from pyscript.store import get_store
+from pyscript.metrics import REGISTRY
+from pyscript.profiler import QUERY_PROFILER
+from pyscript.timeline import values_clause
+from pyscript.records import (sectionRecord, personDetailRecord, workExperienceRecord, educationRecord,
+                              skillRecord, skillTypeRecord, certificateRecord, projectRecord,
+                              projectClassRecord, serviceRecord, socialRecord, categoryRecord,
+                              aggregate_records)
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+import threading
+import time
+
+# rdflib's SPARQL parser is not thread-safe, so queries are parsed one at a time
+_parse_lock = threading.Lock()
+
+QUERY_SECONDS = REGISTRY.histogram("cv_query_seconds", "SPARQL query time (parse and evaluation) per query.", ["query"])
+QUERY_ROWS = REGISTRY.counter("cv_query_rows_total", "Rows returned per query.", ["query"])
+AGGREGATE_SECONDS = REGISTRY.histogram("cv_aggregate_seconds", "Time spent converting and aggregating rows into section records.")
 
 class graphData:
     """ this class retrieves information from the database"""
 
-    def __init__(self, selectedName):
-        self.graphDB = Graph()
+    def __init__(self, selectedName, store=None):
+        self.store = store if store is not None else get_store()
+        # str() of a stored term, one string per term shared by every result (see interning.termDictionary)
+        self.text = self.store.terms.text
         self.name_list = []
         self.name = ""
         self.selectedName = selectedName
         self.nameURI = ""
 
         # --- 1. Define the RDF Data ---
-        self.graphDB.parse("backend2/database/resume.ttl", format="turtle")  # Use "turtle" if it's a .ttl file
+        # only the selected person's partition plus the common ontology is queried
+        self.graphDB = self.store.profile_view(selectedName)
         self.get_Persons()
 
 
-    def aggregate_by_keys(self, data: List[Dict[str, Any]], group_keys: List[str]) -> List[Dict[str, Any]]:
+    def run_query(self, template, **params):
         """
-        Groups a list of dictionaries by multiple specified keys and consolidates 
-        the values of all other keys into unique lists.
+        Formats a query template from rdfQueries with the given parameters and
+        runs it against the profile graph.
 
         Args:
-            data: The input list of dictionaries.
-            group_keys: A list of keys used to group the dictionaries (e.g., ['label', 'country']).
+            template: An rdfQueries method returning the query text (without prefixes).
+            params: Values substituted into the template (e.g. person=self.nameURI).
 
         Returns:
-            A list of aggregated dictionaries with consolidated values as lists.
+            A list of the query result rows.
+        """
+        # the SPARQL parser is the heaviest import of the app; load it with the first query
+        from rdflib.plugins.sparql import prepareQuery
+
+        name = template.__name__
+        start = time.perf_counter()
+        query_text = "".join([asker.get_prefix(), template()]).format(**params)
+        with _parse_lock:
+            prepared = prepareQuery(query_text)
+        # rdflib evaluates lazily; listing the rows keeps evaluation inside the timing
+        rows = QUERY_PROFILER.execute(name, lambda: list(self.graphDB.query(prepared)))
+        elapsed = time.perf_counter() - start
+
+        QUERY_SECONDS.observe(elapsed, query=name)
+        QUERY_ROWS.inc(len(rows), query=name)
+        QUERY_PROFILER.record(name, params, query_text, prepared, elapsed, len(rows))
+        return rows
+
+
+    @AGGREGATE_SECONDS.time()
+    def aggregate_rows(self, record_class, rows) -> List[sectionRecord]:
         """
-        aggregated_data = {}
+        Converts and aggregates the rows of a section into records (see records.aggregate_records).
 
-        for item in data:
-            # 1. Create a unique, immutable key (a tuple) from the values of the group_keys
-            group_id = tuple(item[key] for key in group_keys)
+        Args:
+            record_class: The sectionRecord subclass of the section.
+            rows: An iterable of tuples in the field order of record_class.
+
+        Returns:
+            A list of records, one per distinct 'main'.
+        """
+        return aggregate_records(record_class, rows)
+
+
+    def timeline_window(self, section: str, offset: int = 0, limit: Optional[int] = None) -> Optional[List[str]]:
+        """
+        Returns the items of a dated section to query: None for the whole
+        section, else the requested window of the store's presorted timeline.
+        """
+        if not offset and limit is None:
+            return None
+        end = None if limit is None else offset + limit
+        return self.store.timeline(self.selectedName, section)[offset:end]
+
+
+    def order_by_timeline(self, section: str, records: List[sectionRecord]) -> List[sectionRecord]:
+        """
+        Arranges the records of a dated section in the order of the store's
+        timeline (newest first) without sorting; items missing from the
+        timeline keep their query order at the end.
+        """
+        by_main = {record.main: record for record in records}
+        ordered = [by_main.pop(main) for main in self.store.timeline(self.selectedName, section) if main in by_main]
+        ordered.extend(by_main.values())
+        return ordered
 
-            if group_id not in aggregated_data:
-                # If this is the first time seeing this group combination, initialize
-                
-                # The initial structure includes the group_keys and sets up unique sets for others
-                aggregated_data[group_id] = {}
-                
-                # Copy the grouping keys and values into the result dict
-                for key in group_keys:
-                    aggregated_data[group_id][key] = item[key]
-                
-                # Initialize all other keys as sets for automatic uniqueness checking
-                for k, v in item.items():
-                    if k not in group_keys:
-                        aggregated_data[group_id][k] = {v}
-            else:
-                # If the group combination is already present, consolidate the remaining keys
-                current_group = aggregated_data[group_id]
-                for k, v in item.items():
-                    if k not in group_keys:
-                        # Use .add() on the set to ensure uniqueness
-                        current_group[k].add(v)
-
-        # 2. Convert the aggregated dictionary (containing sets) back into the desired list format
-        final_list = []
-        for group_id, group_dict in aggregated_data.items():
-            result_item = {key: group_dict[key] for key in group_keys} # Start with group keys
-            
-            # Convert the sets back into sorted lists for the final output
-            for k, v_set in group_dict.items():
-                if k not in group_keys:
-                    result_item[k] = list(v_set) 
-            
-            final_list.append(result_item)
-            
-        return final_list
 
     def get_Persons(self):
         """
@@ -88,11 +122,8 @@ class graphData:
         Returns:
             A list of persons available in database.
         """
-        results = self.graphDB.query("".join([asker.get_prefix(), asker.get_person_query()]))
-        
-        for row in results:
-            # Extract category name from the full URI
-            self.name_list.append(str(row.person_name))
+        # the store's manifest lists every person without scanning any partition
+        self.name_list.extend(self.store.name_list())
 
     def get_name(self):
         """
@@ -113,250 +144,237 @@ class graphData:
 
         
         Returns:
-            a list of one dictionary.
+            a list of one personDetailRecord.
         """
         
-        details = self.graphDB.query("".join([asker.get_prefix(), asker.get_person_detail_query()]).format(person_name=self.name))
+        details = self.run_query(asker.get_person_detail_query, person_name=self.name)
         Detail = []        
         for row in details:
-            Detail.append({
-               'personURI':  str(row.personURI),
-               'dob':  self.format_date_string(str(row.dob), 'day_month_year') if row.dob else '',
-               'address':  str(row.address),
-               'emailAddress':  str(row.emailAddress) if row.emailAddress else '',
-               'phoneNumber':  str(row.phoneNumber) if row.phoneNumber else '',
-               'roleTitle' : str(row.roleTitle),
-               'aboutMe' : str(row.aboutMe) if row.aboutMe else '',
-               'photo' : str(row.photo) if row.photo else ''
-            })
+            Detail.append(personDetailRecord(
+               self.text(row.personURI),
+               self.format_date_string(self.text(row.dob), 'day_month_year') if row.dob else '',
+               self.text(row.address),
+               self.text(row.emailAddress) if row.emailAddress else '',
+               self.text(row.phoneNumber) if row.phoneNumber else '',
+               self.text(row.roleTitle),
+               self.text(row.aboutMe) if row.aboutMe else '',
+               self.text(row.photo) if row.photo else ''
+            ))
         
-        self.nameURI = Detail[0]['personURI']
+        self.nameURI = Detail[0].personURI
         return Detail
 
 
-    def get_workExperience(self):
+    def get_workExperience(self, offset=0, limit=None):
         """
-        returns a list of dictionaries containing all wprk experiences by the selected Name
+        returns a list of records containing all wprk experiences by the selected Name, newest first
+
+        Args:
+            offset, limit: Optional window of the presorted timeline to query (all items by default).
 
         Returns:
-            a list of dictionaries.
+            a list of workExperienceRecord.
         """
-        details = self.graphDB.query("".join([asker.get_prefix(), asker.get_experience_query()]).format(person=self.nameURI))
-        WorkExperience = []
-        for row in details:
-            WorkExperience.append({
-                'main': str(row.experience),
-                'workTitle': str(row.workTitle),
-                'industryName': str(row.industryName),
-                'city': self.process_uri_fragment(str(row.city)),
-                'country': self.process_uri_fragment(str(row.country)),
-                'startDate': self.format_date_string(str(row.startDate), 'year'),
-                'endDate': self.format_date_string(str(row.endDate), 'year') if row.endDate else 'Present',
-                'dutyDescription': str(row.dutyDescription),
-                'category': self.process_uri_fragment(str(row.category)) if row.category else ''
-                })
+        window = self.timeline_window("WorkExperience", offset, limit)
+        details = self.run_query(asker.get_experience_query, person=self.nameURI, items=values_clause("WorkExperience", window))
+        # one tuple per row, in workExperienceRecord field order
+        WorkExperience = ((
+                self.text(row.experience),
+                self.text(row.workTitle),
+                self.text(row.industryName),
+                self.process_uri_fragment(self.text(row.city)),
+                self.process_uri_fragment(self.text(row.country)),
+                self.format_date_string(self.text(row.startDate), 'year'),
+                self.format_date_string(self.text(row.endDate), 'year') if row.endDate else 'Present',
+                self.text(row.dutyDescription),
+                self.process_uri_fragment(self.text(row.category)) if row.category else ''
+                ) for row in details)
         
-        jsonWorkExperience = self.aggregate_by_keys(WorkExperience, ['main'])            
+        jsonWorkExperience = self.order_by_timeline("WorkExperience", self.aggregate_rows(workExperienceRecord, WorkExperience))
         return jsonWorkExperience
     
 
-    def get_Education(self):
+    def get_Education(self, offset=0, limit=None):
         """
-        returns a list of dictionaries containing all education by the selected Name
+        returns a list of records containing all education by the selected Name, newest first
+
+        Args:
+            offset, limit: Optional window of the presorted timeline to query (all items by default).
 
         Returns:
-            a list of dictionaries.
+            a list of educationRecord.
         """    
-        details = self.graphDB.query("".join([asker.get_prefix(), asker.get_education_query()]).format(person=self.nameURI))
-        Education = []
-        for row in details:
-            Education.append({
-                'main': str(row.education),
-                'schoolName': str(row.schoolName),
-                'degreeTitle': str(row.degreeTitle),
-                'city': self.process_uri_fragment(str(row.city)),
-                'country': self.process_uri_fragment(str(row.country)),
-                'grade': str(row.grade) if row.grade else '',
-                'endDate': self.format_date_string(str(row.endDate), 'month_year') if row.endDate else 'Present',
-                'startDate': self.format_date_string(str(row.startDate), 'month_year'),
-                'gradeVal': str(row.gradeVal) if row.gradeVal else ''
-                })
+        window = self.timeline_window("Education", offset, limit)
+        details = self.run_query(asker.get_education_query, person=self.nameURI, items=values_clause("Education", window))
+        # one tuple per row, in educationRecord field order
+        Education = ((
+                self.text(row.education),
+                self.text(row.schoolName),
+                self.text(row.degreeTitle),
+                self.process_uri_fragment(self.text(row.city)),
+                self.process_uri_fragment(self.text(row.country)),
+                self.text(row.grade) if row.grade else '',
+                self.format_date_string(self.text(row.endDate), 'month_year') if row.endDate else 'Present',
+                self.format_date_string(self.text(row.startDate), 'month_year'),
+                self.text(row.gradeVal) if row.gradeVal else ''
+                ) for row in details)
         
-        jsonEducation = self.aggregate_by_keys(Education, ['main'])
+        jsonEducation = self.order_by_timeline("Education", self.aggregate_rows(educationRecord, Education))
         return jsonEducation
     
 
     def get_skill(self):
         """
-        returns a list of dictionaries containing all skills by the selected Name
+        returns a list of records containing all skills by the selected Name
         Returns:
-            a list of dictionaries.
+            a list of skillRecord.
         """
-        details = self.graphDB.query("".join([asker.get_prefix(), asker.get_skill_query()]).format(person=self.nameURI))
-        Skill = []
-        for row in details:
-            Skill.append({
-                'main': str(row.skill),
-                'skillTitle': str(row.skillTitle),
-                'category': self.process_uri_fragment(str(row.category)) if row.category else '',
-                'typename': str(row.typename),
-                'percentageScore': str(row.percentageScore),
-                'percentage': str(row.percentage),
-                'skillDescription': str(row.skillDescription) if row.skillDescription else ''        
-        })
+        details = self.run_query(asker.get_skill_query, person=self.nameURI)
+        # one tuple per row, in skillRecord field order
+        Skill = ((
+                self.text(row.skill),
+                self.text(row.skillTitle),
+                self.process_uri_fragment(self.text(row.category)) if row.category else '',
+                self.text(row.typename),
+                self.text(row.percentageScore),
+                self.text(row.percentage),
+                self.text(row.skillDescription) if row.skillDescription else ''
+                ) for row in details)
             
-        jsonSkill = self.aggregate_by_keys(Skill, ['main'])            
+        jsonSkill = self.aggregate_rows(skillRecord, Skill)
         return jsonSkill
     
     def get_skill_types(self):
         """
-        returns a list of dictionaries containing all skill types by the selected Name
+        returns a list of records containing all skill types by the selected Name
         
         Returns:
-            a list of dictionaries.
+            a list of skillTypeRecord.
         """
 
-        details = self.graphDB.query("".join([asker.get_prefix(), asker.get_skill_type()]).format(person=self.nameURI))
-        SkillType = []
-        for row in details:
-            SkillType.append({
-                'main': str(row.skillLabel)                
-        
-        })
+        details = self.run_query(asker.get_skill_type, person=self.nameURI)
+        SkillType = ((self.text(row.skillLabel),) for row in details)
         
-        jsonSkillType = self.aggregate_by_keys(SkillType, ['main'])
+        jsonSkillType = self.aggregate_rows(skillTypeRecord, SkillType)
         return jsonSkillType
     
 
-    def get_certifications(self):
+    def get_certifications(self, offset=0, limit=None):
         """
-        returns a list of dictionaries containing all certifications gotten by the selected Name
-        
+        returns a list of records containing all certifications gotten by the selected Name, newest first
+
+        Args:
+            offset, limit: Optional window of the presorted timeline to query (all items by default).
+
         Returns:
-            a list of dictionaries.
+            a list of certificateRecord.
         """
 
-        details = self.graphDB.query("".join([asker.get_prefix(), asker.get_achievement_query()]).format(person=self.nameURI))
-        Certificate = []
-        for row in details:
-            Certificate.append({
-                'main': str(row.achievement),
-                'certTitle': str(row.certTitle),
-                'endDate': self.format_date_string(str(row.endDate), 'month_year') if row.endDate else '',
-                'link': str(row.link) if row.link else '',                
-                'category': self.process_uri_fragment(str(row.category)) if row.category else ''
-        
-        })
+        window = self.timeline_window("Certificate", offset, limit)
+        details = self.run_query(asker.get_achievement_query, person=self.nameURI, items=values_clause("Certificate", window))
+        # one tuple per row, in certificateRecord field order
+        Certificate = ((
+                self.text(row.achievement),
+                self.text(row.certTitle),
+                self.format_date_string(self.text(row.endDate), 'month_year') if row.endDate else '',
+                self.text(row.link) if row.link else '',
+                self.process_uri_fragment(self.text(row.category)) if row.category else ''
+                ) for row in details)
             
-        jsonCertificate = self.aggregate_by_keys(Certificate, ['main'])
+        jsonCertificate = self.order_by_timeline("Certificate", self.aggregate_rows(certificateRecord, Certificate))
         return jsonCertificate
     
 
     def get_projects(self):
         """
-        returns a list of dictionaries containing all projects by the selected Name
+        returns a list of records containing all projects by the selected Name
 
         Returns:
-            a list of dictionaries.
+            a list of projectRecord.
         """
 
-        details = self.graphDB.query("".join([asker.get_prefix(), asker.get_project_query()]).format(person=self.nameURI))
-        Project = []
-        for row in details:
-            Project.append({
-                'main': str(row.project),
-                'projectTitle': str(row.projectTitle),
-                'projectClass': str(row.projectClass) if row.projectClass else '',
-                'projectDescription': str(row.projectDescription) if row.projectDescription else '',
-                'projectLink': str(row.projectLink) if row.projectLink else '#',                 
-                'category': self.process_uri_fragment(str(row.category)) if row.category else ''
-        
-        })
+        details = self.run_query(asker.get_project_query, person=self.nameURI)
+        # one tuple per row, in projectRecord field order
+        Project = ((
+                self.text(row.project),
+                self.text(row.projectTitle),
+                self.text(row.projectClass) if row.projectClass else '',
+                self.text(row.projectDescription) if row.projectDescription else '',
+                self.text(row.projectLink) if row.projectLink else '#',
+                self.process_uri_fragment(self.text(row.category)) if row.category else ''
+                ) for row in details)
             
-        jsonProject = self.aggregate_by_keys(Project, ['main'])
+        jsonProject = self.aggregate_rows(projectRecord, Project)
         return jsonProject
     
 
     def get_project_class(self):
         """
-        returns a list of dictionaries containing all project classes done by the selected Name
+        returns a list of records containing all project classes done by the selected Name
         
         Returns:
-            a list of dictionaries.
+            a list of projectClassRecord.
         """
 
-        details = self.graphDB.query("".join([asker.get_prefix(), asker.get_project_class_query()]).format(person=self.nameURI))
-        ProjectClass = []
-        for row in details:
-            ProjectClass.append({
-                'main': str(row.projectClass)                
-        
-        })
+        details = self.run_query(asker.get_project_class_query, person=self.nameURI)
+        ProjectClass = ((self.text(row.projectClass),) for row in details)
         
-        jsonProjectClass = self.aggregate_by_keys(ProjectClass, ['main'])
+        jsonProjectClass = self.aggregate_rows(projectClassRecord, ProjectClass)
         return jsonProjectClass
     
 
     def get_services(self):
         """
-        returns a list of dictionaries containing all services provided by the selected Name
+        returns a list of records containing all services provided by the selected Name
 
         Returns:
-            a list of dictionaries.
+            a list of serviceRecord.
         """
 
-        details = self.graphDB.query("".join([asker.get_prefix(), asker.get_service_query()]).format(person=self.nameURI))
-        Services = []
-        for row in details:
-            Services.append({
-                'main': str(row.service),
-                'serviceTitle': str(row.serviceTitle),
-                'serviceText': str(row.serviceText) if row.serviceText else '',
-                'serviceImage': str(row.serviceImage) if row.serviceImage else ''                      
-        })
+        details = self.run_query(asker.get_service_query, person=self.nameURI)
+        # one tuple per row, in serviceRecord field order
+        Services = ((
+                self.text(row.service),
+                self.text(row.serviceTitle),
+                self.text(row.serviceText) if row.serviceText else '',
+                self.text(row.serviceImage) if row.serviceImage else ''
+                ) for row in details)
             
-        jsonServices = self.aggregate_by_keys(Services, ['main'])
+        jsonServices = self.aggregate_rows(serviceRecord, Services)
         return jsonServices
     
 
     def get_socials(self):
         """
-        returns a list of dictionaries containing all social media accounts by the selected Name
+        returns a list of records containing all social media accounts by the selected Name
 
         Returns:
-            a list of dictionaries.
+            a list of socialRecord.
         """
 
-        details = self.graphDB.query("".join([asker.get_prefix(), asker.get_social_query()]).format(person=self.nameURI))
-        Social = []
-        for row in details:
-            Social.append({
-                'main': str(row.social),
-                'socialType': self.process_uri_fragment(str(row.socialType)),
-                'socialLink': str(row.socialLink)
-                                       
-        })
+        details = self.run_query(asker.get_social_query, person=self.nameURI)
+        # one tuple per row, in socialRecord field order
+        Social = ((
+                self.text(row.social),
+                self.process_uri_fragment(self.text(row.socialType)),
+                self.text(row.socialLink)
+                ) for row in details)
             
-        jsonSocial = self.aggregate_by_keys(Social, ['main'])
+        jsonSocial = self.aggregate_rows(socialRecord, Social)
         return jsonSocial
     
     def get_categories(self):
         """
-        returns a list of dictionaries containing all social media accounts by the selected Name
+        returns a list of records containing all categories used by the selected Name
 
         Returns:
-            a list of dictionaries.
+            a list of categoryRecord.
         """
 
-        details = self.graphDB.query("".join([asker.get_prefix(), asker.get_category_query()]).format(person=self.nameURI))
-        Category = []
-        for row in details:
-            Category.append({
-                'main': self.process_uri_fragment(str(row.category))                
-                                       
-        })
+        details = self.run_query(asker.get_category_query, person=self.nameURI)
+        Category = ((self.process_uri_fragment(self.text(row.category)),) for row in details)
             
-        jsonCategory = self.aggregate_by_keys(Category, ['main'])
+        jsonCategory = self.aggregate_rows(categoryRecord, Category)
         return jsonCategory
     
 
@@ -0,0 +1,82 @@
+"""
+Date: 2026-10-19
+Description: This module materializes the RDFS inferences used by the skill
+    and social queries. The rdfs:subClassOf closure is computed once, and every
+    skill or social item gets direct "is-a Skill/Social of type X" edges, so the
+    queries in rdfquery.py read them with a single lookup instead of re-deriving
+    the class hierarchy on every request.
+"""
+
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+from rdflib import Graph, Namespace, URIRef
+from rdflib.namespace import RDF, RDFS
+
+CUSTOM = Namespace("URN://cv.resume/")
+
+# --- Materialized predicates (never serialized to the partition files) ---
+INFERRED_SKILL_TYPE = CUSTOM.inferredSkillType      # item -> skill class (subclass of :Skills)
+INFERRED_SKILL_LABEL = CUSTOM.inferredSkillLabel    # item -> rdfs:label of that skill class
+INFERRED_SOCIAL_TYPE = CUSTOM.inferredSocialType    # item -> social class (subclass of :Socials)
+
+
+def subclass_closure(*graphs: Graph) -> Dict[URIRef, Set[URIRef]]:
+    """
+    Computes the transitive rdfs:subClassOf closure over one or more graphs.
+
+    Returns:
+        A dictionary mapping every class with a superclass to the set of all its superclasses.
+    """
+    parents = defaultdict(set)
+    for graph in graphs:
+        for sub, sup in graph.subject_objects(RDFS.subClassOf):
+            parents[sub].add(sup)
+
+    closure = {}
+    for cls in parents:
+        ancestors = set()
+        stack = list(parents[cls])
+        while stack:
+            sup = stack.pop()
+            if sup in ancestors:
+                continue
+            ancestors.add(sup)
+            stack.extend(parents.get(sup, ()))
+        closure[cls] = ancestors
+    return closure
+
+
+def subclasses_of(closure: Dict[URIRef, Set[URIRef]], root: URIRef) -> Set[URIRef]:
+    """Returns every (direct or indirect) subclass of root."""
+    return {cls for cls, ancestors in closure.items() if root in ancestors}
+
+
+def materialize(partition: Graph, common: Graph, closure: Optional[Dict[URIRef, Set[URIRef]]] = None) -> Graph:
+    """
+    Builds the inferred skill/social edges for one person partition.
+
+    Args:
+        partition: The person partition holding the skill and social items.
+        common: The graph holding the shared class hierarchy and class labels.
+        closure: The precomputed closure of the common graph; recomputed when
+            missing or when the partition declares classes of its own.
+
+    Returns:
+        A graph with only the materialized triples.
+    """
+    if closure is None or (None, RDFS.subClassOf, None) in partition:
+        closure = subclass_closure(partition, common)
+    skill_types = subclasses_of(closure, CUSTOM.Skills)
+    social_types = subclasses_of(closure, CUSTOM.Socials)
+
+    inferred = Graph()
+    for item, cls in partition.subject_objects(RDF.type):
+        if cls in skill_types:
+            inferred.add((item, INFERRED_SKILL_TYPE, cls))
+            for graph in (partition, common):
+                for label in graph.objects(cls, RDFS.label):
+                    inferred.add((item, INFERRED_SKILL_LABEL, label))
+        if cls in social_types:
+            inferred.add((item, INFERRED_SOCIAL_TYPE, cls))
+    return inferred
@@ -0,0 +1,245 @@
+"""
+Date: 2026-10-19
+Description: Term interning for the in-memory graphs. A termDictionary
+    numbers the distinct terms (IRIs, blank nodes, literals) of a store and
+    keeps one object per term, so a literal repeated across thousands of
+    profiles ("assets/avatar-1.png", a country, "80%") is held once. The
+    internedStore is an rdflib store that keeps a graph's triples as three
+    sorted orders (spo, pos, osp) of term ids in integer arrays instead of
+    rdflib's nested dictionaries; a lookup is a binary search. Writes go to a
+    small pending set that is merged into the arrays on the next read. The
+    partitions of a profileStore share its dictionary, and the str() of a
+    term handed to query-result conversion is cached with it, so cached
+    profiles share those strings too. Ids are never released: a term no graph
+    uses any more (an edited literal) stays until the store moves its graphs
+    to a new dictionary (profileStore.collect_terms).
+"""
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import Iterator, List, Optional, Tuple
+
+from rdflib.store import Store
+
+# order name -> positions of the subject, predicate and object in its sort key
+ORDERS = {"spo": (0, 1, 2), "pos": (1, 2, 0), "osp": (2, 0, 1)}
+# 4-byte ids: up to 2**32 distinct terms per dictionary
+ID_TYPE = "I"
+
+
+class termDictionary:
+    """ this class numbers the distinct terms of a store and keeps one object per term"""
+
+    def __init__(self):
+        self.ids = {}       # term -> id
+        self.terms = []     # id -> term
+        self.texts = []     # id -> str(term), filled on first use
+
+    def id_of(self, term) -> int:
+        """Returns the id of a term, numbering it if new (callers serialize writes, e.g. with the store lock)."""
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+            self.texts.append(None)
+        return term_id
+
+    def intern(self, term):
+        """Returns the dictionary's object for a term equal to term."""
+        return self.terms[self.id_of(term)]
+
+    def text(self, term) -> str:
+        """
+        Returns str(term), shared by every caller for the terms of the
+        dictionary; values computed by a query (and None) are converted as is.
+        """
+        term_id = self.ids.get(term) if term is not None else None
+        if term_id is None:
+            return str(term)
+        text = self.texts[term_id]
+        if text is None:
+            text = self.texts[term_id] = str(term)
+        return text
+
+    def __len__(self):
+        return len(self.terms)
+
+
+def coalesce(*values, default=None):
+    """Returns the first value that is not None, else default."""
+    return next((value for value in values if value is not None), default)
+
+
+def sorted_columns(triples: List[Tuple[int, int, int]], positions: Tuple[int, int, int]) -> tuple:
+    """Returns the ids of triples sorted in one order, as three arrays (first, second and third key)."""
+    keyed = sorted(map(itemgetter(*positions), triples))
+    return tuple(array(ID_TYPE, map(itemgetter(column), keyed)) for column in range(3))
+
+
+def narrow(column: array, key: int, lo: int, hi: int) -> Tuple[int, int]:
+    """Returns the bounds of the run of key in column[lo:hi] (sorted)."""
+    return bisect_left(column, key, lo, hi), bisect_right(column, key, lo, hi)
+
+
+class internedStore(Store):
+    """ this class is an rdflib store keeping the triples of one graph as sorted arrays of term ids"""
+
+    context_aware = False
+    formula_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration=None, identifier=None, terms: Optional[termDictionary] = None):
+        """
+        Args:
+            configuration, identifier: As for rdflib stores.
+            terms: The dictionary to share (e.g. all partitions of a profileStore); a new one when None.
+        """
+        super().__init__(configuration)
+        self.identifier = identifier
+        self.terms = terms if terms is not None else termDictionary()
+        self.indexes = {order: (array(ID_TYPE), array(ID_TYPE), array(ID_TYPE)) for order in ORDERS}
+        self.added = set()      # id triples written since the last merge
+        self.removed = set()    # id triples of the arrays removed since the last merge
+        self.lock = threading.Lock()
+        self.__namespace = {}
+        self.__prefix = {}
+
+    # --- index maintenance ---
+    def merge(self):
+        """Merges the pending writes into the sorted arrays (on the first read after a write)."""
+        if not self.added and not self.removed:
+            return
+        with self.lock:
+            if not self.added and not self.removed:
+                return
+            subjects, predicates, objects = self.indexes["spo"]
+            triples = list(zip(subjects, predicates, objects))
+            if self.removed:
+                triples = [triple for triple in triples if triple not in self.removed]
+            triples.extend(self.added)
+            # readers take the new arrays as a whole; the pending sets are only read by writers
+            self.indexes = {order: sorted_columns(triples, positions) for order, positions in ORDERS.items()}
+            self.added, self.removed = set(), set()
+
+    def stored(self, triple: Tuple[int, int, int]) -> bool:
+        """Tells whether an id triple is in the arrays (ignoring pending writes)."""
+        subjects, predicates, objects = self.indexes["spo"]
+        lo, hi = narrow(subjects, triple[0], 0, len(subjects))
+        lo, hi = narrow(predicates, triple[1], lo, hi)
+        lo, hi = narrow(objects, triple[2], lo, hi)
+        return lo < hi
+
+    def term_ids(self) -> set:
+        """Returns the ids of the terms the graph uses."""
+        self.merge()
+        return set().union(*self.indexes["spo"])
+
+    def contains(self, triple: Tuple[int, int, int]) -> bool:
+        """Tells whether an id triple is in the graph, pending writes included."""
+        if triple in self.added:
+            return True
+        return triple not in self.removed and self.stored(triple)
+
+    # --- rdflib store interface ---
+    def add(self, triple, context, quoted: bool = False):
+        Store.add(self, triple, context, quoted=quoted)
+        id_of = self.terms.id_of
+        key = (id_of(triple[0]), id_of(triple[1]), id_of(triple[2]))
+        if key in self.removed:
+            self.removed.discard(key)
+        elif not self.stored(key):
+            self.added.add(key)
+
+    def remove(self, triple_pattern, context=None):
+        ids = self.terms.ids
+        if None not in triple_pattern:
+            # a single triple (e.g. applying a diff) needs no merge
+            key = tuple(ids.get(term) for term in triple_pattern)
+            if None in key:
+                return
+            if key in self.added:
+                self.added.discard(key)
+            elif key not in self.removed and self.stored(key):
+                self.removed.add(key)
+            return
+        for (subject, predicate, obj), _ in list(self.triples(triple_pattern)):
+            self.removed.add((ids[subject], ids[predicate], ids[obj]))
+
+    def triples(self, triple_pattern, context=None) -> Iterator:
+        subject, predicate, obj = triple_pattern
+        ids, terms = self.terms.ids, self.terms.terms
+        try:
+            s = ids[subject] if subject is not None else None
+            p = ids[predicate] if predicate is not None else None
+            o = ids[obj] if obj is not None else None
+        except (KeyError, TypeError):
+            return
+        if s is not None and p is not None and o is not None:
+            # membership test (`triple in graph`): answered from the pending writes as well
+            if self.contains((s, p, o)):
+                yield (subject, predicate, obj), iter(())
+            return
+
+        self.merge()
+        indexes = self.indexes
+        if s is not None:
+            subjects, predicates, objects = indexes["spo"]
+            lo, hi = narrow(subjects, s, 0, len(subjects))
+            if p is not None:
+                lo, hi = narrow(predicates, p, lo, hi)
+            for p_id, o_id in zip(predicates[lo:hi], objects[lo:hi]):
+                if o is None or o_id == o:
+                    yield (subject, terms[p_id], terms[o_id]), iter(())
+        elif p is not None:
+            predicates, objects, subjects = indexes["pos"]
+            lo, hi = narrow(predicates, p, 0, len(predicates))
+            if o is not None:
+                lo, hi = narrow(objects, o, lo, hi)
+            for o_id, s_id in zip(objects[lo:hi], subjects[lo:hi]):
+                yield (terms[s_id], predicate, terms[o_id]), iter(())
+        elif o is not None:
+            objects, subjects, predicates = indexes["osp"]
+            lo, hi = narrow(objects, o, 0, len(objects))
+            for s_id, p_id in zip(subjects[lo:hi], predicates[lo:hi]):
+                yield (terms[s_id], terms[p_id], obj), iter(())
+        else:
+            for s_id, p_id, o_id in zip(*indexes["spo"]):
+                yield (terms[s_id], terms[p_id], terms[o_id]), iter(())
+
+    def __len__(self, context=None) -> int:
+        self.merge()
+        return len(self.indexes["spo"][0])
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def nbytes(self) -> int:
+        """Returns the bytes held by the id arrays."""
+        self.merge()
+        return sum(column.itemsize * len(column) for columns in self.indexes.values() for column in columns)
+
+    # --- namespace bindings (as in rdflib's SimpleMemory) ---
+    def bind(self, prefix, namespace, override: bool = True):
+        bound_namespace = self.__namespace.get(prefix)
+        bound_prefix = coalesce(self.__prefix.get(namespace), self.__prefix.get(bound_namespace))
+        if override:
+            if bound_prefix is not None:
+                del self.__namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self.__prefix[bound_namespace]
+            self.__prefix[namespace] = prefix
+            self.__namespace[prefix] = namespace
+        else:
+            self.__prefix[coalesce(bound_namespace, namespace)] = coalesce(bound_prefix, default=prefix)
+            self.__namespace[coalesce(bound_prefix, prefix)] = coalesce(bound_namespace, default=namespace)
+
+    def namespace(self, prefix):
+        return self.__namespace.get(prefix, None)
+
+    def prefix(self, namespace):
+        return self.__prefix.get(namespace, None)
+
+    def namespaces(self):
+        yield from self.__namespace.items()
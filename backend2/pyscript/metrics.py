@@ -0,0 +1,193 @@
+"""
+Date: 2026-10-19
+Description: This module contains a small, dependency-free metrics layer
+    (counters, gauges and histograms with labels) rendered in the Prometheus
+    text exposition format by the /metrics endpoint.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import ContextDecorator
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    """Renders a label set as {name="value",...}, escaping values as the text format requires."""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    """Renders a sample value; integers without a trailing .0."""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class metricBase:
+    """ this class holds what all metric types share: name, help text and label names"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self.lock = threading.Lock()
+
+    def key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Returns the label values in declaration order."""
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class metricCounter(metricBase):
+    """ this class counts events; the value only goes up"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self.values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            items = list(self.values.items())
+        return [f"{self.name}{format_labels(self.label_names, key)} {format_value(value)}" for key, value in items]
+
+
+class metricGauge(metricBase):
+    """ this class reports a value that goes up and down, set directly or read from a callback"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=(), callback: Optional[Callable[[], Optional[float]]] = None):
+        super().__init__(name, help_text, labels)
+        self.values = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels):
+        with self.lock:
+            self.values[self.key(labels)] = value
+
+    def samples(self):
+        if self.callback is not None:
+            value = self.callback()
+            return [] if value is None else [f"{self.name} {format_value(value)}"]
+        with self.lock:
+            items = list(self.values.items())
+        return [f"{self.name}{format_labels(self.label_names, key)} {format_value(value)}" for key, value in items]
+
+
+class metricTimer(ContextDecorator):
+    """ this class times a block or a function call into a histogram"""
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+        self.start = 0.0
+
+    def _recreate_cm(self):
+        # as a decorator every call (in any thread) times itself with its own timer
+        return metricTimer(self.histogram, self.labels)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class metricHistogram(metricBase):
+    """ this class counts observations (e.g. durations) into cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self.values = {}    # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, **labels):
+        key = self.key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def time(self, **labels) -> metricTimer:
+        """Returns a context manager / decorator observing the elapsed time."""
+        return metricTimer(self, labels)
+
+    def samples(self):
+        with self.lock:
+            items = [(key, list(state)) for key, state in self.values.items()]
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                le = f'le="{format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, key)} {format_value(state[-1])}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class metricsRegistry:
+    """ this class collects the metrics of the process and renders them for /metrics"""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def register(self, metric: metricBase) -> metricBase:
+        """Registers a metric, returning the already registered one of the same name if any."""
+        with self.lock:
+            return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, labels=()) -> metricCounter:
+        return self.register(metricCounter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=(), callback=None) -> metricGauge:
+        return self.register(metricGauge(name, help_text, labels, callback))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS) -> metricHistogram:
+        return self.register(metricHistogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# process-wide registry used by the app and the pyscript modules
+REGISTRY = metricsRegistry()
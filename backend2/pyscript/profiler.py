@@ -0,0 +1,142 @@
+"""
+Date: 2026-10-19
+Description: This module contains the queryProfiler class which watches the
+    SPARQL queries run by graphData. Queries slower than a threshold are
+    appended to a slow-query log (JSON lines) with their bindings, wall time,
+    row count and rdflib algebra plan, and selected queries can be run under
+    cProfile to dump a per-query report on demand.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable
+
+from rdflib.term import Node
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+SLOW_QUERY_LOG = os.path.join(LOG_DIR, "slow_queries.jsonl")
+
+
+def format_plan(node: Any, indent: str = "") -> str:
+    """
+    Renders an rdflib algebra tree (prepared.algebra) as indented text,
+    like rdflib's pprintAlgebra but returned instead of printed.
+    """
+    from rdflib.plugins.sparql.parserutils import CompValue
+
+    if isinstance(node, CompValue):
+        lines = [f"{node.name}("]
+        for key, value in node.items():
+            if key.startswith("_"):
+                continue
+            lines.append(f"{indent}    {key} = {format_plan(value, indent + '    ')}")
+        lines.append(f"{indent})")
+        return "\n".join(lines)
+    if isinstance(node, (list, tuple)):
+        if node and all(isinstance(item, tuple) and len(item) == 3 for item in node):
+            # a basic graph pattern: one triple per line
+            inner = "".join(f"\n{indent}    {' '.join(format_plan(term) for term in triple)}" for triple in node)
+            return f"[{inner}\n{indent}]"
+        return "[" + ", ".join(format_plan(item, indent) for item in node) + "]"
+    if isinstance(node, Node):
+        return node.n3()
+    return repr(node)
+
+
+class queryProfiler:
+    """ this class records slow queries and, on demand, cProfile statistics per query"""
+
+    def __init__(self, threshold_ms: float = 100.0, log_path: str = SLOW_QUERY_LOG,
+                 profiled: Iterable[str] = ()):
+        """
+        Args:
+            threshold_ms: Queries at least this slow are written to the slow-query log.
+            log_path: The JSON-lines slow-query log.
+            profiled: Query names (e.g. 'get_project_query', or '*' for all) run under cProfile.
+        """
+        self.threshold_ms = threshold_ms
+        self.log_path = log_path
+        self.profiled = set(profiled)
+        self.stats = {}     # query name -> accumulated pstats.Stats
+        self.lock = threading.Lock()
+        self.profile_lock = threading.Lock()    # one cProfile run at a time
+
+    def is_profiled(self, name: str) -> bool:
+        return "*" in self.profiled or name in self.profiled
+
+    def execute(self, name: str, run: Callable[[], Any]) -> Any:
+        """Calls run(), under cProfile when the query is selected for profiling."""
+        if not self.is_profiled(name):
+            return run()
+
+        profile = cProfile.Profile()
+        with self.profile_lock:
+            result = profile.runcall(run)
+        with self.lock:
+            if name in self.stats:
+                self.stats[name].add(profile)
+            else:
+                self.stats[name] = pstats.Stats(profile)
+        return result
+
+    def record(self, name: str, params: Dict[str, Any], query_text: str, prepared, elapsed: float, rows: int):
+        """Appends a slow-query log entry if the query took at least the threshold."""
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+
+        entry = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "query": name,
+            "bindings": {key: str(value) for key, value in params.items()},
+            "elapsed_ms": round(elapsed_ms, 3),
+            "rows": rows,
+            "plan": format_plan(prepared.algebra),
+            "text": query_text,
+        }
+        try:
+            with self.lock:
+                os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as log:
+                    log.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Could not write slow-query log '{self.log_path}': {e}")
+
+    def report(self, name: str, limit: int = 30, sort: str = "cumulative") -> str:
+        """Returns the accumulated cProfile statistics of a query as text."""
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                return f"No profile collected for '{name}'. Enabled for: {sorted(self.profiled) or 'none'}.\n"
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def dump(self, name: str, path: str) -> bool:
+        """Writes the accumulated statistics of a query as a .prof file (for snakeviz, flameprof, ...)."""
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                return False
+            stats.dump_stats(path)
+        return True
+
+
+def profiler_from_env() -> queryProfiler:
+    """
+    Builds the process-wide profiler from CV_SLOW_QUERY_MS (threshold, default 100),
+    CV_SLOW_QUERY_LOG (log path) and CV_PROFILE_QUERIES (comma-separated query names or '*').
+    """
+    profiled = [name.strip() for name in os.environ.get("CV_PROFILE_QUERIES", "").split(",") if name.strip()]
+    return queryProfiler(threshold_ms=float(os.environ.get("CV_SLOW_QUERY_MS", "100")),
+                         log_path=os.environ.get("CV_SLOW_QUERY_LOG", SLOW_QUERY_LOG),
+                         profiled=profiled)
+
+
+QUERY_PROFILER = profiler_from_env()
@@ -62,12 +62,15 @@ class rdfQueries:
         """
         return Query_person_detail
     
+    # the education, experience and achievement queries take an {items} VALUES
+    # restriction (timeline.values_clause) and are ordered by the store's timelines
     def get_education_query():
 
         Query_Education = """
 
             SELECT ?education ?schoolName ?city ?country ?endDate ?startDate ?grade ?gradeVal ?degreeTitle
             WHERE {{
+                {items}
                 <{person}> :hasEducation ?education .
 
                 ?education :doneAt ?school ;
@@ -87,8 +90,7 @@ class rdfQueries:
             OPTIONAL {{ ?education :endDate ?endDate }} .
             OPTIONAL {{ ?degree :hasGrade ?grade }} .
             OPTIONAL {{ ?degree :hasGradeValue ?gradeVal }} .
-            }}            
-            ORDER BY ASC(BOUND(?endDate)) DESC(?endDate)
+            }}
         """
         return Query_Education
     
@@ -100,6 +102,7 @@ class rdfQueries:
 
             SELECT ?experience ?workTitle ?industryName ?city ?country ?endDate ?startDate ?dutyDescription ?category
             WHERE {{
+                {items}
                 <{person}> :hasExperience ?experience .
 
                 ?experience :doneAt ?industry ;                 
@@ -117,8 +120,7 @@ class rdfQueries:
 
             OPTIONAL {{ ?experience :endDate ?endDate }} .
             OPTIONAL {{ ?experience :hasCategory ?category }} .
-            }}            
-            ORDER BY ASC(BOUND(?endDate)) DESC(?endDate)
+            }}
         """
         return Query_Experience
     
@@ -131,14 +133,11 @@ class rdfQueries:
             WHERE {{
                 <{person}> :hasSkill ?skill.
                     
-                ?skill rdf:type ?skillType ;
+                ?skill :inferredSkillLabel ?typename ;
                     :hasPercentage ?percentage ;
                     foaf:status ?percentageScore ;
                     foaf:title ?skillTitle .
 
-                ?skillType rdfs:subClassOf :Skills ;
-                 rdfs:label ?typename .
-
                 OPTIONAL {{ ?skill :hasCategory ?category }} .
                 OPTIONAL {{ ?skill dc:description ?skillDescription }} .
                 
@@ -153,13 +152,9 @@ class rdfQueries:
 
         Select DISTINCT ?skillLabel
         WHERE {{
-            ?skill rdf:type owl:Class ;
-              rdfs:subClassOf :Skills ;
-              rdfs:label ?skillLabel .
-
-            ?specSkill rdf:type ?skill.
-
             <{person}> :hasSkill  ?specSkill .
+
+            ?specSkill :inferredSkillLabel ?skillLabel .
               }}
         """
         return Query_Skill_Types
@@ -170,6 +165,7 @@ class rdfQueries:
 
             SELECT ?achievement ?certTitle ?endDate ?link ?category
             WHERE {{
+                {items}
                 <{person}> :hasAchievement ?achievement .
 
                 ?achievement foaf:title ?certTitle .    
@@ -178,7 +174,6 @@ class rdfQueries:
                 OPTIONAL {{ ?achievement :hasLink ?link }} .
                 OPTIONAL {{ ?achievement :hasCategory ?category }} .
             }}
-            ORDER BY ASC(BOUND(?endDate)) DESC(?endDate)
         """
         return Query_Achievement
     
@@ -248,11 +243,9 @@ class rdfQueries:
             WHERE {{
                 <{person}> :hasSocial ?social.
 
-                ?social rdf:type ?socialType ;
+                ?social :inferredSocialType ?socialType ;
                     :hasLink ?socialLink .
 
-                ?socialType rdfs:subClassOf :Socials.
-
                 }}
         """
         return Query_Social
@@ -0,0 +1,127 @@
+"""
+Date: 2026-10-19
+Description: This module contains the section record classes returned by
+    graphData. Each record has one slot per JSON key of its section (no
+    per-instance dict), query rows are aggregated into them from plain tuples,
+    and they are turned into JSON objects only when a response is encoded.
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+class sectionRecord:
+    """ this class is the base of all section records; subclasses list their JSON keys in __slots__"""
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the record in its JSON shape."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def project(self, keep) -> Dict[str, Any]:
+        """Returns the JSON shape restricted to the keys in keep."""
+        return {name: getattr(self, name) for name in self.__slots__ if name in keep}
+
+    def __getitem__(self, name: str) -> Any:
+        # dict-style access for code written against the former per-row dicts
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and all(getattr(self, name) == getattr(other, name)
+                                                 for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+
+class personDetailRecord(sectionRecord):
+    """ this class holds the details of the about section"""
+    __slots__ = ("personURI", "dob", "address", "emailAddress", "phoneNumber", "roleTitle", "aboutMe", "photo")
+
+
+class workExperienceRecord(sectionRecord):
+    """ this class holds one work experience"""
+    __slots__ = ("main", "workTitle", "industryName", "city", "country", "startDate", "endDate",
+                 "dutyDescription", "category")
+
+
+class educationRecord(sectionRecord):
+    """ this class holds one education"""
+    __slots__ = ("main", "schoolName", "degreeTitle", "city", "country", "grade", "endDate", "startDate", "gradeVal")
+
+
+class skillRecord(sectionRecord):
+    """ this class holds one skill"""
+    __slots__ = ("main", "skillTitle", "category", "typename", "percentageScore", "percentage", "skillDescription")
+
+
+class skillTypeRecord(sectionRecord):
+    """ this class holds one skill type"""
+    __slots__ = ("main",)
+
+
+class certificateRecord(sectionRecord):
+    """ this class holds one certificate"""
+    __slots__ = ("main", "certTitle", "endDate", "link", "category")
+
+
+class projectRecord(sectionRecord):
+    """ this class holds one project"""
+    __slots__ = ("main", "projectTitle", "projectClass", "projectDescription", "projectLink", "category")
+
+
+class projectClassRecord(sectionRecord):
+    """ this class holds one project class"""
+    __slots__ = ("main",)
+
+
+class serviceRecord(sectionRecord):
+    """ this class holds one service"""
+    __slots__ = ("main", "serviceTitle", "serviceText", "serviceImage")
+
+
+class socialRecord(sectionRecord):
+    """ this class holds one social media account"""
+    __slots__ = ("main", "socialType", "socialLink")
+
+
+class categoryRecord(sectionRecord):
+    """ this class holds one category"""
+    __slots__ = ("main",)
+
+
+def aggregate_records(record_class, rows: Iterable[Tuple]) -> List[sectionRecord]:
+    """
+    Groups row tuples by their first value ('main') and consolidates every
+    other value into a list of its distinct values, in first-seen order.
+
+    Args:
+        record_class: The sectionRecord subclass to build.
+        rows: Tuples with one value per slot of record_class, 'main' first.
+
+    Returns:
+        One record per distinct 'main', in first-seen order.
+    """
+    groups = {}     # main -> one insertion-ordered dict (used as a set) per other field
+    for values in rows:
+        seen = groups.get(values[0])
+        if seen is None:
+            groups[values[0]] = [{value: None} for value in values[1:]]
+        else:
+            for index in range(len(seen)):
+                seen[index][values[index + 1]] = None
+
+    return [record_class(main, *[list(values) for values in seen]) for main, seen in groups.items()]
+
+
+def to_json(value: Any) -> Any:
+    """JSON encoder hook (json.dumps(default=...)) turning section records into objects."""
+    if isinstance(value, sectionRecord):
+        return value.as_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
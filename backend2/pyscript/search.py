@@ -0,0 +1,231 @@
+"""
+Date: 2026-10-19
+Description: This module contains the searchIndex class, an in-memory inverted
+    index over every profile. Titles, labels, descriptions, grades and the
+    local names of categories, cities and countries are tokenized and posted
+    under the item (work experience, skill, project, ...) they describe, so a
+    keyword or skill search reads a few posting lists instead of scanning every
+    literal with FILTER(CONTAINS(...)). The store indexes each partition when
+    it is loaded or written.
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.namespace import DC, FOAF, RDF, RDFS
+
+CV = Namespace("URN://cv.resume/")
+
+# person predicate -> section key of the items it links (as in the POST / payload)
+ITEM_SECTIONS = {
+    CV.hasExperience: "WorkExperience",
+    CV.hasEducation: "Education",
+    CV.hasSkill: "Skills",
+    CV.hasAchievement: "Certificate",
+    CV.hasProject: "Project",
+    CV.provideService: "Service",
+    CV.hasSocial: "Social",
+}
+# the person's own fields are reported under this section
+PERSON_SECTION = "Details"
+
+# predicate -> weight of the tokens of its literal
+LITERAL_WEIGHTS = {
+    RDFS.label: 3.0,
+    FOAF.title: 3.0,
+    FOAF.firstName: 3.0,
+    FOAF.lastName: 3.0,
+    DC.description: 1.0,
+    CV.hasGrade: 1.0,
+    CV.hasAddress: 1.0,
+}
+# predicate -> weight of the tokens of the local name of its object (categories, cities, countries)
+NAME_WEIGHTS = {
+    CV.hasCategory: 2.0,
+    CV.locatedIn: 2.0,
+}
+
+STOP_WORDS = frozenset({"a", "an", "and", "at", "by", "for", "in", "of", "on", "or", "the", "to", "with"})
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits text into lower-case alphanumeric tokens, dropping stop words and single letters."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower())
+            if (len(token) > 1 or token.isdigit()) and token not in STOP_WORDS]
+
+
+def local_name(uri: URIRef) -> str:
+    """Returns the part of a URI after the last '/' or '#' (e.g. 'Data_Analysis')."""
+    return re.split(r"[/#]", str(uri))[-1]
+
+
+def node_fields(graph: Graph, node, person: URIRef) -> Tuple[List[Tuple[str, float]], List]:
+    """
+    Reads one node in a single pass.
+
+    Returns:
+        ([(token, weight) of its indexed fields], [nodes it links to, other than classes and the person])
+    """
+    terms, links = [], []
+    for predicate, value in graph.predicate_objects(node):
+        if isinstance(value, Literal):
+            weight = LITERAL_WEIGHTS.get(predicate)
+            if weight:
+                terms.extend((token, weight) for token in tokenize(value))
+            continue
+        weight = NAME_WEIGHTS.get(predicate)
+        if weight:
+            terms.extend((token, weight) for token in tokenize(local_name(value)))
+        if predicate != RDF.type and value != person:
+            links.append(value)
+    return terms, links
+
+
+def partition_documents(graph: Graph, person: URIRef) -> Dict[str, Tuple[str, Dict[str, float]]]:
+    """
+    Collects the searchable text of one person's partition.
+
+    Each item linked from the person is one document holding the tokens of its
+    own fields and of every node reached from it (duties, school, city, ...),
+    so a city or category matches each item it belongs to. The person's own
+    fields form a document of its own.
+
+    Returns:
+        {item URI: (section key, {token: weight})}
+    """
+    fields = {}     # node -> node_fields(node); shared nodes (cities, ...) are read once
+    read = lambda node: fields[node] if node in fields else fields.setdefault(node, node_fields(graph, node, person))
+
+    documents = {str(person): (PERSON_SECTION, term_weights(read(person)[0]))}
+    for predicate, section in ITEM_SECTIONS.items():
+        for item in graph.objects(person, predicate):
+            terms = []
+            visited = {item}
+            stack = [item]
+            while stack:
+                node_terms, links = read(stack.pop())
+                terms.extend(node_terms)
+                for value in links:
+                    if value not in visited:
+                        visited.add(value)
+                        stack.append(value)
+            documents[str(item)] = (section, term_weights(terms))
+    return documents
+
+
+def term_weights(terms: Iterable[Tuple[str, float]]) -> Dict[str, float]:
+    """Sums the weights of repeated tokens, dampened logarithmically."""
+    totals = defaultdict(float)
+    for token, weight in terms:
+        totals[token] += weight
+    return {token: 1.0 + math.log(total) if total > 1.0 else total for token, total in totals.items()}
+
+
+class searchIndex:
+    """ this class maps tokens to the profiles and items they occur in and ranks the matches"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.postings = {}      # token -> {partition id: weight summed over its items}
+        self.by_section = {}    # section key -> token -> {partition id: weight summed over its items of the section}
+        self.items = {}         # partition id -> token -> {item URI: weight}
+        self.sections = {}      # partition id -> {item URI: section key}
+        self.labels = {}        # partition id -> person label
+
+    def __len__(self):
+        return len(self.labels)
+
+    def add_partition(self, pid: str, graph: Graph, person: URIRef, label: str):
+        """Indexes (or re-indexes) the partition of one person."""
+        documents = partition_documents(graph, person)
+        items = defaultdict(dict)
+        for item, (section, weights) in documents.items():
+            for token, weight in weights.items():
+                items[token][item] = weight
+
+        with self.lock:
+            self.remove_partition(pid)
+            for token, weights in items.items():
+                self.postings.setdefault(token, {})[pid] = sum(weights.values())
+                for item, weight in weights.items():
+                    section_postings = self.by_section.setdefault(documents[item][0], {}).setdefault(token, {})
+                    section_postings[pid] = section_postings.get(pid, 0.0) + weight
+            self.items[pid] = dict(items)
+            self.sections[pid] = {item: section for item, (section, _) in documents.items()}
+            self.labels[pid] = label
+
+    def remove_partition(self, pid: str):
+        """Drops every posting of a partition; unknown ids are ignored."""
+        with self.lock:
+            sections = self.sections.pop(pid, {})
+            for token, weights in self.items.pop(pid, {}).items():
+                self.discard(self.postings, token, pid)
+                for section in {sections[item] for item in weights}:
+                    self.discard(self.by_section[section], token, pid)
+            self.labels.pop(pid, None)
+
+    @staticmethod
+    def discard(postings: Dict[str, Dict[str, float]], token: str, pid: str):
+        """Removes pid from the posting list of token, dropping the list once it is empty."""
+        entries = postings.get(token)
+        if entries is not None:
+            entries.pop(pid, None)
+            if not entries:
+                del postings[token]
+
+    def search(self, query: str, section: Optional[str] = None, match_all: bool = True,
+               limit: int = 20, offset: int = 0) -> Dict:
+        """
+        Ranks the profiles matching a query.
+
+        Every query token is weighted by its inverse document frequency (over
+        profiles); a profile scores the sum over tokens of that weight times
+        the token's weight in the profile. Only the returned page of profiles
+        is expanded into its matching items, scored the same way.
+
+        Args:
+            query: Free text; tokenized like the indexed fields.
+            section: Only match items of this section (e.g. 'Skills'), if given.
+            match_all: Require every token to occur in the profile (else any token).
+            limit, offset: The page of ranked profiles to return.
+
+        Returns:
+            dict: 'query' (the tokens), 'total' (matching profiles) and 'results',
+                a list of {'id', 'name', 'score', 'matches': [{'section', 'main', 'score'}]}.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        with self.lock:
+            source = self.postings if section is None else self.by_section.get(section, {})
+            lists = [source.get(token, {}) for token in tokens]
+            profiles = max(1, len(self.labels))
+            idf = [math.log(1.0 + profiles / (1.0 + len(postings))) for postings in lists]
+
+            if match_all:
+                # start from the shortest posting list; every other token must hit too
+                candidates = min(lists, key=len) if lists else {}
+                scores = {pid: sum(weight * postings[pid] for weight, postings in zip(idf, lists))
+                          for pid in candidates if all(pid in postings for postings in lists)}
+            else:
+                scores = defaultdict(float)
+                for weight, postings in zip(idf, lists):
+                    for pid, value in postings.items():
+                        scores[pid] += weight * value
+
+            page = heapq.nsmallest(offset + limit, scores, key=lambda pid: (-scores[pid], self.labels[pid]))[offset:]
+            results = []
+            for pid in page:
+                matches = defaultdict(float)
+                for weight, token in zip(idf, tokens):
+                    for item, value in self.items[pid].get(token, {}).items():
+                        if section is None or self.sections[pid][item] == section:
+                            matches[item] += weight * value
+                results.append({"id": pid, "name": self.labels[pid], "score": round(scores[pid], 4),
+                                "matches": [{"section": self.sections[pid][item], "main": item, "score": round(score, 4)}
+                                            for item, score in sorted(matches.items(), key=lambda m: (-m[1], m[0]))]})
+        return {"query": tokens, "total": len(scores), "results": results}
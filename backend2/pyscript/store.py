@@ -0,0 +1,583 @@
+"""
+Date: 2026-10-19
+Description: This module contains the profileStore class which keeps the RDF
+    database partitioned into one named graph (and one Turtle file) per person.
+    The shared vocabulary (classes, properties, subClassOf hierarchy) lives in
+    a common graph, so a profile query only sees that person's partition plus
+    the ontology, and a write only rewrites the partition it touches.
+"""
+
+import contextvars
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from rdflib import BNode, Graph, URIRef
+from rdflib.graph import ReadOnlyGraphAggregate
+from rdflib.namespace import FOAF, OWL, RDF, RDFS
+
+from pyscript.changes import ALL, changeFeed, changed_sections, common_sections
+from pyscript.graphdiff import align, apply_diff, changelog_line, graph_diff, replay_changelog
+from pyscript.inference import materialize, subclass_closure
+from pyscript.interning import internedStore, termDictionary
+from pyscript.metrics import REGISTRY
+from pyscript.search import searchIndex
+from pyscript.timeline import build_timelines
+
+# --- Default locations (resolved from this file, not from the working directory) ---
+DATABASE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database")
+SOURCE_FILE = os.path.join(DATABASE_DIR, "resume.ttl")
+PARTITION_DIR = os.path.join(DATABASE_DIR, "partitions")
+
+MANIFEST_FILE = "manifest.jsonl"
+COMMON_FILE = "common.ttl"
+CHANGELOG_SUFFIX = ".changes.jsonl"     # <partition id>.changes.jsonl: diffs applied on top of <partition id>.ttl
+GRAPH_BASE = "URN://cv.resume/graph/"
+
+# subjects typed with one of these (or carrying one of the schema predicates) belong to the ontology
+SCHEMA_TYPES = {OWL.Class, OWL.ObjectProperty, OWL.DatatypeProperty, OWL.AnnotationProperty, OWL.Ontology, RDFS.Class}
+SCHEMA_PREDICATES = {RDFS.subClassOf, RDFS.subPropertyOf, RDFS.domain, RDFS.range}
+
+# graphs keep their triples as arrays of interned term ids (see interning.py); CV_INTERN_TERMS=0 uses rdflib's Memory store
+INTERN_TERMS = os.environ.get("CV_INTERN_TERMS", "1") != "0"
+
+
+def new_graph(identifier: Optional[str] = None, namespaces=None, terms: Optional[termDictionary] = None) -> Graph:
+    """
+    Creates an empty graph, optionally named and with the namespaces of another
+    graph bound. Its terms go to the dictionary terms (e.g. the store's), or to
+    a dictionary of its own.
+    """
+    store = internedStore(terms=terms) if INTERN_TERMS else "default"
+    graph = Graph(store=store, identifier=URIRef(identifier) if identifier else None)
+    if namespaces is not None:
+        for prefix, namespace in namespaces.namespaces():
+            graph.bind(prefix, namespace, override=True)
+    return graph
+
+
+def schema_nodes(graph: Graph) -> set:
+    """Returns every subject of the graph that is part of the shared vocabulary."""
+    nodes = set()
+    for s, p, o in graph:
+        if p in SCHEMA_PREDICATES or (p == RDF.type and o in SCHEMA_TYPES):
+            nodes.add(s)
+    return nodes
+
+
+def private_classes(graph: Graph, schema: set) -> set:
+    """
+    Returns the classes a graph declares that are not shared vocabulary: new
+    (not in schema), used as the type of items of the graph, and not the
+    superclass of another class. A converted CV mints such classes for its
+    own skill types; they belong in the partition of the person using them.
+    """
+    new = schema_nodes(graph) - schema
+    superclasses = {o for _, p, o in graph if p in SCHEMA_PREDICATES}
+    return {cls for cls in new - superclasses
+            if any(item not in new for item in graph.subjects(RDF.type, cls))}
+
+
+def partition_id(person_uri: URIRef, taken) -> str:
+    """Derives a file-safe, unique partition id from the local name of a person URI."""
+    base = re.sub(r"[^A-Za-z0-9_-]", "_", str(person_uri).rstrip("/").split("/")[-1]) or "person"
+    candidate, counter = base, 1
+    while candidate in taken:
+        counter += 1
+        candidate = f"{base}_{counter}"
+    return candidate
+
+
+def split_graph(graph: Graph, schema: Optional[set] = None) -> Tuple[Graph, Dict[URIRef, Graph]]:
+    """
+    Splits a graph into a common graph and one graph per foaf:Person.
+
+    A person's partition holds every triple whose subject is reachable from the
+    person without passing through the ontology or through another person.
+    Nodes shared between persons (cities, categories, ...) are copied into each
+    partition that reaches them. Everything reached by nobody stays in common.
+
+    Args:
+        graph: The graph to split.
+        schema: Nodes to treat as vocabulary; defaults to the graph's own schema nodes.
+
+    Returns:
+        A tuple (common graph, {person URI: partition graph}).
+    """
+    if schema is None:
+        schema = schema_nodes(graph)
+
+    persons = [s for s in graph.subjects(RDF.type, FOAF.Person) if s not in schema]
+    person_set = set(persons)
+    assigned = set()
+    partitions = {}
+
+    for person in persons:
+        partition = new_graph(namespaces=graph)
+        visited = {person}
+        stack = [person]
+        while stack:
+            node = stack.pop()
+            for triple in graph.triples((node, None, None)):
+                partition.add(triple)
+                assigned.add(triple)
+                o = triple[2]
+                if isinstance(o, (URIRef, BNode)) and o not in visited and o not in schema and o not in person_set:
+                    visited.add(o)
+                    stack.append(o)
+        partitions[person] = partition
+
+    common = new_graph(namespaces=graph)
+    for triple in graph:
+        if triple not in assigned:
+            common.add(triple)
+
+    return common, partitions
+
+
+def write_turtle(graph: Graph, filepath: str):
+    """Serializes a graph to Turtle through a temporary file so readers never see a half-written file."""
+    tmp_path = f"{filepath}.tmp"
+    graph.serialize(destination=tmp_path, format="turtle")
+    os.replace(tmp_path, filepath)
+
+
+def build_partitions(source_file: str = SOURCE_FILE, partition_dir: str = PARTITION_DIR) -> int:
+    """
+    Splits a monolithic Turtle file into a partition directory. An N-Triples
+    (.nt) dump goes through the parallel bulk loader instead, with
+    CV_BULK_WORKERS parser processes (default: the CPU count).
+
+    Args:
+        source_file: The Turtle or N-Triples file to split (the shipped resume.ttl by default).
+        partition_dir: The directory receiving common.ttl, one file per person and the manifest.
+
+    Returns:
+        The number of person partitions written.
+    """
+    if source_file.endswith(".nt"):
+        # the bulk loader (and its process pool) is only needed for an N-Triples dump, not to serve
+        from pyscript.bulkload import bulk_partitions
+        report = bulk_partitions(source_file, partition_dir, int(os.environ.get("CV_BULK_WORKERS", "0")) or None)
+        print(f"Bulk-loaded '{source_file}' into {report['profiles']} person graphs "
+              f"({report['triples_per_second']} triples/s with {report['workers']} worker(s)).")
+        return report["profiles"]
+
+    graph = new_graph()
+    graph.parse(source_file, format="turtle")
+    common, partitions = split_graph(graph)
+
+    os.makedirs(partition_dir, exist_ok=True)
+    write_turtle(common, os.path.join(partition_dir, COMMON_FILE))
+
+    entries = []
+    taken = set()
+    for person, partition in partitions.items():
+        pid = partition_id(person, taken)
+        taken.add(pid)
+        write_turtle(partition, os.path.join(partition_dir, f"{pid}.ttl"))
+        label = partition.value(person, RDFS.label)
+        entries.append({"id": pid, "uri": str(person), "label": str(label) if label is not None else ""})
+
+    tmp_path = os.path.join(partition_dir, f"{MANIFEST_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as manifest:
+        for entry in entries:
+            manifest.write(json.dumps(entry) + "\n")
+    os.replace(tmp_path, os.path.join(partition_dir, MANIFEST_FILE))
+
+    print(f"Partitioned '{source_file}' into {len(entries)} person graphs and {len(common)} common triples.")
+    return len(entries)
+
+
+LOAD_SECONDS = REGISTRY.histogram("cv_graph_load_seconds", "Time to load the partitioned store.")
+WRITE_TRIPLES = REGISTRY.counter("cv_store_written_triples_total", "Triples written to partitions by add_graph.")
+
+
+class profileStore:
+    """ this class keeps the database as one named graph per person plus a common ontology graph"""
+
+    def __init__(self, partition_dir: str = PARTITION_DIR, source_file: str = SOURCE_FILE):
+        self.partition_dir = partition_dir
+        self.source_file = source_file
+        self.lock = threading.RLock()
+        self.terms = termDictionary()       # the terms of every graph of the store, one object each
+        self.terms_checked = 0      # dictionary size at the last check for unused terms (see collect_terms)
+        self.term_generation = 0    # bumped when the graphs move to a new dictionary (their triple order changes)
+        self.common = new_graph(GRAPH_BASE + "common", terms=self.terms)
+        self.schema = set()
+        self.graphs = {}        # partition id -> Graph
+        self.inferred = {}      # partition id -> materialized RDFS edges (memory only)
+        self.timelines = {}     # partition id -> {section: item URIs, newest first} (memory only)
+        self.search = searchIndex()     # tokens of every partition (memory only)
+        self.closure = {}       # rdfs:subClassOf closure of the common graph
+        self.entries = {}       # person URI -> manifest entry
+        self.by_label = {}      # person label -> manifest entry of the first person with it
+        self.version = 0        # bumped on every write
+        self.changes = changeFeed(keep=int(os.environ.get("CV_CHANGES_KEEP", "1024")))   # sections each version changed
+        self.common_version = 0
+        self.partition_versions = {}    # partition id -> version of its last write
+        self.pending_changes = {}       # partition id -> triples in its changelog since the last compaction
+        self.load()
+
+    def load(self):
+        """
+        Loads the common graph and every person partition, building the
+        partition directory from the source file on first use.
+        """
+        with LOAD_SECONDS.time():
+            self.load_partitions()
+        self.terms_checked = len(self.terms)
+
+    def load_partitions(self):
+        """Reads the manifest, the common graph and the partitions, then materializes inferences."""
+        if not os.path.exists(os.path.join(self.partition_dir, MANIFEST_FILE)):
+            build_partitions(self.source_file, self.partition_dir)
+
+        self.common.parse(os.path.join(self.partition_dir, COMMON_FILE), format="turtle")
+        self.schema = schema_nodes(self.common)
+
+        with open(os.path.join(self.partition_dir, MANIFEST_FILE), encoding="utf-8") as manifest:
+            for line in manifest:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                # later lines override earlier ones for the same person
+                self.entries[entry["uri"]] = entry
+
+        for entry in self.entries.values():
+            self.by_label.setdefault(entry["label"], entry)
+
+        for entry in self.entries.values():
+            graph = new_graph(GRAPH_BASE + entry["id"], terms=self.terms)
+            graph.parse(os.path.join(self.partition_dir, f"{entry['id']}.ttl"), format="turtle")
+            changed = replay_changelog(graph, os.path.join(self.partition_dir, f"{entry['id']}{CHANGELOG_SUFFIX}"))
+            if changed is not None:
+                self.pending_changes[entry["id"]] = changed
+            self.graphs[entry["id"]] = graph
+            self.timelines[entry["id"]] = build_timelines(graph, URIRef(entry["uri"]))
+            self.search.add_partition(entry["id"], graph, URIRef(entry["uri"]), entry["label"])
+
+        self.rematerialize()
+
+    def rematerialize(self):
+        """Recomputes the subClassOf closure and the inferred edges of every partition."""
+        self.closure = subclass_closure(self.common)
+        self.inferred = {pid: materialize(graph, self.common, self.closure) for pid, graph in self.graphs.items()}
+
+    def name_list(self) -> List[str]:
+        """Returns the labels of all persons in manifest order."""
+        return [entry["label"] for entry in self.entries.values()]
+
+    def find_person(self, name: str) -> Optional[dict]:
+        """Returns the manifest entry of the first person labelled with name, or None."""
+        return self.by_label.get(name)
+
+    def stamp(self, name: str) -> Optional[int]:
+        """
+        Returns a value that changes whenever the data visible to the named
+        profile changes: a write to its partition, or to common vocabulary its
+        items use (merge_common bumps the version of those partitions too).
+        None for an unknown name.
+        """
+        entry = self.find_person(name)
+        return self.partition_versions.get(entry["id"], 0) if entry is not None else None
+
+    def profile_view(self, name: str) -> Graph:
+        """
+        Returns a read-only graph over the common graph, the partition of the
+        named person and its inferred edges, or only the common graph if the
+        name is unknown.
+        """
+        entry = self.find_person(name)
+        if entry is None:
+            return self.common
+        pid = entry["id"]
+        return ReadOnlyGraphAggregate([self.common, self.graphs[pid], self.inferred[pid]])
+
+    def timeline(self, name: str, section: str) -> List[str]:
+        """
+        Returns the items of a dated section (see timeline.TIMELINE_SECTIONS) of the
+        named profile, newest first, or an empty list if the name is unknown.
+        """
+        entry = self.find_person(name)
+        if entry is None:
+            return []
+        return self.timelines.get(entry["id"], {}).get(section, [])
+
+    def add_graph(self, graph: Graph) -> List[str]:
+        """
+        Adds a graph (e.g. a converted CV) to the store. Each person in it gets
+        its own new partition file, holding the classes only its items use;
+        only shared vocabulary not yet known is appended to the common graph.
+
+        Args:
+            graph: The graph to merge into the store.
+
+        Returns:
+            The ids of the partitions written.
+        """
+        with self.lock:
+            common, partitions = split_graph(graph, self.vocabulary(graph))
+            written, touched = [], {}
+            self.version += 1
+
+            for person, partition in partitions.items():
+                pid = partition_id(person, self.graphs)
+                named = new_graph(GRAPH_BASE + pid, namespaces=graph, terms=self.terms)
+                named += partition
+                write_turtle(named, os.path.join(self.partition_dir, f"{pid}.ttl"))
+
+                label = named.value(person, RDFS.label)
+                entry = {"id": pid, "uri": str(person), "label": str(label) if label is not None else ""}
+                with open(os.path.join(self.partition_dir, MANIFEST_FILE), "a", encoding="utf-8") as manifest:
+                    manifest.write(json.dumps(entry) + "\n")
+
+                self.entries[entry["uri"]] = entry
+                self.by_label.setdefault(entry["label"], entry)
+                self.install_partition(pid, named, person)
+                WRITE_TRIPLES.inc(len(named))
+                written.append(pid)
+                touched[entry["label"]] = {ALL}
+
+            # a new profile adds a name to everyone's name list
+            touched[ALL] = {"NameList"}
+            self.touch_users(touched, *self.merge_common(common))
+            self.changes.record(self.version, touched)
+            self.collect_terms()
+            return written
+
+    def vocabulary(self, graph: Graph) -> set:
+        """
+        Returns the nodes to keep out of the partitions when splitting a graph
+        written to the store: the known vocabulary plus the graph's new shared
+        classes. Classes private to one CV go to its partition (copied, like a
+        city, if several persons of the graph use them), so a new CV leaves
+        the common graph and common.ttl untouched.
+        """
+        return self.schema | (schema_nodes(graph) - private_classes(graph, self.schema))
+
+    def upsert_graph(self, graph: Graph) -> Dict[str, Tuple[int, int]]:
+        """
+        Adds or updates the persons of a graph (e.g. a re-submitted CV). A person
+        whose label matches a stored profile (ignoring its language tag) replaces
+        that profile: the new graph is aligned with the stored partition (see
+        graphdiff.align) and only the triples that differ are removed or added,
+        in memory and as one line of the partition changelog. Other persons are
+        added like add_graph does.
+
+        Args:
+            graph: The graph to merge into the store.
+
+        Returns:
+            {partition id: (triples removed, triples added)} for every partition written.
+        """
+        with self.lock:
+            known = {}
+            for person in set(graph.subjects(RDF.type, FOAF.Person)):
+                label = graph.value(person, RDFS.label)
+                entry = self.find_person(str(label).strip()) if label is not None else None
+                if entry is not None:
+                    known[person] = entry
+            if not known:
+                return {pid: (0, len(self.graphs[pid])) for pid in self.add_graph(graph)}
+            self.version += 1
+
+            for person, entry in known.items():
+                pid = entry["id"]
+                graph = align(graph, person, ReadOnlyGraphAggregate([self.common, self.graphs[pid]]),
+                              URIRef(entry["uri"]), self.graphs[pid])
+
+            common, partitions = split_graph(graph, self.vocabulary(graph))
+            changes, touched = {}, {}
+            stored = {URIRef(entry["uri"]): entry["id"] for entry in known.values()}
+            fresh = new_graph(namespaces=graph)
+            for person, partition in partitions.items():
+                if person not in stored:
+                    fresh += partition
+                    continue
+                pid = stored[person]
+                removed, added = graph_diff(self.graphs[pid], partition)
+                changes[pid] = (len(removed), len(added))
+                if not removed and not added:
+                    continue
+
+                # copy on write: readers holding the previous graph keep a consistent view
+                updated = new_graph(GRAPH_BASE + pid, namespaces=self.graphs[pid], terms=self.terms)
+                updated += self.graphs[pid]
+                apply_diff(updated, removed, added)
+                touched[self.entries[str(person)]["label"]] = changed_sections((self.graphs[pid], updated), person,
+                                                                             removed | added)
+                self.write_changes(pid, updated, removed, added)
+                self.install_partition(pid, updated, person)
+                WRITE_TRIPLES.inc(len(removed) + len(added))
+
+            if len(fresh):
+                # recorded first: add_graph writes (and records) the next version
+                self.changes.record(self.version, touched)
+                changes.update({pid: (0, len(self.graphs[pid])) for pid in self.add_graph(fresh + common)})
+            else:
+                self.touch_users(touched, *self.merge_common(common))
+                self.changes.record(self.version, touched)
+            self.collect_terms()
+            return changes
+
+    def collect_terms(self):
+        """
+        Moves the graphs to a new term dictionary holding only the terms they
+        use, once most of the current one is unused (edited literals, removed
+        items); ids are never released otherwise. The dictionary is only
+        scanned after it has doubled since the last scan, so the scans cost a
+        constant amount per new term. Readers holding the previous graphs keep
+        the previous dictionary with them.
+        """
+        if not INTERN_TERMS or len(self.terms) < 2 * self.terms_checked:
+            return
+        with self.lock:
+            graphs = [self.common] + list(self.graphs.values())
+            used = set().union(*(graph.store.term_ids() for graph in graphs))
+            if 2 * len(used) >= len(self.terms):
+                self.terms_checked = len(self.terms)
+                return
+
+            terms = termDictionary()
+
+            def moved(graph: Graph) -> Graph:
+                copy = new_graph(graph.identifier, namespaces=graph, terms=terms)
+                copy += graph
+                return copy
+
+            self.common = moved(self.common)
+            self.graphs = {pid: moved(graph) for pid, graph in self.graphs.items()}
+            self.terms = terms
+            self.terms_checked = len(terms)
+            self.term_generation += 1
+
+    def write_changes(self, pid: str, graph: Graph, removed: set, added: set):
+        """
+        Persists a diff of a partition by appending it to the partition's
+        changelog; once the changelog holds more changed triples than the
+        partition itself (or the diff has blank nodes, which N-Triples cannot
+        identify across files), the partition file is rewritten and the
+        changelog dropped.
+        """
+        changelog = os.path.join(self.partition_dir, f"{pid}{CHANGELOG_SUFFIX}")
+        pending = self.pending_changes.get(pid, 0) + len(removed) + len(added)
+        blank = any(isinstance(term, BNode) for triple in removed | added for term in triple)
+        if blank or pending > len(graph):
+            write_turtle(graph, os.path.join(self.partition_dir, f"{pid}.ttl"))
+            if os.path.exists(changelog):
+                os.remove(changelog)
+            self.pending_changes.pop(pid, None)
+            return
+        with open(changelog, "a", encoding="utf-8") as log:
+            log.write(changelog_line(self.version, removed, added))
+        self.pending_changes[pid] = pending
+
+    def install_partition(self, pid: str, graph: Graph, person: URIRef):
+        """Serves a new or updated partition: its inferred edges, timelines and search postings."""
+        self.graphs[pid] = graph
+        self.inferred[pid] = materialize(graph, self.common, self.closure)
+        self.timelines[pid] = build_timelines(graph, person)
+        self.search.add_partition(pid, graph, person, self.entries[str(person)]["label"])
+        self.partition_versions[pid] = self.version
+
+    def merge_common(self, common: Graph) -> Tuple[list, List[str]]:
+        """
+        Appends the vocabulary of common not yet known to the common graph and
+        its file. Only the partitions using it get their inferred edges
+        rebuilt and a new version, so only their cached results go stale.
+
+        Returns:
+            (the new triples, the ids of the partitions using a class they describe)
+        """
+        new_common = [triple for triple in common if triple not in self.common]
+        if not new_common:
+            return new_common, []
+        updated = new_graph(GRAPH_BASE + "common", namespaces=self.common, terms=self.terms)
+        updated += self.common
+        for triple in new_common:
+            updated.add(triple)
+        write_turtle(updated, os.path.join(self.partition_dir, COMMON_FILE))
+        # swap rather than mutate so in-flight readers keep a consistent graph
+        self.common = updated
+        self.common_version = self.version
+        self.schema = schema_nodes(updated)
+        if any(p == RDFS.subClassOf for _, p, _ in new_common):
+            self.closure = subclass_closure(updated)
+        users = self.users_of(new_common)
+        for pid in users:
+            # only these partitions type items with the classes whose hierarchy or labels changed
+            self.inferred[pid] = materialize(self.graphs[pid], updated, self.closure)
+            self.partition_versions[pid] = self.version
+        return new_common, users
+
+    def users_of(self, new_common: list) -> List[str]:
+        """
+        Returns the ids of the partitions using a class described by new
+        common triples, or a subclass of it. A new CV mostly declares classes
+        of its own, kept in its partition, so this is usually empty.
+        """
+        classes = {subject for subject, _, _ in new_common}
+        classes |= {cls for cls, ancestors in self.closure.items() if ancestors & classes}
+        return [pid for pid, graph in self.graphs.items() if any((None, None, cls) in graph for cls in classes)]
+
+    def touch_users(self, touched: Dict[str, set], new_common: list, users: List[str]):
+        """Adds to touched (profile label -> changed sections) the profiles whose partitions use new common vocabulary."""
+        sections = common_sections(new_common)
+        if not sections:
+            return
+        labels = {entry["id"]: entry["label"] for entry in self.entries.values()}
+        for pid in users:
+            if ALL not in touched.get(labels[pid], ()):
+                touched.setdefault(labels[pid], set()).update(sections)
+
+    def __len__(self):
+        return len(self.common) + sum(len(graph) for graph in self.graphs.values())
+
+
+_default_store = None
+_default_lock = threading.Lock()
+# the store of the tenant whose request is being handled (see tenants.py), if any
+_tenant_store = contextvars.ContextVar("cv_tenant_store", default=None)
+
+
+REGISTRY.gauge("cv_graph_triples", "Triples held by the loaded store (partitions and common graph).",
+               callback=lambda: len(_default_store) if _default_store is not None else None)
+REGISTRY.gauge("cv_graph_profiles", "Profiles held by the loaded store.",
+               callback=lambda: len(_default_store.entries) if _default_store is not None else None)
+
+
+def get_store() -> profileStore:
+    """Returns the store of the current tenant, else the process-wide store, loading it on first use."""
+    store = _tenant_store.get()
+    if store is not None:
+        return store
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = profileStore()
+        return _default_store
+
+
+def tenant_store() -> Optional[profileStore]:
+    """Returns the store of the tenant being served, or None outside a tenant request."""
+    return _tenant_store.get()
+
+
+@contextmanager
+def use_store(store: profileStore):
+    """Makes get_store() return store within the block (in this thread and contexts copied from it)."""
+    token = _tenant_store.set(store)
+    try:
+        yield store
+    finally:
+        _tenant_store.reset(token)
+
+
+if __name__ == '__main__':
+    # Run: python -m pyscript.store [source.ttl] [partition_dir]
+    import sys
+    build_partitions(*sys.argv[1:3])
@@ -0,0 +1,236 @@
+"""
+Date: 2026-10-19
+Description: Multi-tenant routing. Each tenant (a team hosting its CV
+    portfolio) has a directory under CV_TENANT_DIR holding its resume.ttl (or
+    resume.nt) and the partition directory built from it. A request reaches a
+    tenant through the URL prefix /t/<tenant>/... or the host name
+    <tenant>.<CV_TENANT_DOMAIN>. The tenantRegistry loads a tenant's store on
+    first use and keeps the loaded stores in an LRU bounded by a total number
+    of triples (CV_TENANT_MAX_TRIPLES); stores serving in-flight requests are
+    reference-counted and never evicted.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from pyscript.metrics import REGISTRY
+from pyscript.store import DATABASE_DIR, profileStore, use_store
+
+TENANT_DIR = os.path.join(DATABASE_DIR, "tenants")
+TENANT_PREFIX = "/t/"
+TENANT_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+# source files looked for in a tenant directory, in order (see store.build_partitions)
+TENANT_SOURCES = ("resume.ttl", "resume.nt")
+
+TENANT_LOAD_SECONDS = REGISTRY.histogram("cv_tenant_load_seconds", "Time to load a tenant's store on first use.")
+TENANT_EVICTIONS = REGISTRY.counter("cv_tenant_evictions_total", "Tenant stores dropped from the LRU.")
+TENANT_REQUESTS = REGISTRY.counter("cv_tenant_requests_total", "Tenant requests by store state.", ["result"])
+
+
+class tenantEntry:
+    """ this class holds a tenant's store and the number of requests using it"""
+
+    __slots__ = ("name", "store", "refs", "triples", "version", "ready", "error")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.store = None
+        self.refs = 0
+        self.triples = 0
+        self.version = None         # store.version when triples was counted
+        self.ready = threading.Event()
+        self.error = None
+
+
+class tenantRegistry:
+    """ this class loads tenant stores on demand and keeps them in an LRU bounded by their triples"""
+
+    def __init__(self, root: str = TENANT_DIR, max_triples: int = 2_000_000,
+                 store_factory: Callable[..., profileStore] = profileStore):
+        """
+        Args:
+            root: Directory holding one subdirectory per tenant.
+            max_triples: Triples the loaded stores may hold in total before the
+                least recently used idle ones are evicted.
+            store_factory: Called with partition_dir and source_file to load a store.
+        """
+        self.root = root
+        self.max_triples = max_triples
+        self.store_factory = store_factory
+        self.lock = threading.Lock()
+        self.loaded = OrderedDict()     # tenant -> tenantEntry, least recently used first
+        self.total_triples = 0
+        self.stats = {"hits": 0, "loads": 0, "evictions": 0}
+
+    def paths(self, tenant: str):
+        """
+        Returns (partition directory, source file) of a tenant.
+
+        Raises:
+            KeyError: the name is not a valid tenant name or has no data.
+        """
+        if not TENANT_NAME.match(tenant):
+            raise KeyError(tenant)
+        tenant_dir = os.path.join(self.root, tenant)
+        partition_dir = os.path.join(tenant_dir, "partitions")
+        sources = [os.path.join(tenant_dir, name) for name in TENANT_SOURCES
+                   if os.path.exists(os.path.join(tenant_dir, name))]
+        if not sources and not os.path.isdir(partition_dir):
+            raise KeyError(tenant)
+        return partition_dir, sources[0] if sources else os.path.join(tenant_dir, TENANT_SOURCES[0])
+
+    def acquire(self, tenant: str) -> profileStore:
+        """
+        Returns the store of a tenant, loading it if needed, and counts one
+        more request using it; every acquire must be paired with release().
+
+        Raises:
+            KeyError: unknown tenant.
+        """
+        with self.lock:
+            entry = self.loaded.get(tenant)
+            loader = entry is None
+            if loader:
+                entry = self.loaded[tenant] = tenantEntry(tenant)
+            else:
+                self.loaded.move_to_end(tenant)
+                self.stats["hits"] += 1
+            entry.refs += 1
+
+        if loader:
+            # concurrent requests for the same tenant wait for this load instead of loading it again
+            try:
+                partition_dir, source_file = self.paths(tenant)
+                with TENANT_LOAD_SECONDS.time():
+                    store = self.store_factory(partition_dir=partition_dir, source_file=source_file)
+            except BaseException as e:
+                with self.lock:
+                    del self.loaded[tenant]
+                entry.error = e
+                entry.ready.set()
+                raise
+            with self.lock:
+                entry.store = store
+                entry.triples, entry.version = len(store), store.version
+                self.total_triples += entry.triples
+                self.stats["loads"] += 1
+                self.evict()
+            entry.ready.set()
+        else:
+            entry.ready.wait()
+            if entry.error is not None:
+                raise entry.error
+
+        TENANT_REQUESTS.inc(result="load" if loader else "hit")
+        return entry.store
+
+    def release(self, tenant: str):
+        """Ends one request on a tenant's store, then evicts idle stores while over budget."""
+        with self.lock:
+            entry = self.loaded.get(tenant)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs == 0 and entry.store is not None and entry.store.version != entry.version:
+                # writes grew the store; recount it once the last request is done
+                triples = len(entry.store)
+                self.total_triples += triples - entry.triples
+                entry.triples, entry.version = triples, entry.store.version
+            self.evict()
+
+    def evict(self):
+        """Drops the least recently used idle stores until the loaded ones fit the budget (lock held)."""
+        for tenant in list(self.loaded):
+            if self.total_triples <= self.max_triples:
+                return
+            entry = self.loaded[tenant]
+            if entry.refs == 0 and entry.store is not None:
+                del self.loaded[tenant]
+                self.total_triples -= entry.triples
+                self.stats["evictions"] += 1
+                TENANT_EVICTIONS.inc()
+
+    def __len__(self):
+        return len(self.loaded)
+
+
+class tenantMiddleware:
+    """ this class serves /t/<tenant>/... (or <tenant>.<domain>) requests from the tenant's store"""
+
+    def __init__(self, wsgi_app, registry: tenantRegistry, domain: Optional[str] = None):
+        """
+        Args:
+            wsgi_app: The Flask WSGI application.
+            registry: The tenant stores.
+            domain: Base domain for host routing (e.g. 'cv.example.org'); prefix routing only when None.
+        """
+        self.wsgi_app = wsgi_app
+        self.registry = registry
+        self.domain = domain.lower().lstrip(".") if domain else None
+
+    def route(self, environ) -> Optional[str]:
+        """Returns the tenant of a request, moving a /t/<tenant> prefix into SCRIPT_NAME."""
+        path = environ.get("PATH_INFO", "")
+        if path.startswith(TENANT_PREFIX):
+            tenant, _, rest = path[len(TENANT_PREFIX):].partition("/")
+            environ["SCRIPT_NAME"] = environ.get("SCRIPT_NAME", "") + TENANT_PREFIX + tenant
+            environ["PATH_INFO"] = "/" + rest
+            return tenant
+        if self.domain:
+            host = environ.get("HTTP_HOST", environ.get("SERVER_NAME", "")).split(":")[0].lower()
+            if host.endswith("." + self.domain):
+                return host[:-len(self.domain) - 1]
+        return None
+
+    def __call__(self, environ, start_response):
+        tenant = self.route(environ)
+        if tenant is None or environ["PATH_INFO"].startswith("/static/"):
+            return self.wsgi_app(environ, start_response)
+
+        try:
+            store = self.registry.acquire(tenant)
+        except KeyError:
+            body = json.dumps({"error": f"Unknown tenant '{tenant}'"}).encode("utf-8")
+            start_response("404 NOT FOUND", [("Content-Type", "application/json"),
+                                             ("Content-Length", str(len(body)))])
+            return [body]
+
+        environ["cv.tenant"] = tenant
+        try:
+            with use_store(store):
+                response = self.wsgi_app(environ, start_response)
+        except BaseException:
+            self.registry.release(tenant)
+            raise
+        # a streamed body (e.g. /export) keeps the store until the server closes it
+        return releasingIterator(response, lambda: self.registry.release(tenant))
+
+
+class releasingIterator:
+    """ this class passes a WSGI response through and calls release once when the server closes it"""
+
+    def __init__(self, response, release: Callable[[], None]):
+        self.response = response
+        self.release = release
+
+    def __iter__(self):
+        return iter(self.response)
+
+    def close(self):
+        try:
+            if hasattr(self.response, "close"):
+                self.response.close()
+        finally:
+            release, self.release = self.release, None
+            if release is not None:
+                release()
+
+
+def tenant_registry() -> tenantRegistry:
+    """Builds the registry from CV_TENANT_DIR and CV_TENANT_MAX_TRIPLES."""
+    return tenantRegistry(root=os.environ.get("CV_TENANT_DIR", TENANT_DIR),
+                          max_triples=int(os.environ.get("CV_TENANT_MAX_TRIPLES", "2000000")))
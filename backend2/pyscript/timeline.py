@@ -0,0 +1,71 @@
+"""
+Date: 2026-10-19
+Description: Presorted per-person timelines for the dated sections (Education,
+    WorkExperience, Certificate). A timeline lists the section's items newest
+    first, in the order of the former `ORDER BY ASC(BOUND(?endDate))
+    DESC(?endDate)`: ongoing items (no end date) first, then by end date
+    descending. The store builds them when a partition is loaded or written,
+    so these sections are served in order without sorting per request, and
+    the latest N items can be queried on their own.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from rdflib import Graph, Namespace, URIRef
+
+CV = Namespace("URN://cv.resume/")
+
+# section key -> (person predicate linking the items, item variable of the section query)
+TIMELINE_SECTIONS = {
+    "Education": (CV.hasEducation, "education"),
+    "WorkExperience": (CV.hasExperience, "experience"),
+    "Certificate": (CV.hasAchievement, "achievement"),
+}
+
+
+def latest(graph: Graph, item: URIRef, predicate: URIRef) -> Optional[str]:
+    """Returns the greatest lexical value of a date property of item, or None."""
+    values = [str(value) for value in graph.objects(item, predicate)]
+    return max(values) if values else None
+
+
+def timeline_order(graph: Graph, items: Iterable[URIRef]) -> List[str]:
+    """
+    Orders items like `ORDER BY ASC(BOUND(?endDate)) DESC(?endDate)`.
+
+    Dates are compared on their lexical (ISO 8601) form, which orders the
+    xsd:dateTime values of resume.ttl and the plain dates written by /record
+    chronologically. Ties, which SPARQL leaves in evaluation order, are broken
+    by start date (newest first), then by URI.
+
+    Returns:
+        The item URIs as strings, newest first.
+    """
+    ongoing, ended = [], []
+    for item in set(items):
+        end = latest(graph, item, CV.endDate)
+        key = (end or "", latest(graph, item, CV.startDate) or "", str(item))
+        (ended if end is not None else ongoing).append(key)
+    ongoing.sort(reverse=True)
+    ended.sort(reverse=True)
+    return [key[2] for key in ongoing + ended]
+
+
+def build_timelines(graph: Graph, person: URIRef) -> Dict[str, List[str]]:
+    """Returns {section key: ordered item URIs} for one person's partition."""
+    return {section: timeline_order(graph, graph.objects(person, predicate))
+            for section, (predicate, _) in TIMELINE_SECTIONS.items()}
+
+
+def values_clause(section: str, items: Optional[List[str]]) -> str:
+    """
+    Returns a SPARQL VALUES block restricting a section query to items, or an
+    empty string (no restriction) when items is None.
+    """
+    if items is None:
+        return ""
+    if not items:
+        # rdflib rejects an empty VALUES block and ignores a constant FILTER(false)
+        return "FILTER(1 = 0)"
+    variable = TIMELINE_SECTIONS[section][1]
+    return f"VALUES ?{variable} {{ {' '.join(f'<{item}>' for item in items)} }}"
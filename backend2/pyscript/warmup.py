@@ -0,0 +1,201 @@
+"""
+Date: 2026-10-19
+Description: This module contains the profileCache class which keeps the
+    precomputed JSON of every profile. It is warmed in the background at
+    startup and after each write, so visitors read precomputed results
+    instead of paying the cold cost of all section queries. Concurrent
+    misses of one profile at one store stamp share a single computation.
+"""
+
+import contextvars
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pyscript.store import get_store
+from pyscript.metrics import REGISTRY
+
+CACHE_REQUESTS = REGISTRY.counter("cv_profile_cache_requests_total", "Profile cache lookups by result.", ["result"])
+WARMUP_SECONDS = REGISTRY.histogram("cv_warmup_seconds", "Duration of a profile warm-up run.",
+                                    buckets=(0.01, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900))
+WARMUP_PROFILES = REGISTRY.counter("cv_warmup_profiles_total", "Profiles computed by warm-up runs.")
+COALESCED = REGISTRY.counter("cv_profile_coalesced_total", "Profile computations joined instead of run again.")
+
+
+class profileCache:
+    """ this class caches the computed sections of each profile, keyed by the store's stamp"""
+
+    def __init__(self, compute: Callable[[str], Dict[str, Any]], store_getter=get_store,
+                 max_workers: int = 2, top_n: Optional[int] = None, coalesce: bool = True):
+        """
+        Args:
+            compute: Function computing the sections of one profile by name.
+            store_getter: Function returning the store the profiles live in.
+            max_workers: Number of profiles computed concurrently while warming.
+            top_n: Warm only the N most requested profiles (all profiles when None).
+            coalesce: Let concurrent misses of a profile wait for the computation already running.
+        """
+        self.compute = compute
+        self.store_getter = store_getter
+        self.max_workers = max_workers
+        self.top_n = top_n
+        self.coalesce = coalesce
+        self.entries = {}           # profile name -> (store stamp, sections)
+        self.inflight = {}          # (profile name, store stamp) -> Future of the running computation
+        self.requests = Counter()   # profile name -> number of requests served
+        self.lock = threading.Lock()
+        self.warm_lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "computed": 0,
+            "coalesced": 0,
+            "warmups": 0,
+            "warmed_profiles": 0,
+            "last_warmup_seconds": 0.0,
+        }
+
+    def peek(self, name: str, join: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached sections of a profile if they are still fresh, without computing.
+
+        Args:
+            name: The profile name.
+            join: Also wait for a computation of the fresh sections already running, if any.
+        """
+        stamp = self.store_getter().stamp(name)
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is not None and entry[0] == stamp:
+                self.requests[name] += 1
+                self.stats["hits"] += 1
+                CACHE_REQUESTS.inc(result="hit")
+                return entry[1]
+            running = self.inflight.get((name, stamp)) if join and self.coalesce else None
+            if running is not None:
+                self.stats["coalesced"] += 1
+        if running is None:
+            return None
+        COALESCED.inc()
+        return running.result()
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """
+        Returns the sections of a profile, computing and caching them on a miss.
+        Raises KeyError for a name the store does not know, without counting it.
+        """
+        cached = self.peek(name)
+        if cached is not None:
+            return cached
+        if self.store_getter().find_person(name) is None:
+            raise KeyError(name)
+
+        with self.lock:
+            self.requests[name] += 1
+            self.stats["misses"] += 1
+        CACHE_REQUESTS.inc(result="miss")
+        return self.refresh(name)
+
+    def refresh(self, name: str) -> Dict[str, Any]:
+        """
+        Computes the sections of a profile and stores them in the cache. A
+        caller finding the same profile and stamp already being computed
+        (a burst on a shared link, or the warm-up) waits for that result.
+        """
+        # read the stamp first so data written meanwhile is never cached as fresh
+        stamp = self.store_getter().stamp(name)
+        if stamp is None:
+            raise KeyError(name)
+        key = (name, stamp)
+        with self.lock:
+            running = self.inflight.get(key) if self.coalesce else None
+            if running is None:
+                running = self.inflight[key] = Future()
+                leader = True
+                self.stats["computed"] += 1
+            else:
+                leader = False
+                self.stats["coalesced"] += 1
+        if not leader:
+            COALESCED.inc()
+            return running.result()
+
+        try:
+            data = self.compute(name)
+        except BaseException as e:
+            self.finish(key, running)
+            # the waiting callers get the same error
+            running.set_exception(e)
+            raise
+        # cached and no longer in flight at once, so no caller in between computes it again
+        self.finish(key, running, (stamp, data))
+        running.set_result(data)
+        return data
+
+    def finish(self, key, running: Future, entry=None):
+        """Ends the in-flight computation of key, caching entry ((stamp, sections)) when given."""
+        with self.lock:
+            if entry is not None:
+                self.entries[key[0]] = entry
+            if self.inflight.get(key) is running:
+                del self.inflight[key]
+
+    def stale_names(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Lists the profiles needing a (re)computation, most requested first.
+
+        Args:
+            names: Candidate profiles; every profile of the store when None.
+        """
+        store = self.store_getter()
+        if names is None:
+            names = store.name_list()
+        with self.lock:
+            stale = [name for name in dict.fromkeys(names) if store.find_person(name) is not None
+                     and (name not in self.entries or self.entries[name][0] != store.stamp(name))]
+            # sorted() is stable, so unrequested profiles keep the store's order
+            stale = sorted(stale, key=lambda name: -self.requests[name])
+        if self.top_n is not None:
+            stale = stale[:self.top_n]
+        return stale
+
+    def warm(self, names: Optional[Iterable[str]] = None) -> int:
+        """
+        Precomputes every stale profile with bounded concurrency.
+
+        Returns:
+            The number of profiles computed.
+        """
+        with self.warm_lock:
+            start = time.perf_counter()
+            stale = self.stale_names(names)
+            warmed = 0
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                # each task runs in a copy of this context, so it reads the same (tenant's) store
+                futures = [(name, pool.submit(contextvars.copy_context().run, self.refresh, name)) for name in stale]
+                for name, future in futures:
+                    try:
+                        future.result()
+                        warmed += 1
+                    except Exception as e:
+                        print(f"Warm-up failed for profile '{name}': {e}")
+
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.stats["warmups"] += 1
+                self.stats["warmed_profiles"] += warmed
+                self.stats["last_warmup_seconds"] = elapsed
+            WARMUP_SECONDS.observe(elapsed)
+            WARMUP_PROFILES.inc(warmed)
+            print(f"Warm-up finished: {warmed} profile(s) in {elapsed:.3f}s.")
+            return warmed
+
+    def warm_async(self, names: Optional[Iterable[str]] = None) -> threading.Thread:
+        """Runs warm() in a daemon thread and returns the thread."""
+        names = list(names) if names is not None else None
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(self.warm, names),
+                                  name="profile-warmup", daemon=True)
+        thread.start()
+        return thread
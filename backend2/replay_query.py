@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Replays a query from the slow-query log against a Turtle file for offline tuning.
+
+The query text is taken from the log entry; with --query the text of the
+current rdfQueries template is used instead (formatted with the logged
+bindings), so an edited query can be compared against the logged one.
+
+Run: python backend2/replay_query.py <slow_queries.jsonl> <data.ttl> [--entry N] [--repeat K]
+         [--query] [--plan] [--profile [OUT.prof]] [--no-inference]
+"""
+
+import argparse
+import cProfile
+import json
+import pstats
+import statistics
+import time
+
+from rdflib import Graph
+from rdflib.plugins.sparql import prepareQuery
+
+from pyscript.inference import materialize
+from pyscript.profiler import format_plan
+from pyscript.rdfquery import rdfQueries as asker
+
+
+def read_entry(log_path: str, index: int) -> dict:
+    """Returns one entry of a JSON-lines slow-query log (negative indexes count from the end)."""
+    with open(log_path, encoding="utf-8") as log:
+        entries = [json.loads(line) for line in log if line.strip()]
+    if not entries:
+        raise SystemExit(f"No entries in '{log_path}'.")
+    return entries[index]
+
+
+def load_graph(ttl_path: str, inference: bool = True) -> Graph:
+    """Parses the Turtle file and adds the materialized inferences the served queries rely on."""
+    graph = Graph()
+    graph.parse(ttl_path, format="turtle")
+    if inference:
+        graph += materialize(graph, graph)
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a logged SPARQL query against a Turtle file.")
+    parser.add_argument("log", help="slow-query log (JSON lines)")
+    parser.add_argument("ttl", help="Turtle file to run the query against")
+    parser.add_argument("--entry", type=int, default=-1, help="log entry to replay (default: the last one)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs")
+    parser.add_argument("--query", action="store_true", help="use the current rdfQueries template instead of the logged text")
+    parser.add_argument("--plan", action="store_true", help="print the algebra plan")
+    parser.add_argument("--profile", nargs="?", const="-", help="run under cProfile; write a .prof file if a path is given")
+    parser.add_argument("--no-inference", action="store_true", help="do not add the materialized skill/social edges")
+    args = parser.parse_args()
+
+    entry = read_entry(args.log, args.entry)
+    if args.query:
+        query_text = "".join([asker.get_prefix(), getattr(asker, entry["query"])()]).format(**entry["bindings"])
+    else:
+        query_text = entry["text"]
+
+    start = time.perf_counter()
+    graph = load_graph(args.ttl, inference=not args.no_inference)
+    print(f"Loaded '{args.ttl}': {len(graph)} triples in {time.perf_counter() - start:.3f}s.")
+    print(f"Replaying {entry['query']} {entry['bindings']} (logged {entry['elapsed_ms']} ms, {entry['rows']} rows)")
+
+    prepared = prepareQuery(query_text)
+    if args.plan:
+        print(format_plan(prepared.algebra))
+
+    timings = []
+    rows = 0
+    profile = cProfile.Profile() if args.profile else None
+    for _ in range(max(args.repeat, 1)):
+        start = time.perf_counter()
+        if profile is not None:
+            rows = len(profile.runcall(lambda: list(graph.query(prepared))))
+        else:
+            rows = len(list(graph.query(prepared)))
+        timings.append((time.perf_counter() - start) * 1000)
+
+    print(f"{rows} rows; min {min(timings):.3f} ms, median {statistics.median(timings):.3f} ms, "
+          f"max {max(timings):.3f} ms over {len(timings)} run(s) (excluding parse).")
+
+    if profile is not None:
+        if args.profile == "-":
+            pstats.Stats(profile).sort_stats("cumulative").print_stats(30)
+        else:
+            profile.dump_stats(args.profile)
+            print(f"cProfile statistics written to '{args.profile}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,17 @@ import { createSkillHTML, createProjectHTML, createProjectSelectHTML } from './j
 // Global variable definition is now a function call
 const CV_DATA = getAllData();
 
+// Path the app is mounted under: '' or '/t/<tenant>' when a tenant is served by URL prefix
+const API_ROOT = document.body.dataset.root || '';
+
+// Store version the page shows and the profile on screen (no epoch on a static export);
+// /changes lists the sections written since that version
+const FEED = {
+    epoch: document.body.dataset.epoch,
+    version: Number(document.body.dataset.version || 0),
+    profile: document.body.dataset.profile
+};
+
 // Global DOM references (defined here for scope)
 const profileSelect = document.getElementById('profile-select');
 const createCV = document.getElementById('createCVButton');
@@ -56,7 +67,12 @@ function getAllData() {
  */
 function renderAllData() {
     
-    getProfiles(CV_DATA.NameList)
+    if (document.getElementById('static-profiles')) {
+        // An exported page leaves NameList out: the names are the keys of the profile index
+        staticProfileIndex().then(index => getProfiles(Object.keys(index)));
+    } else {
+        getProfiles(CV_DATA.NameList)
+    }
     getCategories(CV_DATA.Category)
     getUserDetails(CV_DATA.Details, CV_DATA.Name)
     getSocial(CV_DATA.Social)
@@ -518,6 +534,29 @@ const attachFilterListeners = function() {
     }
 }
 
+// A busy server answers 503 with Retry-After; wait that long and ask again (a few times)
+async function fetchAdmitted(url, options, attempts = 3) {
+    let response = await fetch(url, options);
+    while (response.status === 503 && --attempts > 0) {
+        const seconds = Math.min(parseFloat(response.headers.get('Retry-After')) || 1, 10);
+        await new Promise(resolve => setTimeout(resolve, seconds * 1000));
+        response = await fetch(url, options);
+    }
+    return response;
+}
+
+/**
+ * Reads the index of the exported profile files of a pre-rendered static site (fetched once).
+ */
+let profileIndexRequest = null;
+function staticProfileIndex() {
+    if (!profileIndexRequest) {
+        const staticProfiles = document.getElementById('static-profiles');
+        profileIndexRequest = fetch(JSON.parse(staticProfiles.textContent)).then(response => response.json());
+    }
+    return profileIndexRequest;
+}
+
 async function fetchFilteredCV() {
     // 1. Get current filter selections
     const user_namer = profileSelect.value;
@@ -526,14 +565,23 @@ async function fetchFilteredCV() {
         profile_user: user_namer        
     };
 
+    // A pre-rendered static site points to an index of the exported profile files
+    const staticProfiles = document.getElementById('static-profiles');
+
     // Display a loading message while fetching data
     try {
-        // 2. Make the API call to your Flask backend
-        const response = await fetch('/', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(requestBody)
-        });
+        // 2. Make the API call to your Flask backend (or read the exported file)
+        let response;
+        if (staticProfiles) {
+            const profileIndex = await staticProfileIndex();
+            response = await fetch(profileIndex[user_namer]);
+        } else {
+            response = await fetchAdmitted(`${API_ROOT}/`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(requestBody)
+            });
+        }
 
         if (!response.ok) {
             throw new Error(`Server responded with status: ${response.status}`);
@@ -553,6 +601,7 @@ async function fetchFilteredCV() {
         getCertification(filteredCV_JSON.Certificate);
         getProjectClass(filteredCV_JSON.ProjectClass);
         getProject(filteredCV_JSON.Project);
+        FEED.profile = user_namer;
         
 
     } catch (error) {
@@ -562,6 +611,85 @@ async function fetchFilteredCV() {
     }
 }
 
+// section key -> renders it from a POST / answer
+const SECTION_RENDERERS = {
+    NameList: data => { getProfiles(data.NameList); profileSelect.value = FEED.profile; },
+    Category: data => getCategories(data.Category),
+    Details: data => getUserDetails(data.Details, data.Name),
+    Social: data => getSocial(data.Social),
+    Service: data => getService(data.Service),
+    Education: data => getEducation(data.Education),
+    WorkExperience: data => getWorkExperience(data.WorkExperience),
+    Skills: data => getSkill(data.Skills, data.SkillType),
+    Certificate: data => getCertification(data.Certificate),
+    ProjectClass: data => getProjectClass(data.ProjectClass),
+    Project: data => getProject(data.Project)
+};
+// sections rendered together, so fetched together
+const SECTION_GROUPS = {
+    Name: ['Details', 'Name'], Details: ['Details', 'Name'],
+    Skills: ['Skills', 'SkillType'], SkillType: ['Skills', 'SkillType']
+};
+
+let syncing = Promise.resolve();
+
+// Re-fetches only the sections of the profile on screen changed since FEED.version (one sync at a time)
+function syncChanges() {
+    if (!FEED.epoch) {
+        return syncing;
+    }
+    syncing = syncing.then(fetchChanges).catch(error => console.error("Error syncing changes:", error));
+    return syncing;
+}
+
+async function fetchChanges() {
+    const response = await fetch(`${API_ROOT}/changes?since=${FEED.version}&epoch=${FEED.epoch}`);
+    if (!response.ok) {
+        throw new Error(`Server responded with status: ${response.status}`);
+    }
+    const changes = await response.json();
+
+    // '*' as a profile means every profile, as a section every section
+    let changed = [...(changes.profiles['*'] || []), ...(changes.profiles[FEED.profile] || [])];
+    if (changes.reset || changed.includes('*')) {
+        changed = Object.keys(SECTION_RENDERERS);
+    }
+    if (changed.length > 0) {
+        const sections = new Set();
+        changed.forEach(key => (SECTION_GROUPS[key] || [key]).forEach(section => sections.add(section)));
+
+        const sectionResponse = await fetchAdmitted(`${API_ROOT}/`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ profile_user: FEED.profile, sections: [...sections] })
+        });
+        if (!sectionResponse.ok) {
+            throw new Error(`Server responded with status: ${sectionResponse.status}`);
+        }
+        const sectionData = await sectionResponse.json();
+        Object.keys(SECTION_RENDERERS).forEach(key => {
+            if (key in sectionData) {
+                SECTION_RENDERERS[key](sectionData);
+            }
+        });
+    }
+    // only moved on once the changes are on screen, so a failed sync is retried
+    FEED.epoch = changes.epoch;
+    FEED.version = changes.version;
+}
+
+// Follow the writes of other users: the event stream when the server offers it, else check on return to the tab
+if (FEED.epoch && document.body.dataset.stream && window.EventSource) {
+    const stream = new EventSource(`${API_ROOT}/changes/stream?since=${FEED.version}&epoch=${FEED.epoch}`);
+    stream.addEventListener('changes', syncChanges);
+} else if (FEED.epoch) {
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'visible') {
+            syncChanges();
+        }
+    });
+}
+
 // Function to apply category filter based on checkbox selections
 function applyCategoryFilter() {
     
@@ -1164,7 +1292,7 @@ async function updateTTLFile(cvFileToSend) {
 
     try {
         // 2. Make the API call to your Flask backend
-        const response = await fetch('/record', {
+        const response = await fetch(`${API_ROOT}/record`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify(cvFileToSend)
@@ -1182,6 +1310,7 @@ async function updateTTLFile(cvFileToSend) {
             formCVBtn.setAttribute("disabled", ""); // Disable button after successful save
 
             showMessage('Success', 'Your CV data has been saved successfully!', 'green');
+            syncChanges();
         } else {
             showMessage('Error', 'There was an error saving your CV data. Please try again later.', 'red');
         }
@@ -0,0 +1,71 @@
+"""
+Date: 2026-10-19
+Description: Shared fixtures of the tests: a store built from the shipped
+    resume.ttl and a store of generated profiles, each in a temporary
+    directory so the live partitions are never touched.
+
+Run from backend2/:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("CV_WARMUP", "0")
+
+from benchmarks.generator import generate_dataset, generatorParams
+from benchmarks.scenarios import sample_names
+from pyscript.store import SOURCE_FILE, profileStore
+
+
+@pytest.fixture(scope="session")
+def shipped_store(tmp_path_factory):
+    """The store of the shipped resume.ttl."""
+    return profileStore(partition_dir=str(tmp_path_factory.mktemp("shipped") / "partitions"), source_file=SOURCE_FILE)
+
+
+@pytest.fixture(scope="session")
+def generated_store(tmp_path_factory):
+    """A store of 30 generated profiles."""
+    partition_dir = str(tmp_path_factory.mktemp("generated"))
+    generate_dataset(partition_dir, generatorParams(persons=30, seed=7))
+    return profileStore(partition_dir=partition_dir)
+
+
+@pytest.fixture(params=["shipped", "generated"])
+def profiles(request, shipped_store, generated_store):
+    """(store, names of the profiles to check) for each dataset."""
+    if request.param == "shipped":
+        return shipped_store, shipped_store.name_list()
+    return generated_store, sample_names(len(generated_store.entries), 10)
+
+
+@pytest.fixture(scope="session")
+def app_module(shipped_store, tmp_path_factory):
+    """The app module, serving the shipped store and the tenants of a temporary directory."""
+    import pyscript.store as store_module
+    store_module._default_store = shipped_store
+    import app
+    app.TENANTS.root = str(tmp_path_factory.mktemp("tenants"))
+    return app
+
+
+@pytest.fixture
+def record(app_module):
+    """Returns a function posting a CV payload to a store as /record does."""
+    def post(store, payload, mode="upsert"):
+        assert app_module.merge_and_save(store, app_module.process_cv_data(payload), mode) == "Yes"
+    return post
+
+
+@pytest.fixture
+def comparable():
+    """Returns a function turning section records into dicts with sorted value lists, ordered by main."""
+    def convert(items) -> list:
+        rows = [{key: sorted(value) if isinstance(value, list) else value for key, value in item.as_dict().items()}
+                for item in items]
+        return sorted(rows, key=lambda row: row["main"])
+    return convert
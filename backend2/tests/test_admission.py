@@ -0,0 +1,157 @@
+"""
+Date: 2026-10-19
+Description: Under a burst the admission gate runs `limit` requests, queues
+    the next ones first come first served and turns the rest away with 503;
+    concurrent misses of one profile share a single computation.
+"""
+
+import threading
+import time
+
+import pytest
+
+from pyscript.admission import admissionGate
+from pyscript.warmup import profileCache
+
+
+def wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_no_limit_admits_everything():
+    gate = admissionGate(limit=0)
+    assert [gate.acquire() for _ in range(100)] == ["unlimited"] * 100
+    assert len(gate) == 0
+
+
+def test_full_queue_rejects_at_once():
+    gate = admissionGate(limit=1, queue=0, timeout=10)
+    assert gate.acquire() == "admitted"
+    start = time.perf_counter()
+    assert gate.acquire() == "queue_full"
+    assert time.perf_counter() - start < 1
+    assert gate.stats["rejected"] == 1
+
+
+def test_queued_request_times_out():
+    gate = admissionGate(limit=1, queue=1, timeout=0.05)
+    assert gate.acquire() == "admitted"
+    assert gate.acquire() == "timeout"
+    assert not gate.waiting and gate.stats["timed_out"] == 1
+    gate.release()
+    assert gate.acquire() == "admitted"
+
+
+def test_released_slot_goes_to_the_oldest_queued_request():
+    gate = admissionGate(limit=1, queue=2, timeout=10)
+    assert gate.acquire() == "admitted"
+    order = []
+
+    def queued(label):
+        assert gate.acquire() == "admitted"
+        order.append(label)
+
+    threads = []
+    for label in ("first", "second"):
+        threads.append(threading.Thread(target=queued, args=(label,)))
+        threads[-1].start()
+        wait_until(lambda: len(gate.waiting) == len(threads))
+
+    gate.release()
+    wait_until(lambda: order == ["first"])
+    # the slot was handed over, not freed: a newcomer still has to queue
+    assert len(gate) == 1 and len(gate.waiting) == 1
+    gate.release()
+    for thread in threads:
+        thread.join(5)
+    assert order == ["first", "second"]
+
+
+def test_app_answers_503_when_busy(app_module, monkeypatch):
+    gate = admissionGate(limit=1, queue=0)
+    monkeypatch.setattr(app_module, "ADMISSION_GATE", gate)
+    monkeypatch.setattr(app_module, "RETRY_AFTER", "3")
+    client = app_module.app.test_client()
+
+    assert gate.acquire() == "admitted"
+    busy = client.get("/")
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "3"
+    assert busy.get_json() == {"error": "Server busy, please retry shortly"}
+    # endpoints that do not compute profiles are not gated
+    assert client.get("/metrics").status_code == 200
+
+    gate.release()
+    assert client.get("/").status_code == 200
+    assert len(gate) == 0
+
+
+class fakeStore:
+    """ this class stands for a store holding one profile at a fixed stamp"""
+
+    def stamp(self, name):
+        return 1 if name == "Ann" else None
+
+    def find_person(self, name):
+        return {"id": name} if name == "Ann" else None
+
+
+def burst(cache, clients: int):
+    """Runs clients concurrent cache.get('Ann'); returns their results or errors."""
+    results = [None] * clients
+
+    def client(index):
+        try:
+            results[index] = cache.get("Ann")
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_misses_share_one_computation():
+    release, calls = threading.Event(), []
+
+    def compute(name):
+        calls.append(name)
+        release.wait(5)
+        return {"Name": name}
+
+    cache = profileCache(compute, store_getter=fakeStore)
+    threads, results = burst(cache, 8)
+    # one computation runs, the other misses join it
+    wait_until(lambda: cache.stats["coalesced"] == 7)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == ["Ann"]
+    assert all(result is results[0] for result in results) and results[0] == {"Name": "Ann"}
+    assert cache.stats["computed"] == 1 and not cache.inflight
+    assert cache.get("Ann") is results[0] and calls == ["Ann"]
+
+
+def test_waiting_misses_get_the_computations_error():
+    release = threading.Event()
+
+    def compute(name):
+        release.wait(5)
+        raise RuntimeError("query failed")
+
+    cache = profileCache(compute, store_getter=fakeStore)
+    threads, results = burst(cache, 4)
+    wait_until(lambda: cache.stats["coalesced"] == 3)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not cache.inflight and not cache.entries
+    with pytest.raises(KeyError):
+        cache.get("Bob")
@@ -0,0 +1,89 @@
+"""
+Date: 2026-10-19
+Description: The parallel N-Triples loader (pyscript/bulkload.py) must read
+    what rdflib writes: line separators other than "\n" inside literals,
+    escapes, and chunks cut anywhere in the file.
+"""
+
+import pytest
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import XSD
+
+from pyscript.bulkload import chunk_ranges, load_graph, parse_ntriples, to_term, unescape
+
+EX = "http://example.org/"
+
+
+def write_nt(path, graph: Graph) -> str:
+    graph.serialize(destination=str(path), format="nt", encoding="utf-8")
+    return str(path)
+
+
+def test_separators_inside_literals(tmp_path):
+    graph = Graph()
+    for index, text in enumerate(["line\u2028sep", "para\u2029sep", "vt\x0bff\x0c", "fs\x1cgs\x1drs\x1e", "nel\x85",
+                                  "multi\nline\r\n", 'quote " and \\ backslash', "tab\tend"]):
+        graph.add((URIRef(f"{EX}s{index}"), URIRef(f"{EX}p"), Literal(text)))
+    path = write_nt(tmp_path / "separators.nt", graph)
+    assert set(load_graph(path, workers=1)) == set(graph)
+
+
+def test_crlf_line_endings(tmp_path):
+    path = tmp_path / "crlf.nt"
+    path.write_bytes(b'<http://example.org/a> <http://example.org/p> "x" .\r\n'
+                     b'<http://example.org/a> <http://example.org/p> <http://example.org/b> .\r\n')
+    assert set(load_graph(str(path), workers=1)) == {
+        (URIRef(f"{EX}a"), URIRef(f"{EX}p"), Literal("x")),
+        (URIRef(f"{EX}a"), URIRef(f"{EX}p"), URIRef(f"{EX}b"))}
+
+
+def test_invalid_line_names_its_byte_offset(tmp_path):
+    path = tmp_path / "invalid.nt"
+    path.write_text('<http://example.org/a> <http://example.org/p> "x" .\nnot a triple\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="near byte 52"):
+        parse_ntriples(str(path), workers=1)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_chunks_cut_anywhere(tmp_path, workers):
+    graph = Graph()
+    for index in range(300):
+        graph.add((URIRef(f"{EX}s{index % 17}"), URIRef(f"{EX}p{index % 5}"), Literal(f"value {index}\u2028é")))
+    path = write_nt(tmp_path / "chunks.nt", graph)
+
+    ranges = chunk_ranges(path, chunk_bytes=100)
+    data = open(path, "rb").read()
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    assert all(data[start - 1:start] == b"\n" for start, _ in ranges[1:])
+
+    parsed = parse_ntriples(path, workers=workers, chunk_bytes=100)
+    assert len(parsed) == len(graph)
+    assert set(load_graph(path, workers=workers, chunk_bytes=100)) == set(graph)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("plain", "plain"),
+    (r"caf\u00e9", "café"),
+    (r"smile \U0001F600", "smile \U0001F600"),
+    (r'say \"hi\"', 'say "hi"'),
+    (r"back\\slash\\n", "back\\slash\\n"),
+    (r"tab\tnew\nline\rfeed\f", "tab\tnew\nline\rfeed\f"),
+    (r"unknown \q kept", r"unknown \q kept"),
+])
+def test_unescape(text, expected):
+    assert unescape(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("<http://example.org/a\\u0020b>", URIRef("http://example.org/a b")),
+    ("_:node1", BNode("node1")),
+    ('"plain"', Literal("plain")),
+    ('"chat"@fr-CA', Literal("chat", lang="fr-CA")),
+    ('"42"^^<http://www.w3.org/2001/XMLSchema#integer>', Literal("42", datatype=XSD.integer)),
+    ('"with \\"quotes\\" @en"', Literal('with "quotes" @en')),
+    ('"x"^^<http://example.org/t\\u0079pe>', Literal("x", datatype=URIRef("http://example.org/type"))),
+])
+def test_to_term(text, expected):
+    term = to_term(text)
+    assert term == expected and type(term) is type(expected)
@@ -0,0 +1,67 @@
+"""
+Date: 2026-10-19
+Description: The change feed lists the sections written after a version, and
+    tells a client to reload everything when it is too far behind or comes
+    from another epoch.
+"""
+
+import pytest
+
+from benchmarks.generator import sample_cv
+from benchmarks.scenarios import edited_cv
+from pyscript.changes import ALL, changeFeed
+from pyscript.store import SOURCE_FILE, profileStore, use_store
+
+
+def test_changes_since_a_version_are_merged():
+    feed = changeFeed()
+    feed.record(1, {"Ann": {"Skills"}})
+    feed.record(2, {"Ann": {"Details"}, "Bob": {"Project"}})
+    feed.record(3, {"Bob": {ALL}})
+
+    answer = feed.since(1, feed.epoch)
+    assert answer["version"] == 3 and not answer["reset"]
+    assert answer["profiles"] == {"Ann": ["Details"], "Bob": [ALL]}
+    assert feed.since(3, feed.epoch)["profiles"] == {}
+
+
+def test_client_too_far_behind_resets():
+    feed = changeFeed(keep=2)
+    for version in (1, 2, 3):
+        feed.record(version, {"Ann": {"Skills"}})
+    # versions 2 and 3 are kept: a client at 1 can still catch up, one at 0 cannot
+    assert not feed.since(1)["reset"]
+    answer = feed.since(0)
+    assert answer["reset"] and answer["profiles"] == {}
+    # a version the feed never reached (e.g. from before a restart)
+    assert feed.since(4)["reset"]
+
+
+def test_other_epoch_resets():
+    feed = changeFeed()
+    feed.record(1, {"Ann": {"Skills"}})
+    assert feed.since(1, feed.epoch)["reset"] is False
+    assert feed.since(1, "another-run")["reset"] is True
+    assert changeFeed().epoch != feed.epoch
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A store of the shipped resume.ttl, written by the tests."""
+    return profileStore(partition_dir=str(tmp_path / "partitions"), source_file=SOURCE_FILE)
+
+
+def test_record_reports_its_version_and_the_sections_it_changed(app_module, store):
+    client = app_module.app.test_client()
+    base = sample_cv(0)
+    with use_store(store):
+        created = client.post("/record", json=base).get_json()
+        assert created["status"] == "success" and created["message"] == "Graph merged successfully."
+        version = created["version"]
+
+        # revision 0 edits the person's aboutMe
+        edited = client.post("/record", json=edited_cv(base, 0)).get_json()
+        assert edited["version"] == version + 1
+        answer = client.get(f"/changes?since={version}&epoch={store.changes.epoch}").get_json()
+    assert answer == {"epoch": store.changes.epoch, "version": version + 1, "reset": False,
+                      "profiles": {"Writer0 Bench": ["Details"]}}
@@ -0,0 +1,88 @@
+"""
+Date: 2026-10-19
+Description: /export writes the store back in each format, answers Range and
+    If-Range requests with the matching slice of the stream, and gzips on request.
+"""
+
+import gzip
+
+import pytest
+from rdflib import Graph
+
+from pyscript.export import export_chunks, export_triples, snapshot
+
+# format key -> rdflib parser
+PARSERS = {"nt": "nt", "ttl": "turtle", "jsonld": "json-ld"}
+
+
+def union(graphs) -> set:
+    return {triple for graph in graphs for triple in graph}
+
+
+@pytest.mark.parametrize("fmt", PARSERS)
+def test_full_export_parses_back_to_the_store(generated_store, fmt):
+    graphs, _ = snapshot(generated_store)
+    parsed = Graph().parse(data=b"".join(export_chunks(graphs, fmt)), format=PARSERS[fmt])
+    assert set(parsed) == union(graphs)
+
+
+@pytest.mark.parametrize("fmt", PARSERS)
+def test_profile_export_parses_back_to_its_partition(generated_store, fmt):
+    pid = next(iter(generated_store.entries.values()))["id"]
+    graphs, _ = snapshot(generated_store, pid)
+    parsed = Graph().parse(data=b"".join(export_chunks(graphs, fmt)), format=PARSERS[fmt])
+    assert set(parsed) == set(generated_store.common) | set(generated_store.graphs[pid])
+
+
+def test_shared_nodes_are_written_once(generated_store):
+    graphs, _ = snapshot(generated_store)
+    lines = b"".join(export_chunks(graphs, "nt")).decode("utf-8").splitlines()
+    # the partitions hold copies of the nodes they share, so the store counts them more than once
+    assert len(generated_store) > len(union(graphs))
+    assert len(lines) == len(set(lines)) == len(union(graphs)) == export_triples(graphs)
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+def test_range_is_the_slice_of_the_full_stream(client):
+    full = client.get("/export?format=ttl")
+    body = full.get_data()
+    partial = client.get("/export?format=ttl", headers={"Range": "bytes=100-199"})
+    assert partial.status_code == 206
+    assert partial.headers["Content-Range"] == f"bytes 100-199/{len(body)}"
+    assert partial.get_data() == body[100:200]
+
+    resumed = client.get("/export?format=ttl", headers={"Range": "bytes=100-", "If-Range": full.headers["ETag"]})
+    assert resumed.status_code == 206
+    assert resumed.get_data() == body[100:]
+
+
+def test_stale_if_range_sends_the_whole_export(client):
+    body = client.get("/export").get_data()
+    response = client.get("/export", headers={"Range": "bytes=100-", "If-Range": '"stale"'})
+    assert response.status_code == 200
+    assert response.get_data() == body
+
+
+def test_unsatisfiable_range(client):
+    length = len(client.get("/export").get_data())
+    response = client.get("/export", headers={"Range": f"bytes={length}-"})
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{length}"
+
+
+@pytest.mark.parametrize("fmt", PARSERS)
+def test_gzip_output(client, fmt):
+    plain = client.get(f"/export?format={fmt}")
+    compressed = client.get(f"/export?format={fmt}", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+
+
+def test_unknown_profile_and_format(client):
+    assert client.get("/export/NoSuchProfile").status_code == 404
+    assert client.get("/export?format=xml").status_code == 400
@@ -0,0 +1,96 @@
+"""
+Date: 2026-10-19
+Description: The skill, skill-type and social sections read the materialized
+    subClassOf edges (pyscript/inference.py). These tests compare them, value
+    by value, with the former join queries (benchmarks.scenarios.LEGACY_QUERIES)
+    on the shipped and on generated profiles, and pin down where the two
+    deliberately differ: indirect subclasses and classes not typed owl:Class.
+"""
+
+import pytest
+from rdflib import Graph
+
+from benchmarks.scenarios import LEGACY_QUERIES
+from pyscript.grapher import graphData
+from pyscript.inference import CUSTOM as CV
+from pyscript.rdfquery import rdfQueries
+from pyscript.store import SOURCE_FILE, profileStore
+
+# section getter -> the rdfQueries method it runs
+GETTERS = {
+    "get_skill": "get_skill_query",
+    "get_skill_types": "get_skill_type",
+    "get_socials": "get_social_query",
+}
+
+
+def profile_data(store, name: str) -> graphData:
+    """Returns a graphData of one profile with its person URI resolved."""
+    graf = graphData(name, store=store)
+    graf.get_name()
+    graf.get_personDetails()
+    return graf
+
+
+def legacy(monkeypatch, query: str):
+    """Makes the getters run the legacy join text of query."""
+    text = LEGACY_QUERIES[query]
+
+    def template():
+        return text
+    template.__name__ = query
+    monkeypatch.setattr(rdfQueries, query, staticmethod(template))
+
+
+@pytest.mark.parametrize("getter, query", GETTERS.items())
+def test_sections_match_legacy_joins(profiles, monkeypatch, comparable, getter, query):
+    # on data without indirect subclasses both give the same records, value by value
+    store, names = profiles
+    current = {name: comparable(getattr(profile_data(store, name), getter)()) for name in names}
+    legacy(monkeypatch, query)
+    expected = {name: comparable(getattr(profile_data(store, name), getter)()) for name in names}
+    assert current == expected
+    assert any(current.values()), "the dataset should exercise the section"
+
+
+def test_skill_types_of_every_skill_are_listed(profiles):
+    store, names = profiles
+    for name in names:
+        graf = profile_data(store, name)
+        assert {skill.typename[0] for skill in graf.get_skill()} == \
+            {skill_type.main for skill_type in graf.get_skill_types()}
+
+
+EXTRA = """
+@prefix : <URN://cv.resume/> .
+@prefix foaf: <http://xmlns.com/foaf/0.1/> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+:QuantumSkill rdfs:subClassOf :DigitalSkill ; rdfs:label "Quantum Skill" .
+:Mastodon rdfs:subClassOf :Socials .
+
+:QuantumTester a foaf:Person ; rdfs:label "Quantum Tester" ;
+    foaf:firstName "Quantum" ; foaf:lastName "Tester" ;
+    :hasSkill :QS1 ; :hasSocial :QM1 .
+:QS1 a :QuantumSkill ; foaf:title "Qubits" ; foaf:status "Expert" ; :hasPercentage "90%" .
+:QM1 a :Mastodon ; :hasLink "https://mastodon.example/@quantum" .
+"""
+
+
+def test_indirect_and_untyped_classes(tmp_path):
+    # an indirect subclass of :Skills (via :DigitalSkill) and a social class not typed owl:Class
+    store = profileStore(partition_dir=str(tmp_path / "partitions"), source_file=SOURCE_FILE)
+    graph = Graph()
+    graph.parse(data=EXTRA, format="turtle")
+    store.add_graph(graph)
+    view = store.profile_view("Quantum Tester")
+
+    def rows(text: str) -> list:
+        return list(view.query(rdfQueries.get_prefix() + text.format(person=CV.QuantumTester)))
+
+    assert [str(row.typename) for row in rows(rdfQueries.get_skill_query())] == ["Quantum Skill"]
+    assert [str(row.skillLabel) for row in rows(rdfQueries.get_skill_type())] == ["Quantum Skill"]
+    assert [row.socialType for row in rows(rdfQueries.get_social_query())] == [CV.Mastodon]
+    # the former joins only saw direct subclasses, and skill types typed owl:Class
+    assert rows(LEGACY_QUERIES["get_skill_query"]) == []
+    assert rows(LEGACY_QUERIES["get_skill_type"]) == []
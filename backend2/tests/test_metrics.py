@@ -0,0 +1,37 @@
+"""
+Date: 2026-10-19
+Description: A histogram timer used as a decorator is one object shared by
+    every call; each call (and thread) must still be timed on its own.
+"""
+
+import threading
+import time
+
+from pyscript.metrics import metricHistogram
+
+
+def test_decorator_times_overlapping_calls_separately():
+    histogram = metricHistogram("test_call_seconds", "Test call time.", buckets=(0.2, 1.0))
+
+    @histogram.time()
+    def call(seconds):
+        time.sleep(seconds)
+
+    slow = threading.Thread(target=call, args=(0.5,))
+    slow.start()
+    time.sleep(0.1)
+    # starts and ends while the slow call runs
+    call(0.05)
+    slow.join()
+
+    # one observation per bucket: up to 0.2 s, up to 1 s, above
+    fast, slow, slower, elapsed_sum = histogram.values[()]
+    assert (fast, slow, slower) == (1, 1, 0)
+    assert 0.55 <= elapsed_sum < 0.9
+
+
+def test_context_manager_observes_the_block():
+    histogram = metricHistogram("test_block_seconds", "Test block time.", labels=("kind",), buckets=(0.01,))
+    with histogram.time(kind="fast"):
+        pass
+    assert histogram.values[("fast",)][:2] == [1, 0]
@@ -0,0 +1,140 @@
+"""
+Date: 2026-10-19
+Description: The inverted index behind /search (pyscript/search.py): tf-idf
+    ranking, mode=all/any, section filtering, and postings kept in step with
+    the partitions as they are re-indexed or removed.
+"""
+
+import math
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import DC, FOAF, RDF, RDFS
+
+from benchmarks.generator import sample_cv
+from benchmarks.scenarios import edited_cv
+from pyscript.search import CV, searchIndex, tokenize
+from pyscript.store import SOURCE_FILE, profileStore
+
+
+def person_graph(name: str, skills=(), experiences=(), projects=()):
+    """Returns (person, partition) with one item per skill label, (title, description, city) experience and project title."""
+    graph = Graph()
+    person = CV[name]
+    graph.add((person, RDF.type, FOAF.Person))
+    graph.add((person, RDFS.label, Literal(name)))
+    for index, label in enumerate(skills):
+        item = CV[f"{name}_skill{index}"]
+        graph.add((person, CV.hasSkill, item))
+        graph.add((item, RDFS.label, Literal(label)))
+    for index, (title, description, city) in enumerate(experiences):
+        item = CV[f"{name}_experience{index}"]
+        graph.add((person, CV.hasExperience, item))
+        graph.add((item, FOAF.title, Literal(title)))
+        graph.add((item, DC.description, Literal(description)))
+        graph.add((item, CV.locatedIn, CV[city]))
+    for index, title in enumerate(projects):
+        item = CV[f"{name}_project{index}"]
+        graph.add((person, CV.hasProject, item))
+        graph.add((item, FOAF.title, Literal(title)))
+    return person, graph
+
+
+PROFILES = {
+    "alice": dict(skills=["Python Programming"], experiences=[("Data Engineer", "Builds pipelines", "Berlin")]),
+    "bob": dict(skills=["Java"], experiences=[("Developer", "Python scripts for the team", "Paris")]),
+    "carol": dict(skills=["Cooking"], projects=["Garden Planner"]),
+}
+
+
+@pytest.fixture
+def index():
+    index = searchIndex()
+    for name, fields in PROFILES.items():
+        person, graph = person_graph(name, **fields)
+        index.add_partition(name, graph, person, name.title())
+    return index
+
+
+def test_tokenize():
+    assert tokenize("The Data_Analysis of C and R, 2024 in Berlin!") == ["data", "analysis", "2024", "berlin"]
+
+
+def test_tf_idf_ranking(index):
+    found = index.search("python")
+    assert found["query"] == ["python"] and found["total"] == 2
+    # a skill label weighs more than a description
+    assert [result["id"] for result in found["results"]] == ["alice", "bob"]
+    idf = math.log(1 + 3 / (1 + 2))
+    # weights above 1 are dampened: 1 + log(3) for a label
+    assert found["results"][0]["score"] == round((1.0 + math.log(3.0)) * idf, 4)
+    assert found["results"][1]["score"] == round(1.0 * idf, 4)
+
+    # a rarer token weighs more: both match one word, the one matching 'berlin' (1 profile) ranks first
+    assert [result["id"] for result in index.search("python berlin", match_all=False)["results"]] == ["alice", "bob"]
+    # both in one profile each: a skill label (bob) outweighs a city (alice, weight 2)
+    idf = math.log(1 + 3 / 2)
+    assert [(result["id"], result["score"]) for result in index.search("java berlin", match_all=False)["results"]] == [
+        ("bob", round((1.0 + math.log(3.0)) * idf, 4)), ("alice", round((1.0 + math.log(2.0)) * idf, 4))]
+
+
+def test_match_all_and_any(index):
+    assert index.search("java berlin")["total"] == 0
+    assert {result["id"] for result in index.search("java berlin", match_all=False)["results"]} == {"alice", "bob"}
+    assert [result["id"] for result in index.search("python berlin")["results"]] == ["alice"]
+    assert index.search("nothing matches")["results"] == []
+
+
+def test_section_filter(index):
+    skills = index.search("python", section="Skills")
+    assert [result["id"] for result in skills["results"]] == ["alice"]
+    assert [match["section"] for match in skills["results"][0]["matches"]] == ["Skills"]
+
+    experience = index.search("python", section="WorkExperience")
+    assert [result["id"] for result in experience["results"]] == ["bob"]
+    assert experience["results"][0]["matches"] == [
+        {"section": "WorkExperience", "main": str(CV.bob_experience0), "score": experience["results"][0]["score"]}]
+
+    # a city is searchable through the items located in it
+    assert index.search("berlin", section="WorkExperience")["results"][0]["matches"][0]["main"] == \
+        str(CV.alice_experience0)
+    assert index.search("garden", section="Skills")["total"] == 0
+
+
+def test_paging(index):
+    found = index.search("python", match_all=False, limit=1, offset=1)
+    assert found["total"] == 2 and [result["id"] for result in found["results"]] == ["bob"]
+
+
+def test_reindexing_replaces_the_postings(index):
+    person, graph = person_graph("alice", skills=["Rust"], experiences=[("Data Engineer", "Builds pipelines", "Berlin")])
+    index.add_partition("alice", graph, person, "Alice")
+
+    assert [result["id"] for result in index.search("python")["results"]] == ["bob"]
+    assert "programming" not in index.postings
+    assert "programming" not in index.by_section["Skills"]
+    assert index.search("rust")["results"][0]["id"] == "alice"
+
+    index.remove_partition("bob")
+    assert index.search("python")["total"] == 0
+    assert "python" not in index.postings and "java" not in index.by_section["Skills"]
+    assert len(index) == 2 and "bob" not in index.items and "bob" not in index.sections
+    index.remove_partition("bob")
+
+
+def test_store_keeps_the_index_in_step_with_upserts(tmp_path, record):
+    store = profileStore(partition_dir=str(tmp_path / "partitions"), source_file=SOURCE_FILE)
+    base = sample_cv(0)
+    record(store, base)
+    pid = store.find_person("Writer0 Bench")["id"]
+    old_word = base["workExperience"][0]["title"].split()[0].lower()
+
+    edited = edited_cv(base, 1)
+    edited["workExperience"][0]["title"] = "Zeppelin Pilot"
+    record(store, edited)
+    found = store.search.search("zeppelin", section="WorkExperience")
+    assert [result["id"] for result in found["results"]] == [pid]
+    assert found["results"][0]["matches"][0]["main"] in {str(item) for item in store.graphs[pid].objects()}
+    # the old title is gone unless another field of the profile still uses the word
+    still_used = any(old_word in tokenize(str(value)) for value in store.graphs[pid].objects())
+    assert (pid in store.search.postings.get(old_word, {})) == still_used
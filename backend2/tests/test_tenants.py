@@ -0,0 +1,32 @@
+"""
+Date: 2026-10-19
+Description: The landing page of a tenant shows one of its own profiles.
+"""
+
+import os
+
+from benchmarks.generator import generate_dataset, generatorParams
+
+
+def add_tenant(app_module, tenant: str, persons: int):
+    generate_dataset(os.path.join(app_module.TENANTS.root, tenant, "partitions"), generatorParams(persons=persons))
+
+
+def test_landing_page_shows_the_tenants_first_profile(app_module):
+    add_tenant(app_module, "beta", 3)
+    response = app_module.app.test_client().get("/t/beta/")
+    assert response.status_code == 200
+    assert 'data-profile="Fname0 Lname0"' in response.get_data(as_text=True)
+
+
+def test_default_store_keeps_its_default_profile(app_module):
+    response = app_module.app.test_client().get("/")
+    assert response.status_code == 200
+    assert f'data-profile="{app_module.DEFAULT_PROFILE}"' in response.get_data(as_text=True)
+
+
+def test_empty_tenant_is_not_found(app_module):
+    add_tenant(app_module, "empty", 0)
+    response = app_module.app.test_client().get("/t/empty/")
+    assert response.status_code == 404
+    assert response.get_json() == {"error": "No profiles in this store"}
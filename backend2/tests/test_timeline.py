@@ -0,0 +1,98 @@
+"""
+Date: 2026-10-19
+Description: The dated sections are served in the order of the presorted
+    timelines (pyscript/timeline.py) instead of an ORDER BY. These tests check
+    that order against the former `ORDER BY ASC(BOUND(?endDate))
+    DESC(?endDate)` queries, and that a window of the timeline, including an
+    empty one, gives the matching slice of the whole section.
+"""
+
+import pytest
+from rdflib import URIRef
+
+from pyscript.grapher import graphData
+from pyscript.rdfquery import rdfQueries
+from pyscript.timeline import CV, TIMELINE_SECTIONS, values_clause
+
+# section key -> (graphData getter, rdfQueries template)
+SECTIONS = {
+    "Education": ("get_Education", "get_education_query"),
+    "WorkExperience": ("get_workExperience", "get_experience_query"),
+    "Certificate": ("get_certifications", "get_achievement_query"),
+}
+LEGACY_ORDER = "\nORDER BY ASC(BOUND(?endDate)) DESC(?endDate)"
+
+
+def profile_data(store, name: str) -> graphData:
+    """Returns a graphData of one profile with its person URI resolved."""
+    graf = graphData(name, store=store)
+    graf.get_name()
+    graf.get_personDetails()
+    return graf
+
+
+def legacy_rows(graf: graphData, section: str) -> list:
+    """Runs the section query as it was before the timelines: every item, ORDER BY end date."""
+    template = getattr(rdfQueries, SECTIONS[section][1])
+    text = rdfQueries.get_prefix() + template().format(person=graf.nameURI, items="") + LEGACY_ORDER
+    return list(graf.graphDB.query(text))
+
+
+@pytest.mark.parametrize("section", SECTIONS)
+def test_order_matches_legacy_order_by(profiles, section):
+    store, names = profiles
+    variable = TIMELINE_SECTIONS[section][1]
+    checked = 0
+    for name in names:
+        graf = profile_data(store, name)
+        served = [record.main for record in getattr(graf, SECTIONS[section][0])()]
+        legacy = list(dict.fromkeys(str(row[variable]) for row in legacy_rows(graf, section)))
+        assert sorted(served) == sorted(legacy)
+
+        # SPARQL leaves items with the same end date in evaluation order, so the end dates are compared
+        view = store.profile_view(name)
+        end_date = lambda item: max((str(value) for value in view.objects(URIRef(item), CV.endDate)),
+                                    default=None)
+        assert [end_date(item) for item in served] == [end_date(item) for item in legacy]
+        checked += len(served)
+    assert checked, "the dataset should exercise the section"
+
+
+@pytest.mark.parametrize("section", SECTIONS)
+def test_records_match_legacy_query(profiles, monkeypatch, comparable, section):
+    store, names = profiles
+    getter, query = SECTIONS[section]
+    current = {name: comparable(getattr(profile_data(store, name), getter)()) for name in names}
+
+    text = getattr(rdfQueries, query)().replace("{items}", "") + LEGACY_ORDER
+
+    def template():
+        return text
+    template.__name__ = query
+    monkeypatch.setattr(rdfQueries, query, staticmethod(template))
+    assert current == {name: comparable(getattr(profile_data(store, name), getter)()) for name in names}
+
+
+@pytest.mark.parametrize("section", SECTIONS)
+def test_window_is_a_slice_of_the_section(profiles, section):
+    store, names = profiles
+    getter = SECTIONS[section][0]
+    for name in names:
+        graf = profile_data(store, name)
+        whole = [record.as_dict() for record in getattr(graf, getter)()]
+        for offset, limit in ((0, 3), (1, 2), (max(len(whole) - 1, 0), 5), (0, len(whole) + 1)):
+            window = getattr(graf, getter)(offset, limit)
+            assert [record.as_dict() for record in window] == whole[offset:offset + limit]
+
+
+@pytest.mark.parametrize("section", SECTIONS)
+def test_empty_window(profiles, section):
+    store, names = profiles
+    getter, query = SECTIONS[section]
+    assert values_clause(section, []) == "FILTER(1 = 0)"
+    for name in names:
+        graf = profile_data(store, name)
+        total = len(store.timeline(name, section))
+        assert getattr(graf, getter)(total, 3) == []
+        assert getattr(graf, getter)(0, 0) == []
+        assert graf.run_query(getattr(rdfQueries, query), person=graf.nameURI, items=values_clause(section, [])) == []
@@ -0,0 +1,160 @@
+"""
+Date: 2026-10-19
+Description: Re-submitting a CV (/record, upsert mode) aligns it with the
+    stored partition and writes only the triples that changed, appended to
+    the partition changelog until that outgrows the partition. Append mode
+    always adds a new profile.
+"""
+
+import os
+
+import pytest
+from rdflib import Literal
+
+from benchmarks.generator import generate_dataset, generatorParams, sample_cv
+from benchmarks.scenarios import edited_cv
+from pyscript.store import CHANGELOG_SUFFIX, SOURCE_FILE, profileStore
+
+NAME = "Writer0 Bench"
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A store of the shipped resume.ttl, written by the tests."""
+    return profileStore(partition_dir=str(tmp_path / "partitions"), source_file=SOURCE_FILE)
+
+
+def partition_files(store, pid):
+    return tuple(os.path.join(store.partition_dir, f"{pid}{suffix}") for suffix in (".ttl", CHANGELOG_SUFFIX))
+
+
+def test_unchanged_resubmission_writes_nothing(store, record):
+    base = sample_cv(0)
+    record(store, base)
+    pid = store.find_person(NAME)["id"]
+    partition_file, changelog = partition_files(store, pid)
+    before, content = set(store.graphs[pid]), open(partition_file, "rb").read()
+
+    record(store, base)
+    assert store.upsert_graph(store.graphs[pid]) == {pid: (0, 0)}
+    assert set(store.graphs[pid]) == before
+    assert open(partition_file, "rb").read() == content
+    assert not os.path.exists(changelog)
+    assert store.name_list().count(NAME) == 1
+
+
+def test_edited_field_is_the_whole_diff(store, record):
+    base = sample_cv(0)
+    record(store, base)
+    pid = store.find_person(NAME)["id"]
+    before = set(store.graphs[pid])
+
+    # revision 0 edits the person's own aboutMe: one literal
+    edited = edited_cv(base, 0)
+    record(store, edited)
+    after = set(store.graphs[pid])
+    removed, added = before - after, after - before
+    assert len(removed) == len(added) == 1
+    assert {str(o) for _, _, o in removed} == {base["personal"]["aboutMe"]}
+    assert {str(o) for _, _, o in added} == {edited["personal"]["aboutMe"]}
+
+
+def test_edited_item_leaves_the_other_items_alone(store, record):
+    base = sample_cv(0)
+    record(store, base)
+    pid = store.find_person(NAME)["id"]
+    before = set(store.graphs[pid])
+
+    # revision 1 edits the title of the first work experience: that item is replaced, nothing else
+    edited = edited_cv(base, 1)
+    record(store, edited)
+    after = set(store.graphs[pid])
+    removed, added = before - after, after - before
+
+    def item(triples, title):
+        return next(s for s, _, o in triples if isinstance(o, Literal) and str(o) == title)
+
+    old_item = item(removed, base["workExperience"][0]["title"])
+    new_item = item(added, edited["workExperience"][0]["title"])
+    assert all(old_item in (s, o) for s, _, o in removed)
+    assert all(new_item in (s, o) for s, _, o in added)
+    assert len(removed) == len(added) < len(before) // 10
+
+
+def test_reload_replays_the_changelog(store, record):
+    base = sample_cv(0)
+    record(store, base)
+    pid = store.find_person(NAME)["id"]
+    for revision in range(4):
+        record(store, edited_cv(base, revision))
+    assert os.path.exists(partition_files(store, pid)[1])
+
+    reloaded = profileStore(partition_dir=store.partition_dir)
+    assert set(reloaded.graphs[pid]) == set(store.graphs[pid])
+    assert reloaded.pending_changes[pid] == store.pending_changes[pid]
+    assert reloaded.timeline(NAME, "WorkExperience") == store.timeline(NAME, "WorkExperience")
+
+
+def test_changelog_is_compacted_once_it_outgrows_the_partition(store, record):
+    base = sample_cv(0)
+    record(store, base)
+    pid = store.find_person(NAME)["id"]
+    partition_file, changelog = partition_files(store, pid)
+
+    # alternate two versions until the changed triples outnumber the partition's
+    for revision in range(40):
+        pending = store.pending_changes.get(pid, 0)
+        record(store, edited_cv(base, 1) if revision % 2 == 0 else base)
+        if not os.path.exists(changelog):
+            break
+        assert store.pending_changes[pid] <= len(store.graphs[pid])
+    else:
+        pytest.fail("the changelog was never compacted")
+
+    assert pending > 0 and pid not in store.pending_changes
+    written = profileStore(partition_dir=store.partition_dir)
+    assert set(written.graphs[pid]) == set(store.graphs[pid])
+    assert pid not in written.pending_changes
+
+
+def test_append_adds_a_profile_every_time(store, record):
+    base = sample_cv(0)
+    record(store, base)
+    first = store.find_person(NAME)["id"]
+    record(store, base, mode="append")
+    record(store, edited_cv(base, 0), mode="append")
+
+    pids = [entry["id"] for entry in store.entries.values() if entry["label"] == NAME]
+    assert len(pids) == 3 and pids[0] == first
+    assert len(store.graphs[pids[1]]) == len(store.graphs[first])
+    assert not any(os.path.exists(partition_files(store, pid)[1]) for pid in pids)
+
+    # an upsert replaces the first profile with that name only
+    appended = set(store.graphs[pids[1]])
+    record(store, edited_cv(base, 0))
+    assert set(store.graphs[pids[1]]) == appended
+    assert edited_cv(base, 0)["personal"]["aboutMe"] in {str(o) for o in store.graphs[first].objects()}
+
+
+def test_unused_terms_are_dropped_from_the_dictionary(tmp_path, record):
+    generate_dataset(str(tmp_path), generatorParams(persons=0))
+    store = profileStore(partition_dir=str(tmp_path))
+    base = sample_cv(0)
+    record(store, base)
+    pid = store.find_person(NAME)["id"]
+    used = len(store.terms)
+
+    # every edit leaves its previous literal (and item node) unused
+    revision = 0
+    while store.term_generation == 0:
+        assert revision < 200, "the dictionary was never rebuilt"
+        record(store, edited_cv(base, revision))
+        revision += 1
+
+    assert len(store.terms) < 2 * used
+    assert all(graph.store.terms is store.terms for graph in [store.common, *store.graphs.values()])
+    assert set(profileStore(partition_dir=str(tmp_path)).graphs[pid]) == set(store.graphs[pid])
+    # later writes go to the new dictionary
+    record(store, base)
+    assert store.graphs[pid].store.terms is store.terms
+    assert set(profileStore(partition_dir=str(tmp_path)).graphs[pid]) == set(store.graphs[pid])